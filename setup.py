@@ -6,6 +6,7 @@ setup(
     description="Analytics Agent CLI - AI analytics agent for data analysis and insights",
     author="FT1006",
     packages=find_packages(),
+    package_data={"staffer.function_registries": ["declarations.json"]},
     install_requires=[
         "google-genai==1.12.1",
         "python-dotenv==1.1.0",
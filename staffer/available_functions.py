@@ -3,12 +3,11 @@
 from google.genai import types
 import traceback
 import json
-import numpy as np
-import pandas as pd
-from datetime import datetime
 
 # Import the combined registry from the subfolder
-from .function_registries import available_functions as tool_registry, all_functions as function_dict
+from .function_registries import available_functions as tool_registry, all_functions as function_dict, cacheable_functions
+from .result_cache import result_cache, is_miss, is_cacheable_result
+from .response_encoder import encode_response, to_jsonable
 
 
 def get_available_functions(working_dir):
@@ -16,66 +15,6 @@ def get_available_functions(working_dir):
     return tool_registry
 
 
-def _serialize_for_json(obj):
-    """Convert pandas/numpy types to JSON-serializable Python types."""
-    
-    # Handle None first
-    if obj is None:
-        return None
-        
-    # Handle Path objects
-    from pathlib import Path
-    if isinstance(obj, Path):
-        return str(obj)
-        
-    # Handle pandas NA/NaN with try-except to avoid array ambiguity errors
-    try:
-        if pd.isna(obj):
-            return None
-    except (ValueError, TypeError):
-        # pd.isna() raised an error, likely due to array input
-        pass
-        
-    # Handle numpy number types
-    if isinstance(obj, (np.integer, np.int64, np.int32, np.int16, np.int8)):
-        return int(obj)
-    
-    if isinstance(obj, (np.floating, np.float64, np.float32)):
-        if np.isnan(obj) or np.isinf(obj):
-            return None
-        return float(obj)
-    
-    if isinstance(obj, np.bool_):
-        return bool(obj)
-        
-    # Handle pandas Timestamp
-    if isinstance(obj, pd.Timestamp):
-        return obj.isoformat()
-        
-    # Handle datetime
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-        
-    # Handle numpy arrays and pandas Series
-    if isinstance(obj, (np.ndarray, pd.Series)):
-        return [_serialize_for_json(item) for item in obj]
-        
-    # Handle pandas DataFrame
-    if isinstance(obj, pd.DataFrame):
-        return obj.to_dict(orient='records')
-        
-    # Handle dictionaries recursively
-    if isinstance(obj, dict):
-        return {str(k): _serialize_for_json(v) for k, v in obj.items()}
-        
-    # Handle lists/tuples recursively
-    if isinstance(obj, (list, tuple)):
-        return [_serialize_for_json(item) for item in obj]
-        
-    # Return as-is for basic Python types
-    return obj
-
-
 def _create_args_summary(args):
     """Create a concise summary of arguments for logging."""
     if args is None:
@@ -165,12 +104,34 @@ def call_function(function_call_part, working_directory, verbose=False):
         # This handles cases where Gemini might pass numpy/pandas types
         clean_args = {}
         for k, v in args.items():
-            clean_args[k] = _serialize_for_json(v) if v is not None else None
+            clean_args[k] = to_jsonable(v) if v is not None else None
+        
+        # Reuse memoized results of read-only analyses on unchanged datasets
+        cache_key = None
+        if function_name in cacheable_functions:
+            cache_key = result_cache.make_key(function_name, clean_args)
+        if cache_key is not None:
+            cached_result = result_cache.get(cache_key)
+            if not is_miss(cached_result):
+                if verbose:
+                    print(f"   → Result: cached ({result_cache.stats()['hits']} hits)")
+                return types.Content(
+                    role="tool",
+                    parts=[
+                        types.Part.from_function_response(
+                            name=function_name,
+                            response={"result": cached_result},
+                        )
+                    ],
+                )
         
         function_result = function_dict[function_name](working_directory, **clean_args)
         
-        # Serialize the result to handle pandas/numpy types
-        serialized_result = _serialize_for_json(function_result)
+        # Encode pandas/numpy types in bulk and hold the response to its size budget
+        serialized_result = encode_response(function_result)
+        
+        if cache_key is not None and is_cacheable_result(serialized_result):
+            result_cache.put(cache_key, serialized_result)
         
         # Display function result based on verbosity (only in verbose mode)
         if verbose:
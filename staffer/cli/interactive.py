@@ -216,7 +216,7 @@ def show_help():
     print("  /exit (or /quit) - Save session and quit")
 
 
-def main(verbose=False):
+def main(verbose=False, stream=True):
     """Main interactive mode entry point."""
     # Get terminal UI (enhanced or basic)
     terminal = get_terminal_ui()
@@ -281,7 +281,7 @@ def main(verbose=False):
             spinner = terminal.show_spinner("AI is thinking...")
             spinner.__enter__()
             try:
-                messages = process_prompt(user_input, verbose=verbose, messages=messages, terminal=terminal, spinner=spinner)
+                messages = process_prompt(user_input, verbose=verbose, messages=messages, terminal=terminal, spinner=spinner, stream=stream)
             finally:
                 # Ensure spinner is stopped (process_prompt may have already stopped it)
                 try:
@@ -2,20 +2,36 @@
 
 from google.genai import types
 
-# Import all registries
-from .file_ops_registry import file_ops_schemas, file_ops_functions
-from .excel_registry import excel_schemas, excel_functions
-from .analytics_registry import analytics_schemas, analytics_functions
+# Import all registries (declarations only; implementations load on first call)
+from .lazy import LazyFunctionMap
+from .file_ops_registry import file_ops_schemas, file_ops_functions, file_ops_concurrent_safe_functions
+from .excel_registry import excel_schemas, excel_functions, excel_concurrent_safe_functions
+from .analytics_registry import (
+    analytics_schemas,
+    analytics_functions,
+    analytics_cacheable_functions,
+    analytics_concurrent_safe_functions,
+)
 
 # Combine all schemas
 all_schemas = file_ops_schemas + excel_schemas + analytics_schemas
 
 # Combine all function mappings
-all_functions = {
-    **file_ops_functions,
-    **excel_functions,
-    **analytics_functions,
-}
+all_functions = LazyFunctionMap.combine(
+    file_ops_functions,
+    excel_functions,
+    analytics_functions,
+)
+
+# Functions whose results may be memoized per dataset version
+cacheable_functions = set(analytics_cacheable_functions)
+
+# Read-only functions that may run concurrently within one model turn
+concurrent_safe_functions = (
+    file_ops_concurrent_safe_functions
+    | excel_concurrent_safe_functions
+    | analytics_concurrent_safe_functions
+)
 
 # Create the combined tool declaration
 available_functions = types.Tool(
@@ -23,4 +39,4 @@ available_functions = types.Tool(
 )
 
 # Export for use by available_functions.py
-__all__ = ['available_functions', 'all_functions']
\ No newline at end of file
+__all__ = ['available_functions', 'all_functions', 'cacheable_functions', 'concurrent_safe_functions']
\ No newline at end of file
@@ -0,0 +1,24 @@
+"""Regenerate declarations.json from the schema objects of all registries.
+
+Usage:
+    python -m staffer.function_registries.build_declarations
+"""
+
+import json
+from pathlib import Path
+
+from .lazy import CATALOG_PATH, _catalog, build_catalog
+from .file_ops_registry import file_ops_entries
+from .excel_registry import excel_entries
+from .analytics_registry import analytics_entries
+
+
+def write_catalog() -> Path:
+    catalog = build_catalog({**file_ops_entries, **excel_entries, **analytics_entries})
+    CATALOG_PATH.write_text(json.dumps(catalog, indent=2, ensure_ascii=False) + "\n")
+    _catalog.cache_clear()
+    return CATALOG_PATH
+
+
+if __name__ == "__main__":
+    print(f"Wrote {write_catalog()}")
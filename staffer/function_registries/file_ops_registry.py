@@ -1,28 +1,26 @@
 """File operations function registry for Staffer."""
 
-from google.genai import types
+from .lazy import LazyFunctionMap, load_declarations
 
-# Import file operations functions and schemas
-from ..functions.file_ops.get_files_info import schema_get_files_info, get_files_info
-from ..functions.file_ops.get_file_content import schema_get_file_content, get_file_content
-from ..functions.file_ops.write_file import schema_write_file, write_file
-from ..functions.file_ops.run_python_file import schema_run_python_file, run_python_file
-from ..functions.file_ops.get_working_directory import schema_get_working_directory, get_working_directory
+# File operations functions: name -> (implementation module, function, schema).
+# Modules are imported on first call; declarations come from declarations.json.
+file_ops_entries = {
+    "get_files_info": ("..functions.file_ops.get_files_info", "get_files_info", "schema_get_files_info"),
+    "get_file_content": ("..functions.file_ops.get_file_content", "get_file_content", "schema_get_file_content"),
+    "write_file": ("..functions.file_ops.write_file", "write_file", "schema_write_file"),
+    "run_python_file": ("..functions.file_ops.run_python_file", "run_python_file", "schema_run_python_file"),
+    "get_working_directory": ("..functions.file_ops.get_working_directory", "get_working_directory", "schema_get_working_directory"),
+}
 
 # File operations schemas list
-file_ops_schemas = [
-    schema_get_files_info,
-    schema_get_file_content,
-    schema_write_file,
-    schema_run_python_file,
-    schema_get_working_directory,
-]
+file_ops_schemas = load_declarations(file_ops_entries)
 
 # File operations function mapping
-file_ops_functions = {
-    "get_files_info": get_files_info,
-    "get_file_content": get_file_content,
-    "write_file": write_file,
-    "run_python_file": run_python_file,
-    "get_working_directory": get_working_directory,
-}
\ No newline at end of file
+file_ops_functions = LazyFunctionMap(file_ops_entries)
+
+# Read-only functions that may run concurrently within one model turn
+file_ops_concurrent_safe_functions = {
+    "get_files_info",
+    "get_file_content",
+    "get_working_directory",
+}
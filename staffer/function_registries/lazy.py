@@ -0,0 +1,111 @@
+"""Lazy loading support for the function registries.
+
+Registries list each function as ``name -> (module, function attribute,
+schema attribute)`` instead of importing it. The FunctionDeclarations shown
+to the model are read from a static catalog (declarations.json) generated
+from the ``schema_*`` objects in the implementation modules, so building
+the tool list imports nothing beyond google-genai. An implementation module
+(and pandas, openpyxl, plotly, ... with it) is imported the first time its
+function is called.
+
+Regenerate the catalog after adding a function or changing its schema:
+
+    python -m staffer.function_registries.build_declarations
+"""
+
+import importlib
+import json
+from collections.abc import MutableMapping
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from google.genai import types
+
+
+CATALOG_PATH = Path(__file__).with_name("declarations.json")
+
+# name -> (module relative to this package, function attribute, schema attribute)
+RegistryEntries = Dict[str, Tuple[str, str, str]]
+
+
+def _import(module: str):
+    return importlib.import_module(module, package=__package__)
+
+
+class LazyFunctionMap(MutableMapping):
+    """Dict of function name -> callable that imports implementations on first access."""
+
+    def __init__(self, entries: RegistryEntries):
+        self._entries = dict(entries)
+        self._loaded: Dict[str, Callable] = {}
+
+    @classmethod
+    def combine(cls, *maps: "LazyFunctionMap") -> "LazyFunctionMap":
+        """Merge several maps without importing any implementation."""
+        combined = cls({})
+        for function_map in maps:
+            combined._entries.update(function_map._entries)
+            combined._loaded.update(function_map._loaded)
+        return combined
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._loaded
+
+    def __getitem__(self, name: str) -> Callable:
+        if name not in self._loaded:
+            if name not in self._entries:
+                raise KeyError(name)
+            module, function_attr, _ = self._entries[name]
+            self._loaded[name] = getattr(_import(module), function_attr)
+        return self._loaded[name]
+
+    def __setitem__(self, name: str, function: Callable) -> None:
+        self._loaded[name] = function
+
+    def __delitem__(self, name: str) -> None:
+        if name not in self:
+            raise KeyError(name)
+        self._loaded.pop(name, None)
+        self._entries.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._entries or name in self._loaded
+
+    def __iter__(self) -> Iterator[str]:
+        return iter({**self._entries, **self._loaded})
+
+    def __len__(self) -> int:
+        return len(self._entries.keys() | self._loaded.keys())
+
+
+@lru_cache(maxsize=1)
+def _catalog() -> Dict[str, dict]:
+    try:
+        return json.loads(CATALOG_PATH.read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def load_declarations(entries: RegistryEntries) -> List[types.FunctionDeclaration]:
+    """Build FunctionDeclarations for the entries from the static catalog.
+
+    Functions missing from the catalog (not regenerated yet) fall back to
+    importing their module for the schema object.
+    """
+    catalog = _catalog()
+    declarations = []
+    for name, (module, _, schema_attr) in entries.items():
+        if name in catalog:
+            declarations.append(types.FunctionDeclaration.model_validate(catalog[name]))
+        else:
+            declarations.append(getattr(_import(module), schema_attr))
+    return declarations
+
+
+def build_catalog(entries: RegistryEntries) -> Dict[str, dict]:
+    """Import every implementation module and dump its declaration."""
+    return {
+        name: getattr(_import(module), schema_attr).model_dump(mode="json", exclude_none=True)
+        for name, (module, _, schema_attr) in entries.items()
+    }
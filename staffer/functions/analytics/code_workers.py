@@ -0,0 +1,269 @@
+"""Pre-warmed worker processes for custom analytics code.
+
+Each worker is a separate spawned Python process that imports pandas, numpy
+and plotly once at startup and then serves execution requests over a pipe.
+Datasets are handed over as files (Arrow IPC, memory-mapped by the worker)
+rather than being inlined into generated source code.
+
+User code runs in the calling tool's working directory, so files it writes
+(charts, CSV exports) land where the user expects, with API keys removed
+from the environment. A worker that exceeds the execution timeout is killed and
+replaced, and workers are recycled after a fixed number of calls so state
+left behind by user code does not accumulate.
+"""
+
+import atexit
+import contextlib
+import io
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import traceback
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_TIMEOUT = 30.0
+STARTUP_TIMEOUT = 120.0
+MAX_CALLS_PER_WORKER = 50
+
+# Environment variables never exposed to user code
+_SECRET_ENV_VARS = ("GEMINI_API_KEY", "GOOGLE_API_KEY")
+
+
+class WorkerTimeout(Exception):
+    """Raised when user code exceeds the execution timeout."""
+
+
+def _load_dataframe(data_path: str, data_format: str):
+    import pandas as pd
+    if data_format == "arrow":
+        import pyarrow.feather as feather
+        return feather.read_table(data_path, memory_map=True).to_pandas()
+    return pd.read_pickle(data_path)
+
+
+def _execute(code: str, data_path: str, data_format: str, base_namespace: dict,
+             working_directory: Optional[str] = None) -> str:
+    """Run user code with the dataset bound to ``df`` and capture its output."""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer):
+        try:
+            if working_directory:
+                os.chdir(working_directory)
+            namespace = dict(base_namespace)
+            namespace["__name__"] = "__main__"
+            namespace["df"] = _load_dataframe(data_path, data_format)
+            exec(compile(code, "<analytics_code>", "exec"), namespace)
+        except BaseException as e:
+            print(f"ERROR: {type(e).__name__}: {str(e)}")
+            print("Traceback:")
+            print(traceback.format_exc())
+    return buffer.getvalue()
+
+
+def _worker_main(conn) -> None:
+    """Entry point of a worker process."""
+    for name in _SECRET_ENV_VARS:
+        os.environ.pop(name, None)
+
+    import json
+    import numpy as np
+    import pandas as pd
+    base_namespace = {"pd": pd, "np": np, "json": json}
+    try:
+        import plotly.express as px
+        base_namespace["px"] = px
+    except ImportError:
+        pass
+
+    conn.send("ready")
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            break
+        if request is None:
+            break
+        conn.send(_execute(request["code"], request["data_path"], request["data_format"], base_namespace,
+                           request.get("working_directory")))
+
+
+class _Worker:
+    """Handle on one worker process."""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.calls = 0
+
+    def wait_ready(self, timeout: float) -> None:
+        if self.ready:
+            return
+        if not self.conn.poll(timeout):
+            raise WorkerTimeout("Worker failed to start")
+        self.conn.recv()
+        self.ready = True
+
+    def run(self, request: dict, timeout: float) -> str:
+        self.conn.send(request)
+        if not self.conn.poll(timeout):
+            raise WorkerTimeout("Code execution timed out")
+        self.calls += 1
+        return self.conn.recv()
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def stop(self) -> None:
+        try:
+            if self.alive():
+                self.conn.send(None)
+                self.process.join(1)
+        except (OSError, ValueError):
+            pass
+        if self.alive():
+            self.process.kill()
+            self.process.join(1)
+        self.conn.close()
+
+
+class CodeWorkerPool:
+    """Pool of pre-warmed worker processes."""
+
+    def __init__(self, size: int = DEFAULT_POOL_SIZE, max_calls_per_worker: int = MAX_CALLS_PER_WORKER):
+        self.size = size
+        self.max_calls_per_worker = max_calls_per_worker
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def warm(self) -> None:
+        """Start workers until the pool has ``size`` idle ones."""
+        with self._lock:
+            while not self._closed and len(self._idle) < self.size:
+                self._idle.append(_Worker(self._context))
+
+    def _acquire(self) -> _Worker:
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop(0)
+                if worker.alive():
+                    return worker
+                worker.stop()
+        return _Worker(self._context)
+
+    def _release(self, worker: _Worker) -> None:
+        if worker.calls >= self.max_calls_per_worker or not worker.alive():
+            worker.stop()
+            worker = None
+        with self._lock:
+            if worker is not None and not self._closed and len(self._idle) < self.size:
+                self._idle.append(worker)
+                worker = None
+        if worker is not None:
+            worker.stop()
+
+    def run(self, code: str, data_path: str, data_format: str, timeout: float = DEFAULT_TIMEOUT,
+            working_directory: Optional[str] = None) -> str:
+        """Execute code in a warm worker and return its captured output.
+
+        The code runs with working_directory as its current directory (the
+        worker's inherited one if not given).
+
+        Raises:
+            WorkerTimeout: if the code runs longer than ``timeout`` seconds
+        """
+        worker = self._acquire()
+        try:
+            worker.wait_ready(STARTUP_TIMEOUT)
+            output = worker.run({
+                "code": code,
+                "data_path": data_path,
+                "data_format": data_format,
+                "working_directory": os.path.abspath(working_directory) if working_directory else None,
+            }, timeout)
+        except BaseException:
+            # Never reuse a worker in an unknown state
+            worker.stop()
+            raise
+        self._release(worker)
+        # Replace the worker that was used, so the next call is warm too
+        threading.Thread(target=self.warm, daemon=True).start()
+        return output
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._closed = True
+            workers, self._idle = self._idle, []
+        for worker in workers:
+            worker.stop()
+
+
+_pool: Optional[CodeWorkerPool] = None
+_pool_lock = threading.Lock()
+
+_export_dir: Optional[Path] = None
+_exports: Dict[str, Tuple[int, Path, str]] = {}
+_export_lock = threading.Lock()
+
+
+def _cleanup_exports() -> None:
+    with _export_lock:
+        _exports.clear()
+        if _export_dir is not None:
+            shutil.rmtree(_export_dir, ignore_errors=True)
+
+
+def export_dataset(dataset_name: str, version: int, df) -> Tuple[str, str]:
+    """Write a dataset to a file workers can read, reusing it while the version is unchanged.
+
+    Returns:
+        Tuple of (path, format) where format is "arrow" or "pickle"
+    """
+    global _export_dir
+    with _export_lock:
+        cached = _exports.get(dataset_name)
+        if cached is not None and cached[0] == version and cached[1].exists():
+            return str(cached[1]), cached[2]
+
+        if _export_dir is None:
+            _export_dir = Path(tempfile.mkdtemp(prefix="aacli-datasets-"))
+            atexit.register(_cleanup_exports)
+        if cached is not None:
+            cached[1].unlink(missing_ok=True)
+
+        # Dataset versions are globally unique, so they make safe file names
+        base = _export_dir / f"dataset-{version}"
+        path, data_format = base.with_suffix(".arrow"), "arrow"
+        try:
+            import pyarrow as pa
+            import pyarrow.feather as feather
+            # Uncompressed so workers can memory-map the file
+            feather.write_feather(pa.Table.from_pandas(df), path, compression="uncompressed")
+        except Exception:
+            # pyarrow missing, or column types Arrow cannot represent
+            path.unlink(missing_ok=True)
+            path, data_format = base.with_suffix(".pkl"), "pickle"
+            df.to_pickle(path)
+
+        _exports[dataset_name] = (version, path, data_format)
+        return str(path), data_format
+
+
+def get_worker_pool() -> CodeWorkerPool:
+    """Get the process-wide worker pool, warming it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = CodeWorkerPool()
+            _pool.warm()
+            atexit.register(_pool.shutdown)
+        return _pool
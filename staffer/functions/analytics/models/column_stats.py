@@ -0,0 +1,144 @@
+"""Shared per-column aggregates of one dataset version.
+
+analyze_distributions, detect_outliers and segment_by_column each used to
+rescan the dataset for the same null counts, moments and quantiles. They now
+read them from a ColumnStats memo, cached per dataset version (see
+DatasetManager.get_column_stats), so a later call on the same dataset only
+computes what no earlier call needed.
+
+``prefetch`` computes one statistic for many columns at once. Columns are
+grouped by dtype and each group is aggregated with a single DataFrame
+reduction, which scans the block once instead of once per column and keeps
+the result dtypes identical to the per-column Series reductions (an int
+column's min stays an int). run_analysis_batch plans the statistics a batch
+needs and prefetches them in parallel.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Tuple
+
+import pandas as pd
+
+
+QUARTILES = (0.25, 0.5, 0.75)
+TOP_VALUES = 10
+# Group-by tables with more groups than this are not memoized
+SEGMENT_CACHE_MAX_GROUPS = 10_000
+# Largest block (rows x columns) reduced at once, bounding the temporary
+# copies quantiles and deviations make
+STAT_BLOCK_CELLS = 16_000_000
+
+
+def _frame_stat(name: str) -> Callable[[pd.DataFrame], Any]:
+    return lambda frame: getattr(frame, name)()
+
+
+# Statistics computed over a block of same-dtype columns at once
+_FRAME_STATS: Dict[str, Callable[[pd.DataFrame], Any]] = {
+    "count": _frame_stat("count"),
+    "nulls": lambda frame: frame.isnull().sum(),
+    "nunique": _frame_stat("nunique"),
+    "mean": _frame_stat("mean"),
+    "median": _frame_stat("median"),
+    "std": _frame_stat("std"),
+    "min": _frame_stat("min"),
+    "max": _frame_stat("max"),
+    "skew": _frame_stat("skew"),
+    "kurtosis": _frame_stat("kurtosis"),
+    "quartiles": lambda frame: frame.quantile(list(QUARTILES)),
+    # Median absolute deviation, and the mean absolute deviation around the
+    # median that robust z-scores fall back to when the MAD is 0
+    "mad": lambda frame: frame.sub(frame.median()).abs().median(),
+    "mean_abs_deviation": lambda frame: frame.sub(frame.median()).abs().mean(),
+}
+
+# Statistics computed one column at a time
+_SERIES_STATS: Dict[str, Callable[[pd.Series], Any]] = {
+    "top_values": lambda series: series.value_counts().head(TOP_VALUES),
+}
+
+STATS = tuple(_FRAME_STATS) + tuple(_SERIES_STATS)
+# Statistics that only apply to numeric columns
+NUMERIC_STATS = {"mean", "median", "std", "min", "max", "skew", "kurtosis", "quartiles",
+                 "mad", "mean_abs_deviation"}
+
+
+class ColumnStats:
+    """Memo of per-column statistics over one DataFrame."""
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+        self._values: Dict[Tuple[str, Hashable], Any] = {}
+        self._lock = threading.Lock()
+        self.computed = 0
+
+    def get(self, stat: str, column: str) -> Any:
+        """Statistic of one column, computed on first use.
+
+        quartiles are returned as a Series indexed by quantile.
+        """
+        key = (stat, column)
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+        self.prefetch(stat, [column])
+        with self._lock:
+            return self._values[key]
+
+    def prefetch(self, stat: str, columns: Iterable[str]) -> None:
+        """Compute a statistic for every column that does not have it yet."""
+        with self._lock:
+            missing = [col for col in dict.fromkeys(columns) if (stat, col) not in self._values]
+        if not missing:
+            return
+
+        if stat in _SERIES_STATS:
+            computed = {col: _SERIES_STATS[stat](self._df[col]) for col in missing}
+        else:
+            computed = {}
+            for block in self._dtype_blocks(missing):
+                result = _FRAME_STATS[stat](self._df[block])
+                for col in block:
+                    computed[col] = result[col]
+
+        with self._lock:
+            for col, value in computed.items():
+                self._values[(stat, col)] = value
+            self.computed += len(computed)
+
+    def segments(self, column: str, numerical_cols: List[str]) -> pd.DataFrame:
+        """segment_by_column's group-by table (count/mean/sum/std per numeric column).
+
+        The caller must not modify the returned table.
+        """
+        key = ("segments", (column, tuple(numerical_cols)))
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+
+        if numerical_cols:
+            agg_dict = {col: ['count', 'mean', 'sum', 'std'] for col in numerical_cols}
+            table = self._df.groupby(column).agg(agg_dict)
+            # Flatten column names
+            table.columns = ['_'.join(col).strip() for col in table.columns]
+        else:
+            table = self._df.groupby(column).size().to_frame('count')
+
+        if len(table) <= SEGMENT_CACHE_MAX_GROUPS:
+            with self._lock:
+                self._values[key] = table
+                self.computed += 1
+        return table
+
+    def _dtype_blocks(self, columns: List[str]) -> List[List[str]]:
+        """Group columns by dtype so a frame reduction keeps each column's result dtype.
+
+        Groups are split to at most STAT_BLOCK_CELLS values.
+        """
+        dtypes = self._df.dtypes
+        groups: Dict[str, List[str]] = {}
+        for col in columns:
+            groups.setdefault(str(dtypes[col]), []).append(col)
+
+        width = max(1, STAT_BLOCK_CELLS // max(1, len(self._df)))
+        return [group[i:i + width] for group in groups.values() for i in range(0, len(group), width)]
@@ -0,0 +1,232 @@
+"""Persistent columnar cache for parsed datasets.
+
+Parsed CSV/JSON files are stored as uncompressed Arrow IPC (Feather) files so
+that a warm reload can memory-map the columns instead of re-parsing the source.
+The discovered DatasetSchema is stored next to the columns and reused as well.
+
+Cache entries are keyed by the absolute source path (plus the sheet and range
+for Excel workbooks, so each part of a workbook gets its own entry). Each entry records the
+source size, mtime and a content hash; an entry is reused when size and mtime
+still match, or when the file was touched but its content hash is unchanged.
+
+The cache is held to a disk budget (DATASET_CACHE_MAX_MB, 2 GB by default).
+After each write the least recently used entries are removed until the cache
+fits; an entry larger than the whole budget is not kept.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Optional, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+CACHE_FORMAT_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+DEFAULT_CACHE_MAX_MB = 2048
+
+
+def get_cache_dir() -> Path:
+    """Get the dataset cache directory (override with DATASET_CACHE_DIR)."""
+    override = os.environ.get("DATASET_CACHE_DIR")
+    if override:
+        return Path(override)
+    return Path.home() / ".analytics-agent-cli" / "dataset_cache"
+
+
+def max_cache_bytes() -> int:
+    """Disk budget for cached datasets (override with DATASET_CACHE_MAX_MB)."""
+    budget_mb = os.environ.get("DATASET_CACHE_MAX_MB")
+    return int(float(budget_mb or DEFAULT_CACHE_MAX_MB) * 1024**2)
+
+
+def _entry_dir(source_path: str, part: Optional[str] = None) -> Path:
+    """Get the cache entry directory for a source file (or one part of it)."""
+    name = os.path.abspath(source_path)
+    if part:
+        name = f"{name}#{part}"
+    key = hashlib.sha256(name.encode("utf-8")).hexdigest()[:32]
+    return get_cache_dir() / key
+
+
+def compute_content_hash(source_path: str) -> str:
+    """Hash the full file content in fixed-size chunks."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(source_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_meta(entry: Path) -> Optional[dict]:
+    """Read entry metadata, returning None if missing or unreadable."""
+    try:
+        with open(entry / "meta.json", "r") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != CACHE_FORMAT_VERSION:
+        return None
+    return meta
+
+
+def lookup(source_path: str, options: Optional[dict] = None,
+           part: Optional[str] = None) -> Optional[Tuple[pd.DataFrame, str]]:
+    """Load a cached DataFrame for an unchanged source file.
+
+    Args:
+        source_path: Path of the original CSV/JSON/Excel file
+        options: Reader options the cache entry must have been built with
+        part: Part of the file the entry holds (e.g. an Excel sheet and range)
+
+    Returns:
+        (DataFrame, schema JSON) on a cache hit, otherwise None
+    """
+    if not PYARROW_AVAILABLE:
+        return None
+
+    entry = _entry_dir(source_path, part)
+    meta = _read_meta(entry)
+    if meta is None or meta.get("options") != (options or {}):
+        return None
+
+    try:
+        stat = os.stat(source_path)
+    except OSError:
+        return None
+
+    if meta["size"] != stat.st_size:
+        return None
+
+    if meta["mtime_ns"] != stat.st_mtime_ns:
+        # File was touched - only reuse the entry if the content is identical
+        if compute_content_hash(source_path) != meta["content_hash"]:
+            return None
+        meta["mtime_ns"] = stat.st_mtime_ns
+        _write_meta(entry, meta)
+
+    try:
+        table = feather.read_table(str(entry / "data.arrow"), memory_map=True)
+        df = table.to_pandas()
+        schema_json = (entry / "schema.json").read_text()
+    except Exception:
+        return None
+
+    _mark_used(entry)
+    return df, schema_json
+
+
+def store(source_path: str, df: pd.DataFrame, schema_json: str, options: Optional[dict] = None,
+          part: Optional[str] = None) -> bool:
+    """Write a parsed DataFrame and its schema to the cache.
+
+    Caching is best-effort: any failure (unsupported column types, disk
+    errors) leaves the cache without an entry and returns False.
+    """
+    if not PYARROW_AVAILABLE:
+        return False
+
+    entry = _entry_dir(source_path, part)
+    try:
+        stat = os.stat(source_path)
+        meta = {
+            "version": CACHE_FORMAT_VERSION,
+            "source_path": os.path.abspath(source_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "content_hash": compute_content_hash(source_path),
+            "options": options or {},
+        }
+
+        entry.mkdir(parents=True, exist_ok=True)
+        # Invalidate first so a partially written entry is never used
+        (entry / "meta.json").unlink(missing_ok=True)
+
+        feather.write_feather(df.reset_index(drop=True), str(entry / "data.arrow"),
+                              compression="uncompressed")
+        (entry / "schema.json").write_text(schema_json)
+        _write_meta(entry, meta)
+    except Exception:
+        shutil.rmtree(entry, ignore_errors=True)
+        return False
+
+    enforce_budget()
+    return entry.exists()
+
+
+def _write_meta(entry: Path, meta: dict) -> None:
+    """Atomically write entry metadata."""
+    tmp_path = entry / "meta.json.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, entry / "meta.json")
+
+
+def _mark_used(entry: Path) -> None:
+    """Record a use of an entry; meta.json's mtime orders entries for eviction."""
+    try:
+        os.utime(entry / "meta.json")
+    except OSError:
+        pass
+
+
+def _entry_stats(entry: Path) -> Tuple[float, int]:
+    """(last used, size in bytes) of a cache entry."""
+    try:
+        last_used = (entry / "meta.json").stat().st_mtime
+    except OSError:
+        # Entries without metadata are unusable, so they go first
+        last_used = 0.0
+    size = 0
+    for path in entry.iterdir():
+        try:
+            size += path.stat().st_size
+        except OSError:
+            pass
+    return last_used, size
+
+
+def enforce_budget(max_bytes: Optional[int] = None) -> dict:
+    """Remove least recently used entries until the cache fits max_bytes."""
+    if max_bytes is None:
+        max_bytes = max_cache_bytes()
+    cache_dir = get_cache_dir()
+    entries = []
+    if cache_dir.exists():
+        for entry in cache_dir.iterdir():
+            if entry.is_dir():
+                try:
+                    entries.append((entry, *_entry_stats(entry)))
+                except OSError:
+                    continue
+
+    total = sum(size for _, _, size in entries)
+    evicted = 0
+    for entry, _, size in sorted(entries, key=lambda item: item[1]):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= size
+        evicted += 1
+    return {"cache_bytes": total, "max_bytes": max_bytes, "evicted": evicted}
+
+
+def clear_cache() -> dict:
+    """Remove all cached datasets from disk."""
+    cache_dir = get_cache_dir()
+    count = 0
+    if cache_dir.exists():
+        for entry in cache_dir.iterdir():
+            if entry.is_dir():
+                shutil.rmtree(entry, ignore_errors=True)
+                count += 1
+    return {"status": "success", "message": f"Removed {count} cached datasets"}
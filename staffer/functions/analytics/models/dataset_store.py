@@ -0,0 +1,260 @@
+"""Memory-budgeted dataset store with LRU spill-to-disk.
+
+DatasetStore behaves like the plain ``Dict[str, pd.DataFrame]`` it replaces,
+but tracks the deep memory footprint of every DataFrame. When the resident
+total exceeds the configured budget, the least recently used datasets are
+spilled to Parquet files in a local spill directory. Spilled datasets keep
+their name in the store and are read back transparently on access. Spill
+files are deleted at interpreter exit, along with the default per-process
+spill directory.
+
+The budget is unbounded unless DATASET_MEMORY_BUDGET_MB is set or
+``set_memory_budget`` is called.
+
+Values derived from a dataset (parsed datetime columns and the like) can be
+cached next to it with ``derived``. They are tied to the dataset version and
+dropped when the dataset is replaced, removed or spilled.
+"""
+
+import atexit
+import itertools
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+
+def _default_budget_bytes() -> Optional[int]:
+    budget_mb = os.environ.get("DATASET_MEMORY_BUDGET_MB")
+    if not budget_mb:
+        return None
+    return int(float(budget_mb) * 1024**2)
+
+
+def _default_spill_dir() -> Path:
+    override = os.environ.get("DATASET_SPILL_DIR")
+    if override:
+        return Path(override)
+    return Path(tempfile.gettempdir()) / "analytics-agent-cli-spill" / str(os.getpid())
+
+
+# Versions are globally unique so a dataset that is cleared and loaded again
+# under the same name never reuses an old version
+_version_counter = itertools.count(1)
+
+
+class DatasetStore(MutableMapping):
+    """Dict-like DataFrame store that spills cold datasets to disk.
+
+    Every assignment gives the dataset a new version number, which callers
+    use to invalidate results derived from older contents. All operations
+    hold a re-entrant lock, so concurrent tool calls can share the store.
+    """
+
+    def __init__(self, budget_bytes: Optional[int] = None, spill_dir: Optional[Path] = None):
+        self.budget_bytes = budget_bytes
+        self.spill_dir = Path(spill_dir) if spill_dir else _default_spill_dir()
+        # Only the per-process default directory belongs to the store
+        self._owns_spill_dir = not spill_dir and not os.environ.get("DATASET_SPILL_DIR")
+        self._resident: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self._spilled: Dict[str, Path] = {}
+        self._info: Dict[str, dict] = {}
+        # name -> (dataset version, {key: derived value})
+        self._derived: Dict[str, Tuple[int, Dict[Hashable, Any]]] = {}
+        self.eviction_count = 0
+        self.reload_count = 0
+        self._lock = threading.RLock()
+        self._cleanup_registered = False
+
+    @classmethod
+    def from_env(cls) -> "DatasetStore":
+        """Create a store configured from DATASET_MEMORY_BUDGET_MB / DATASET_SPILL_DIR."""
+        return cls(budget_bytes=_default_budget_bytes())
+
+    @property
+    def lock(self) -> threading.RLock:
+        """The store's re-entrant lock, for updates that must be atomic with other state."""
+        return self._lock
+
+    # Mapping interface
+
+    def __getitem__(self, name: str) -> pd.DataFrame:
+        with self._lock:
+            if name in self._resident:
+                self._resident.move_to_end(name)
+                return self._resident[name]
+            if name in self._spilled:
+                return self._reload(name)
+            raise KeyError(name)
+
+    def __setitem__(self, name: str, df: pd.DataFrame) -> None:
+        info = {
+            "rows": len(df),
+            "columns": list(df.columns),
+            "memory_bytes": int(df.memory_usage(deep=True).sum()),
+        }
+        with self._lock:
+            self._discard(name)
+            self._resident[name] = df
+            self._info[name] = {**info, "version": next(_version_counter)}
+            self._enforce_budget(keep=name)
+
+    def __delitem__(self, name: str) -> None:
+        with self._lock:
+            if name not in self._info:
+                raise KeyError(name)
+            self._discard(name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._info
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._info))
+
+    def __len__(self) -> int:
+        return len(self._info)
+
+    def clear(self) -> None:
+        with self._lock:
+            for name in list(self._info):
+                self._discard(name)
+
+    # Budget management
+
+    def set_budget(self, budget_mb: Optional[float]) -> None:
+        """Set the resident memory budget in MB (None disables eviction)."""
+        with self._lock:
+            self.budget_bytes = None if budget_mb is None else int(budget_mb * 1024**2)
+            self._enforce_budget()
+
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(self._info[name]["memory_bytes"] for name in self._resident)
+
+    def version(self, name: str) -> int:
+        """Current version of a dataset, bumped whenever it is replaced."""
+        with self._lock:
+            return self._info[name]["version"]
+
+    def is_resident(self, name: str) -> bool:
+        return name in self._resident
+
+    def describe(self, name: str) -> dict:
+        """Shape and footprint of a dataset without loading it from disk."""
+        with self._lock:
+            if name not in self._info:
+                raise KeyError(name)
+            return {**self._info[name], "resident": name in self._resident}
+
+    def derived(self, name: str, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Value derived from dataset `name`, computed once per dataset version.
+
+        compute runs without the store lock held, so concurrent tool calls are
+        not serialized behind it; a result computed while the dataset was
+        replaced is returned but not cached.
+        """
+        with self._lock:
+            version = self.version(name)
+            entry = self._derived.get(name)
+            if entry is not None and entry[0] == version and key in entry[1]:
+                return entry[1][key]
+
+        value = compute()
+
+        with self._lock:
+            if name in self._info and self._info[name]["version"] == version:
+                entry = self._derived.get(name)
+                if entry is None or entry[0] != version:
+                    entry = (version, {})
+                    self._derived[name] = entry
+                entry[1][key] = value
+        return value
+
+    def stats(self) -> dict:
+        """Budget, residency and eviction statistics."""
+        with self._lock:
+            return {
+                "budget_mb": round(self.budget_bytes / 1024**2, 1) if self.budget_bytes is not None else None,
+                "resident_mb": round(self.resident_bytes() / 1024**2, 1),
+                "resident_datasets": list(self._resident),
+                "spilled_datasets": list(self._spilled),
+                "evictions": self.eviction_count,
+                "reloads": self.reload_count,
+                "derived_values": sum(len(values) for _, values in self._derived.values()),
+                "spill_dir": str(self.spill_dir),
+            }
+
+    def _enforce_budget(self, keep: Optional[str] = None) -> None:
+        if self.budget_bytes is None:
+            return
+        resident = self.resident_bytes()
+        for name in list(self._resident):
+            if resident <= self.budget_bytes:
+                break
+            if name == keep:
+                continue
+            resident -= self._info[name]["memory_bytes"]
+            self._spill(name)
+
+    def _spill(self, name: str) -> None:
+        df = self._resident.pop(name)
+        self._derived.pop(name, None)
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        if not self._cleanup_registered:
+            atexit.register(self._remove_spill_files)
+            self._cleanup_registered = True
+        base = self.spill_dir / uuid.uuid4().hex
+        path = base.with_suffix(".parquet")
+        try:
+            if not PARQUET_AVAILABLE:
+                raise ImportError("pyarrow not available")
+            df.to_parquet(path)
+        except Exception:
+            # Column types Parquet cannot represent still spill, just less compactly
+            path.unlink(missing_ok=True)
+            path = base.with_suffix(".pkl")
+            df.to_pickle(path)
+        self._spilled[name] = path
+        self.eviction_count += 1
+
+    def _reload(self, name: str) -> pd.DataFrame:
+        path = self._spilled.pop(name)
+        if path.suffix == ".parquet":
+            df = pd.read_parquet(path)
+        else:
+            df = pd.read_pickle(path)
+        path.unlink(missing_ok=True)
+        self._resident[name] = df
+        self.reload_count += 1
+        self._enforce_budget(keep=name)
+        return df
+
+    def _remove_spill_files(self) -> None:
+        with self._lock:
+            for path in self._spilled.values():
+                path.unlink(missing_ok=True)
+            self._spilled.clear()
+            if self._owns_spill_dir:
+                shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    def _discard(self, name: str) -> None:
+        self._resident.pop(name, None)
+        self._derived.pop(name, None)
+        path = self._spilled.pop(name, None)
+        if path is not None:
+            path.unlink(missing_ok=True)
+        self._info.pop(name, None)
@@ -0,0 +1,217 @@
+"""Native .xlsx/.xlsm ingestion into DataFrames.
+
+Sheets are read with openpyxl's streaming read-only reader, one chunk of rows
+at a time, instead of through read_data_from_excel (which returns the cells as
+text for the model to copy). The reader:
+
+1. picks the sheet (first sheet by default) and an optional cell range
+2. finds the header row among the first rows, skipping title and note rows
+   above the table (or uses the header row given)
+3. builds the DataFrame chunk by chunk, then runs a dtype inference pass so
+   object columns mixing numbers with "N/A" markers, dates and text come out
+   as numeric, datetime or string columns; text codes such as "007" that
+   would lose leading zeros or digits as numbers stay text, and only text
+   holding a year becomes dates
+"""
+
+import os
+import re
+import sys
+from typing import Any, List, Optional, Tuple
+
+import pandas as pd
+
+
+EXCEL_EXTENSIONS = (".xlsx", ".xlsm")
+DEFAULT_CHUNK_SIZE = 20_000
+HEADER_SCAN_ROWS = 20
+# Cell text treated as missing during dtype inference
+NA_MARKERS = {"", "na", "n/a", "nan", "null", "none", "-", "--", "#n/a"}
+DATE_SAMPLE_SIZE = 100
+# Text only converts to dates when it holds a four-digit year or a
+# day/month/two-digit-year date such as 03/04/24
+_YEAR_PATTERN = re.compile(r"(?<!\d)\d{4}(?!\d)")
+_SHORT_DATE_PATTERN = re.compile(r"(?<!\d)\d{1,2}[/.-]\d{1,2}[/.-]\d{2}(?!\d)")
+# Longer digit strings (account and card numbers) stay text
+MAX_NUMERIC_TEXT_DIGITS = 15
+
+
+def is_excel_file(file_path: str) -> bool:
+    return file_path.lower().endswith(EXCEL_EXTENSIONS)
+
+
+def has_pending_edits(file_path: str) -> bool:
+    """Whether an open Excel transaction holds unsaved edits of the workbook.
+
+    Reads see those edits (see workbook_session.open_for_read), so the file on
+    disk no longer describes what is loaded.
+    """
+    session_module = sys.modules.get("staffer.functions.excel.workbook_session")
+    if session_module is None:
+        return False
+    return os.path.abspath(file_path) in session_module.workbook_session.pending()
+
+
+def detect_header_row(rows: List[List[Any]]) -> Optional[int]:
+    """Index of the header among leading rows, or None if the table has no header.
+
+    The header is the first row whose filled cells are all text and that
+    spans at least half of the widest row, which skips single-cell titles and
+    notes above the table.
+    """
+    if not rows:
+        return None
+    widest = max(sum(v is not None for v in row) for row in rows)
+    for index, row in enumerate(rows):
+        filled = [v for v in row if v is not None]
+        if len(filled) >= max(1, widest / 2) and all(isinstance(v, str) for v in filled):
+            return index
+        if len(filled) >= max(1, widest / 2):
+            # A wide row of data came first, so there is no header
+            return None
+    return None
+
+
+def _is_code_text(value: str) -> bool:
+    """Whether numeric-looking text would lose information as a number.
+
+    Zero-padded codes ("007", ZIP and account codes) lose their leading
+    zeros, and digit strings longer than a float's precision lose digits.
+    """
+    text = value.strip().lstrip("+-")
+    if len(text) > 1 and text[0] == "0" and text[1].isdigit():
+        return True
+    return sum(c.isdigit() for c in text) > MAX_NUMERIC_TEXT_DIGITS
+
+
+def _has_year(value: Any) -> bool:
+    """Whether a cell can be a full date: a date value, or text with a year in it.
+
+    pd.to_datetime also accepts month names ("Jan"), ordinals ("1st") and
+    times ("10:30"), filling in year 1 or today's date; those stay text.
+    """
+    if not isinstance(value, str):
+        return True
+    return bool(_YEAR_PATTERN.search(value) or _SHORT_DATE_PATTERN.search(value))
+
+
+def _infer_column(values: pd.Series) -> pd.Series:
+    """Convert one object column to the narrowest dtype that holds all its values."""
+    values = values.map(lambda v: None if isinstance(v, str) and v.strip().lower() in NA_MARKERS else v)
+    present = values.dropna()
+    if present.empty:
+        return values.astype("float64")
+
+    kinds = set(present.map(type))
+    if kinds <= {bool}:
+        return values.astype("boolean")
+    if not kinds & {str, bool}:
+        numeric = pd.to_numeric(values, errors="coerce")
+        if numeric.notna().sum() == len(present):
+            return numeric
+
+    if kinds <= {str, int, float} and not any(_is_code_text(v) for v in present if isinstance(v, str)):
+        numeric = pd.to_numeric(values.map(lambda v: v.strip() if isinstance(v, str) else v), errors="coerce")
+        if numeric.notna().sum() == len(present):
+            return numeric
+
+    sample = present.head(DATE_SAMPLE_SIZE)
+    if all(_has_year(v) for v in present) and pd.to_datetime(sample, errors="coerce", format="mixed").notna().all():
+        parsed = pd.to_datetime(values, errors="coerce", format="mixed")
+        if parsed.notna().sum() == len(present):
+            return parsed
+
+    return values.astype("str")
+
+
+def infer_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Dtype inference pass over the object and text columns of a sheet read."""
+    for column in df.columns:
+        dtype = df[column].dtype
+        if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+            df[column] = _infer_column(df[column])
+    return df
+
+
+def read_excel_dataset(
+    file_path: str,
+    sheet_name: Optional[str] = None,
+    header_row: Optional[int] = None,
+    cell_range: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Tuple[pd.DataFrame, dict]:
+    """Read one worksheet (or range of it) into a typed DataFrame.
+
+    Args:
+        file_path: Path to an .xlsx/.xlsm file
+        sheet_name: Worksheet to read (default: the first sheet)
+        header_row: Sheet row number holding the column names; 0 means the
+            table has no header row; None detects it
+        cell_range: Optional range such as "B3:H2000" (default: the used range)
+        chunk_size: Rows converted to a DataFrame at a time
+
+    Returns:
+        (DataFrame, details about the sheet, range and header used)
+    """
+    from ...excel.cell_utils import parse_cell_range
+    from ...excel.data import iter_excel_range, make_header_names
+    from openpyxl.utils import get_column_letter
+
+    if sheet_name is None:
+        from ...excel.workbook_session import workbook_session
+        wb = workbook_session.open_for_read(file_path)
+        try:
+            sheet_name = wb.sheetnames[0]
+        finally:
+            wb.close()
+
+    start_cell, end_cell = "A1", None
+    if cell_range:
+        start_cell, _, end_cell = cell_range.partition(":")
+        end_cell = end_cell or None
+    if header_row:
+        # Reading starts at the header row, inside the range's columns
+        start_row, start_col, _, _ = parse_cell_range(start_cell)
+        if header_row < start_row:
+            raise ValueError(f"header_row {header_row} is above the start of range {cell_range}")
+        start_cell = f"{get_column_letter(start_col)}{header_row}"
+
+    columns = None
+    frames = []
+    width = None
+    header_index = None
+    for chunk in iter_excel_range(file_path, sheet_name, start_cell, end_cell, chunk_size=chunk_size):
+        if width is None:
+            if header_row == 0:
+                header_index = None
+            elif header_row:
+                header_index = 0
+            else:
+                header_index = detect_header_row(chunk[:HEADER_SCAN_ROWS])
+
+            if header_index is None:
+                width = max(len(row) for row in chunk)
+                columns = [f"column_{position}" for position in range(1, width + 1)]
+            else:
+                header = chunk[header_index]
+                width = max((i + 1 for i, v in enumerate(header) if v is not None), default=len(header))
+                columns = make_header_names(header[:width])
+                chunk = chunk[header_index + 1:]
+        if chunk:
+            frames.append(pd.DataFrame(
+                [row[:width] + [None] * (width - len(row)) for row in chunk], columns=columns
+            ))
+
+    if not frames:
+        df = pd.DataFrame(columns=columns or [])
+    else:
+        df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+    df = infer_dtypes(df)
+
+    details = {
+        "sheet_name": sheet_name,
+        "cell_range": cell_range,
+        "header_row": header_row,
+        "has_header": header_index is not None,
+    }
+    return df, details
@@ -0,0 +1,131 @@
+"""Dtype optimization for loaded DataFrames.
+
+Plans and applies per-column dtype conversions:
+- integers are downcast to the smallest signed/unsigned type holding their range
+- floats are downcast to float32 only when the conversion is lossless
+- low-cardinality string columns become ``category``
+- remaining object string columns become Arrow-backed strings (needs pyarrow)
+
+Savings are measured with ``memory_usage(deep=True)`` on the converted
+columns, never estimated.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    ARROW_STRINGS_AVAILABLE = True
+except ImportError:
+    ARROW_STRINGS_AVAILABLE = False
+
+
+DEFAULT_CATEGORICAL_THRESHOLD = 0.5
+
+
+def _is_string_column(series: pd.Series) -> bool:
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return False
+    if series.dtype == object:
+        return series.dropna().map(type).eq(str).all()
+    return pd.api.types.is_string_dtype(series.dtype)
+
+
+def convert_series(
+    series: pd.Series,
+    categorical_threshold: float = DEFAULT_CATEGORICAL_THRESHOLD,
+    use_arrow_strings: bool = True
+) -> Optional[pd.Series]:
+    """Convert one column to a smaller dtype, or return None if nothing applies."""
+    if series.count() == 0:
+        return None
+
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return None
+
+    if pd.api.types.is_integer_dtype(series.dtype):
+        if series.min() >= 0:
+            converted = pd.to_numeric(series, downcast='unsigned')
+        else:
+            converted = pd.to_numeric(series, downcast='integer')
+        return converted if converted.dtype != series.dtype else None
+
+    if pd.api.types.is_float_dtype(series.dtype):
+        if series.dtype == np.float32:
+            return None
+        converted = series.astype(np.float32)
+        # Only keep float32 when every value survives the round trip
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        restored = converted.to_numpy(dtype=np.float64, na_value=np.nan)
+        if np.array_equal(values, restored, equal_nan=True):
+            return converted
+        return None
+
+    if _is_string_column(series):
+        if series.nunique() / len(series) < categorical_threshold:
+            return series.astype('category')
+        if series.dtype == object and use_arrow_strings and ARROW_STRINGS_AVAILABLE:
+            return series.astype('string[pyarrow]')
+
+    return None
+
+
+def optimize_dataframe(
+    df: pd.DataFrame,
+    categorical_threshold: float = DEFAULT_CATEGORICAL_THRESHOLD,
+    use_arrow_strings: bool = True,
+    columns: Optional[List[str]] = None
+) -> Tuple[pd.DataFrame, dict]:
+    """Return an optimized copy of df and a report of measured savings.
+
+    Args:
+        df: DataFrame to optimize
+        categorical_threshold: Max unique/total ratio for converting strings to category
+        use_arrow_strings: Convert remaining object string columns to Arrow strings
+        columns: Restrict optimization to these columns
+
+    Returns:
+        Tuple of (optimized DataFrame, optimization report)
+    """
+    before_usage = df.memory_usage(deep=True)
+    converted: Dict[str, pd.Series] = {}
+    conversions = []
+
+    for col in (columns if columns is not None else df.columns):
+        new_series = convert_series(df[col], categorical_threshold, use_arrow_strings)
+        if new_series is None:
+            continue
+
+        before_bytes = int(before_usage[col])
+        after_bytes = int(new_series.memory_usage(deep=True, index=False))
+        if after_bytes >= before_bytes:
+            continue
+
+        converted[col] = new_series
+        conversions.append({
+            "column": col,
+            "from_dtype": str(df[col].dtype),
+            "to_dtype": str(new_series.dtype),
+            "before_kb": round(before_bytes / 1024, 2),
+            "after_kb": round(after_bytes / 1024, 2),
+            "saved_kb": round((before_bytes - after_bytes) / 1024, 2)
+        })
+
+    optimized = df
+    if converted:
+        optimized = df.copy(deep=False)
+        for col, new_series in converted.items():
+            optimized[col] = new_series
+
+    before_total = int(before_usage.sum())
+    after_total = int(optimized.memory_usage(deep=True).sum())
+    report = {
+        "conversions": conversions,
+        "before_mb": round(before_total / 1024**2, 2),
+        "after_mb": round(after_total / 1024**2, 2),
+        "saved_mb": round((before_total - after_total) / 1024**2, 2),
+        "saved_percentage": round((before_total - after_total) / before_total * 100, 2) if before_total else 0.0
+    }
+    return optimized, report
@@ -0,0 +1,168 @@
+"""Vectorized outlier scoring over many numeric columns.
+
+detect_outliers used to loop over columns, building a boolean frame and
+recomputing means and deviations for each one. Here the per-column bounds
+are numpy vectors and every column is tested in one broadcast comparison.
+The frame is evaluated in row chunks of at most OUTLIER_CHUNK_CELLS values,
+so sweeping hundreds of columns needs no full float copy of the data.
+
+Multivariate outliers are scored with a small isolation forest: random
+axis-aligned trees grown on row subsamples, where rows that are isolated in
+few splits get scores near 1. The trees are stored as flat node arrays, so
+a whole chunk of rows descends every tree at once.
+"""
+
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# ~32 MB of float64 per evaluated chunk
+OUTLIER_CHUNK_CELLS = 4_000_000
+
+ISOLATION_TREES = 100
+ISOLATION_SAMPLE_SIZE = 256
+# Scores well above 0.5 mark rows that are isolated faster than average
+ISOLATION_THRESHOLD = 0.6
+
+
+def row_chunks(n_rows: int, n_columns: int, chunk_cells: int = OUTLIER_CHUNK_CELLS) -> Iterator[Tuple[int, int]]:
+    """(start, stop) row ranges covering at most chunk_cells values each."""
+    step = max(1, chunk_cells // max(1, n_columns))
+    for start in range(0, n_rows, step):
+        yield start, min(start + step, n_rows)
+
+
+def as_matrix(frame: pd.DataFrame) -> np.ndarray:
+    """Float matrix of a frame, with missing values (including pd.NA) as NaN."""
+    return frame.to_numpy(dtype="float64", na_value=np.nan)
+
+
+def flag_outliers(
+    frame: pd.DataFrame,
+    is_outlier: Callable[[np.ndarray], np.ndarray],
+    max_values: int = 10,
+    chunk_cells: int = OUTLIER_CHUNK_CELLS
+) -> Tuple[np.ndarray, List[List[int]]]:
+    """Count flagged values per column of frame, evaluated in row chunks.
+
+    is_outlier maps a (rows x columns) float chunk to a boolean matrix of the
+    same shape; missing values must come out False. Returns the counts and
+    the row positions of the first max_values flagged values of each column.
+    """
+    counts = np.zeros(frame.shape[1], dtype=np.int64)
+    first: List[List[int]] = [[] for _ in range(frame.shape[1])]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for start, stop in row_chunks(len(frame), frame.shape[1], chunk_cells):
+            flags = is_outlier(as_matrix(frame.iloc[start:stop]))
+            counts += flags.sum(axis=0)
+            for j in np.flatnonzero(flags.any(axis=0)):
+                needed = max_values - len(first[j])
+                if needed > 0:
+                    first[j].extend((start + np.flatnonzero(flags[:, j])[:needed]).tolist())
+
+    return counts, first
+
+
+def average_path_length(n):
+    """Average path length of an unsuccessful binary search tree lookup among n points."""
+    n = np.asarray(n, dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        harmonic = 2.0 * (np.log(n - 1.0) + np.euler_gamma) - 2.0 * (n - 1.0) / n
+    return np.where(n > 2, harmonic, np.where(n == 2, 1.0, 0.0))
+
+
+class IsolationTree:
+    """One random isolation tree as flat node arrays."""
+
+    __slots__ = ("feature", "threshold", "left", "right", "path", "depth")
+
+    def __init__(self, sample: np.ndarray, rng: np.random.Generator):
+        self.depth = int(np.ceil(np.log2(max(len(sample), 2))))
+        feature, threshold, left, right, path = [], [], [], [], []
+
+        def new_node() -> int:
+            for column in (feature, threshold, left, right, path):
+                column.append(0)
+            return len(feature) - 1
+
+        stack = [(sample, 0, new_node())]
+        while stack:
+            rows, depth, node = stack.pop()
+            lo, hi = (rows.min(axis=0), rows.max(axis=0)) if len(rows) else (None, None)
+            splittable = np.flatnonzero(hi > lo) if len(rows) > 1 and depth < self.depth else ()
+            if not len(splittable):
+                # Leaf: the unbuilt subtree is credited with its expected depth
+                feature[node] = -1
+                path[node] = depth + float(average_path_length(len(rows)))
+                continue
+
+            f = int(rng.choice(splittable))
+            split = rng.uniform(lo[f], hi[f])
+            goes_left = rows[:, f] < split
+            feature[node], threshold[node] = f, split
+            left[node], right[node] = new_node(), new_node()
+            stack.append((rows[goes_left], depth + 1, left[node]))
+            stack.append((rows[~goes_left], depth + 1, right[node]))
+
+        self.feature = np.array(feature, dtype=np.intp)
+        self.threshold = np.array(threshold, dtype="float64")
+        self.left = np.array(left, dtype=np.intp)
+        self.right = np.array(right, dtype=np.intp)
+        self.path = np.array(path, dtype="float64")
+
+    def path_lengths(self, rows: np.ndarray) -> np.ndarray:
+        """Path length of every row, descending all rows level by level."""
+        node = np.zeros(len(rows), dtype=np.intp)
+        positions = np.arange(len(rows))
+        for _ in range(self.depth):
+            feature = self.feature[node]
+            internal = feature >= 0
+            if not internal.any():
+                break
+            goes_left = rows[positions, np.maximum(feature, 0)] < self.threshold[node]
+            node = np.where(internal, np.where(goes_left, self.left[node], self.right[node]), node)
+        return self.path[node]
+
+
+def isolation_scores(
+    frame: pd.DataFrame,
+    fill_values: Optional[np.ndarray] = None,
+    n_trees: int = ISOLATION_TREES,
+    sample_size: int = ISOLATION_SAMPLE_SIZE,
+    random_state: int = 0,
+    chunk_cells: int = OUTLIER_CHUNK_CELLS
+) -> np.ndarray:
+    """Isolation forest anomaly score (0-1, higher is more anomalous) of every row.
+
+    Missing values are replaced by fill_values (one per column, e.g. the
+    column medians) before scoring. Trees are grown on subsamples of
+    sample_size rows and scoring runs in row chunks.
+    """
+    n_rows = len(frame)
+    if n_rows == 0:
+        return np.zeros(0)
+    fill = np.nan_to_num(fill_values if fill_values is not None else np.zeros(frame.shape[1]))
+
+    def prepared(chunk: pd.DataFrame) -> np.ndarray:
+        values = as_matrix(chunk)
+        missing = np.isnan(values)
+        # as_matrix may return a read-only view of the frame, so fill into a copy
+        return np.where(missing, fill, values) if missing.any() else values
+
+    rng = np.random.default_rng(random_state)
+    sample_size = min(sample_size, n_rows)
+    samples = [rng.choice(n_rows, sample_size, replace=False) for _ in range(n_trees)]
+    # Gather every tree's sample rows in one take
+    sampled = prepared(frame.take(np.concatenate(samples)))
+    trees = [IsolationTree(sampled[i * sample_size:(i + 1) * sample_size], rng) for i in range(n_trees)]
+
+    scores = np.empty(n_rows)
+    normalizer = float(average_path_length(sample_size)) or 1.0
+    for start, stop in row_chunks(n_rows, frame.shape[1], chunk_cells):
+        rows = prepared(frame.iloc[start:stop])
+        mean_path = sum(tree.path_lengths(rows) for tree in trees) / n_trees
+        scores[start:stop] = 2.0 ** (-mean_path / normalizer)
+    return scores
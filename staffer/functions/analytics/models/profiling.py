@@ -0,0 +1,143 @@
+"""Column profiling engine for schema discovery.
+
+Each column is profiled by one call to profile_series, which computes every
+statistic exactly once: one null-count scan, one cardinality count, a min
+and a max pass for numeric and datetime columns, and sample values taken
+from the first rows instead of a full ``dropna()`` copy. Wide frames are profiled in parallel
+across columns on a thread pool (the heavy pandas kernels release the GIL).
+
+For wide, high-row-count tables cardinality can be estimated with a
+vectorized HyperLogLog sketch instead of an exact hash table, and numeric
+columns can carry a KLL quantile sketch (see quantile_sketch).
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+SAMPLE_SIZE = 3
+SAMPLE_PROBE_ROWS = 1000
+PARALLEL_MIN_COLUMNS = 8
+
+# HyperLogLog precision: 2**14 registers, ~0.8% standard error
+HLL_PRECISION = 14
+
+
+def estimate_cardinality(series: pd.Series, precision: int = HLL_PRECISION) -> int:
+    """Estimate the number of distinct non-null values with HyperLogLog."""
+    values = series.dropna()
+    if len(values) == 0:
+        return 0
+
+    try:
+        hashes = pd.util.hash_pandas_object(values, index=False)
+    except TypeError:
+        # Unhashable values such as lists parsed from nested JSON
+        hashes = pd.util.hash_pandas_object(values.astype(str), index=False)
+    hashes = hashes.to_numpy(dtype=np.uint64)
+    m = 1 << precision
+    value_bits = 64 - precision
+
+    register_index = (hashes >> np.uint64(value_bits)).astype(np.int64)
+    remainder = hashes & np.uint64((1 << value_bits) - 1)
+    # Rank = position of the leftmost 1-bit in the remaining bits
+    _, exponent = np.frexp(remainder.astype(np.float64))
+    rank = (value_bits - exponent + 1).astype(np.int8)
+
+    registers = np.zeros(m, dtype=np.int8)
+    np.maximum.at(registers, register_index, rank)
+
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.power(2.0, -registers.astype(np.float64)))
+
+    zero_registers = int(np.count_nonzero(registers == 0))
+    if estimate <= 2.5 * m and zero_registers > 0:
+        # Small-range correction (linear counting)
+        estimate = m * np.log(m / zero_registers)
+
+    return int(min(round(estimate), len(values)))
+
+
+def _count_unique(series: pd.Series) -> int:
+    try:
+        return int(series.nunique())
+    except TypeError:
+        # Unhashable values such as lists parsed from nested JSON
+        return int(series.dropna().astype(str).nunique())
+
+
+def _to_python(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _sample_values(series: pd.Series, not_null_count: int) -> List[Any]:
+    if not_null_count == 0:
+        return []
+    # The first non-null values are nearly always within the first rows
+    sample = series.iloc[:SAMPLE_PROBE_ROWS].dropna().head(SAMPLE_SIZE)
+    if len(sample) < min(SAMPLE_SIZE, not_null_count):
+        sample = series.dropna().head(SAMPLE_SIZE)
+    return sample.tolist()
+
+
+def profile_series(series: pd.Series, approximate_cardinality: bool = False, quantile_sketch: bool = False) -> dict:
+    """Profile a single column.
+
+    Returns:
+        Dict with row_count, null_count, unique_values, approximate,
+        min_value, max_value and sample_values, plus quantile_sketch (the
+        serialized sketch of a numeric column) when requested
+    """
+    row_count = len(series)
+    null_count = int(series.isna().sum())
+    not_null_count = row_count - null_count
+
+    if approximate_cardinality:
+        unique_values = estimate_cardinality(series)
+    else:
+        unique_values = _count_unique(series)
+
+    min_value = max_value = None
+    if not_null_count and (pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series)):
+        min_value = _to_python(series.min())
+        max_value = _to_python(series.max())
+
+    profile = {
+        "row_count": row_count,
+        "null_count": null_count,
+        "unique_values": unique_values,
+        "approximate": approximate_cardinality,
+        "min_value": min_value,
+        "max_value": max_value,
+        "sample_values": _sample_values(series, not_null_count),
+    }
+    if quantile_sketch and pd.api.types.is_numeric_dtype(series):
+        from .quantile_sketch import QuantileSketch
+        profile["quantile_sketch"] = QuantileSketch.from_values(series).to_dict()
+    return profile
+
+
+def profile_dataframe(
+    df: pd.DataFrame,
+    approximate_cardinality: bool = False,
+    max_workers: Optional[int] = None,
+    quantile_sketches: bool = False
+) -> Dict[Any, dict]:
+    """Profile every column of a DataFrame, in parallel for wide frames."""
+    columns = list(df.columns)
+
+    def profile(col):
+        return profile_series(df[col], approximate_cardinality, quantile_sketches)
+
+    if len(columns) < PARALLEL_MIN_COLUMNS:
+        return {col: profile(col) for col in columns}
+
+    workers = max_workers or min(32, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(columns, executor.map(profile, columns)))
@@ -0,0 +1,185 @@
+"""Mergeable KLL quantile sketches for numeric columns.
+
+Exact quantiles sort or partition the whole column on every call. A KLL
+sketch keeps a few hundred weighted samples in levels of "compactors":
+level h holds items standing for 2**h values each, and a full level is
+sorted and halved (every other item, random offset) into the level above.
+Quantile and histogram queries then read a small sorted array, and two
+sketches merge by concatenating their levels.
+
+Updates are batched for numpy: a large batch is sorted chunk by chunk and
+each sorted chunk goes straight to the level where it fits, taking every
+2**h-th item from a random offset, which is what h successive compactions
+of that sorted chunk would do. Building a sketch therefore costs one
+chunked sort of the column, after which queries do not depend on its size.
+
+The normalized rank error is about 2.296 / k**0.9723 (99% confidence), so
+1.3% for the default k of 200.
+"""
+
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_K = 200
+# Values sorted at once when a batch is folded into the sketch
+UPDATE_CHUNK = 1 << 16
+_CAPACITY_RATIO = 2 / 3
+
+
+class QuantileSketch:
+    """KLL sketch of the non-missing values of a numeric column."""
+
+    def __init__(self, k: int = DEFAULT_K, seed: int = 0):
+        self.k = k
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+        self._cdf = None
+
+    @classmethod
+    def from_values(cls, values: Any, k: int = DEFAULT_K, seed: int = 0) -> "QuantileSketch":
+        """Sketch of a Series or array; missing values are skipped."""
+        sketch = cls(k=k, seed=seed)
+        sketch.update(values)
+        return sketch
+
+    @property
+    def rank_error(self) -> float:
+        """Approximate normalized rank error of quantile answers (99% confidence)."""
+        return 2.296 / self.k ** 0.9723
+
+    @property
+    def retained(self) -> int:
+        """Number of weighted items the sketch keeps."""
+        return sum(len(level) for level in self.levels)
+
+    def update(self, values: Any) -> None:
+        """Add a batch of values."""
+        if isinstance(values, pd.Series):
+            values = values.to_numpy(dtype="float64", na_value=np.nan)
+        values = np.asarray(values, dtype="float64").ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+
+        self.n += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        for start in range(0, len(values), UPDATE_CHUNK):
+            chunk = np.sort(values[start:start + UPDATE_CHUNK])
+            # Level whose capacity the chunk fits after halving h times
+            height = max(0, int(np.ceil(np.log2(len(chunk) / self.k))))
+            if height:
+                stride = 1 << height
+                chunk = chunk[int(self._rng.integers(stride))::stride]
+            self._add(height, chunk)
+        self._compress()
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Fold another sketch into this one (sketches of disjoint parts of the data)."""
+        for height, level in enumerate(other.levels):
+            self._add(height, level)
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        """Approximate quantiles (qs in [0, 1]); NaN for an empty sketch."""
+        if not self.n:
+            return [float("nan")] * len(qs)
+        values, cumulative = self._distribution()
+        total = cumulative[-1]
+        answers = []
+        for q in qs:
+            if q <= 0:
+                answers.append(self.min)
+            elif q >= 1:
+                answers.append(self.max)
+            else:
+                index = min(int(np.searchsorted(cumulative, q * total, side="left")), len(values) - 1)
+                answers.append(float(values[index]))
+        return answers
+
+    def quantile(self, q: float) -> float:
+        return self.quantiles([q])[0]
+
+    def rank(self, value: float) -> float:
+        """Approximate fraction of values <= value."""
+        if not self.n:
+            return float("nan")
+        values, cumulative = self._distribution()
+        index = int(np.searchsorted(values, value, side="right"))
+        return float(cumulative[index - 1] / cumulative[-1]) if index else 0.0
+
+    def histogram(self, bins: int = 10, edges: Optional[Sequence[float]] = None) -> Dict[str, List[float]]:
+        """Approximate counts of values between consecutive edges (default: equal-width bins over min..max)."""
+        if edges is None:
+            edges = np.linspace(self.min, self.max, bins + 1) if self.n else np.zeros(bins + 1)
+        edges = [float(edge) for edge in edges]
+        ranks = [self.rank(edge) if self.n else 0.0 for edge in edges]
+        # The lowest edge includes the minimum itself
+        if self.n and edges[0] <= self.min:
+            ranks[0] = 0.0
+        counts = [round((high - low) * self.n) for low, high in zip(ranks, ranks[1:])]
+        return {"edges": edges, "counts": counts}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form, stored with the dataset schema."""
+        return {
+            "k": self.k,
+            "n": self.n,
+            "min": self.min if self.n else None,
+            "max": self.max if self.n else None,
+            "levels": [level.tolist() for level in self.levels],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(k=data["k"])
+        sketch.n = data["n"]
+        if sketch.n:
+            sketch.min, sketch.max = data["min"], data["max"]
+        sketch.levels = [np.asarray(level, dtype="float64") for level in data["levels"]] or [np.empty(0)]
+        return sketch
+
+    def _add(self, height: int, items: np.ndarray) -> None:
+        while len(self.levels) <= height:
+            self.levels.append(np.empty(0))
+        self.levels[height] = np.concatenate([self.levels[height], items])
+        self._cdf = None
+
+    def _capacity(self, height: int) -> int:
+        depth = len(self.levels) - height - 1
+        return max(2, int(np.ceil(self.k * _CAPACITY_RATIO ** depth)))
+
+    def _compress(self) -> None:
+        height = 0
+        while height < len(self.levels):
+            level = self.levels[height]
+            if len(level) > self._capacity(height):
+                level = np.sort(level)
+                # An odd item out stays behind at this level
+                keep = level[:len(level) % 2]
+                promoted = level[len(keep):][int(self._rng.integers(2))::2]
+                self.levels[height] = keep
+                self._add(height + 1, promoted)
+            height += 1
+        self._cdf = None
+
+    def _distribution(self):
+        """Sorted retained items with their cumulative weights."""
+        if self._cdf is None:
+            values = np.concatenate(self.levels)
+            weights = np.concatenate([np.full(len(level), 1 << height, dtype=np.int64)
+                                      for height, level in enumerate(self.levels)])
+            order = np.argsort(values, kind="stable")
+            self._cdf = (values[order], np.cumsum(weights[order]))
+        return self._cdf
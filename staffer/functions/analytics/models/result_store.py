@@ -0,0 +1,64 @@
+"""Server-side storage for large tabular tool results.
+
+Small result tables are returned inline as before. Larger ones are registered
+as derived datasets and the response carries a compact handle plus a preview
+instead of the full table. A handle is an ordinary dataset name, so any tool
+that takes ``dataset_name`` (charts, exports, statistics) accepts it.
+"""
+
+import os
+from typing import Any, Callable, Optional, Tuple
+
+import pandas as pd
+
+from .schemas import DatasetManager
+
+
+DEFAULT_INLINE_CELLS = 200
+PREVIEW_ROWS = 5
+
+
+def inline_cell_limit() -> int:
+    """Largest result table (rows x columns) returned inline (override with RESULT_INLINE_CELLS)."""
+    return int(os.environ.get("RESULT_INLINE_CELLS", DEFAULT_INLINE_CELLS))
+
+
+def _as_table(result: Any, index_name: str) -> pd.DataFrame:
+    """Flatten a result Series/DataFrame into a plain table with string column names."""
+    table = result.to_frame() if isinstance(result, pd.Series) else result
+    if not isinstance(table.index, pd.RangeIndex):
+        if table.index.name is None and not any(table.index.names[1:]):
+            table = table.rename_axis(index_name)
+        table = table.reset_index()
+    table = table.copy()
+    table.columns = [str(col) for col in table.columns]
+    return table
+
+
+def store_result(
+    result: Any,
+    source_dataset: str,
+    kind: str,
+    description: str = "",
+    to_payload: Callable[[Any], Any] = lambda value: value.to_dict(),
+    index_name: str = "index"
+) -> Tuple[Any, Optional[dict]]:
+    """Return (inline payload, handle) for a tabular result.
+
+    Results within the inline limit come back whole with no handle. Larger
+    ones are registered as a derived dataset; the payload is then built from
+    the first PREVIEW_ROWS rows only and the handle describes the full table.
+    """
+    if result.size <= inline_cell_limit():
+        return to_payload(result), None
+
+    table = _as_table(result, index_name)
+    handle = DatasetManager.register_derived_dataset(table, source_dataset, kind, description)
+    return to_payload(result.head(PREVIEW_ROWS)), {
+        "dataset_handle": handle,
+        "rows": len(table),
+        "columns": list(table.columns),
+        "derived_from": source_dataset,
+        "preview_rows": min(PREVIEW_ROWS, len(result)),
+        "note": f"Full result stored as dataset '{handle}'; pass it as dataset_name to other tools"
+    }
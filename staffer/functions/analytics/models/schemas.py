@@ -4,8 +4,10 @@ from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any, Union
 from datetime import datetime
 from enum import Enum
+import hashlib
 import pandas as pd
 import numpy as np
+from .dataset_store import DatasetStore
 
 
 class ColumnInfo(BaseModel):
@@ -16,19 +18,36 @@ class ColumnInfo(BaseModel):
     null_percentage: float
     sample_values: List[Any]
     suggested_role: str  # 'categorical', 'numerical', 'temporal', 'identifier'
+    min_value: Optional[Any] = None
+    max_value: Optional[Any] = None
+    approximate_unique: bool = False
+    # Serialized QuantileSketch of a numeric column (see quantile_sketch)
+    quantile_sketch: Optional[Dict[str, Any]] = None
     
     @classmethod
-    def from_series(cls, series: pd.Series, name: str) -> 'ColumnInfo':
+    def from_series(cls, series: pd.Series, name: str, approximate_cardinality: bool = False) -> 'ColumnInfo':
         """Auto-discover column characteristics from pandas Series."""
+        from .profiling import profile_series
+        return cls.from_profile(series, name, profile_series(series, approximate_cardinality))
+    
+    @classmethod
+    def from_profile(cls, series: pd.Series, name: str, profile: Dict[str, Any]) -> 'ColumnInfo':
+        """Build column info from a precomputed column profile."""
+        row_count = profile["row_count"]
+        unique_values = profile["unique_values"]
+        
+        # HyperLogLog estimates are within a few percent, so allow for that
+        # when deciding whether every value is unique
+        identifier_threshold = row_count * 0.975 if profile["approximate"] else row_count
         
         # Determine suggested role
         if pd.api.types.is_numeric_dtype(series):
             role = 'numerical'
         elif pd.api.types.is_datetime64_any_dtype(series):
             role = 'temporal'
-        elif series.nunique() / len(series) < 0.5:  # Low cardinality = categorical
+        elif row_count and unique_values / row_count < 0.5:  # Low cardinality = categorical
             role = 'categorical'
-        elif series.nunique() == len(series):  # Unique values = identifier
+        elif unique_values >= identifier_threshold:  # Unique values = identifier
             role = 'identifier'
         else:
             role = 'categorical'
@@ -36,10 +55,14 @@ class ColumnInfo(BaseModel):
         return cls(
             name=name,
             dtype=str(series.dtype),
-            unique_values=series.nunique(),
-            null_percentage=series.isnull().mean() * 100,
-            sample_values=series.dropna().head(3).tolist(),
-            suggested_role=role
+            unique_values=unique_values,
+            null_percentage=profile["null_count"] / row_count * 100 if row_count else 0.0,
+            sample_values=profile["sample_values"],
+            suggested_role=role,
+            min_value=profile["min_value"],
+            max_value=profile["max_value"],
+            approximate_unique=profile["approximate"],
+            quantile_sketch=profile.get("quantile_sketch")
         )
 
 
@@ -51,11 +74,28 @@ class DatasetSchema(BaseModel):
     suggested_analyses: List[str]
     
     @classmethod
-    def from_dataframe(cls, df: pd.DataFrame, name: str) -> 'DatasetSchema':
-        """Auto-discover schema from pandas DataFrame."""
+    def from_dataframe(
+        cls,
+        df: pd.DataFrame,
+        name: str,
+        approximate_cardinality: bool = False,
+        quantile_sketches: bool = False
+    ) -> 'DatasetSchema':
+        """Auto-discover schema from pandas DataFrame.
+        
+        All columns are profiled by the profiling engine in one pass each,
+        in parallel for wide frames. approximate_cardinality switches unique
+        counts to HyperLogLog estimates for very large tables, and
+        quantile_sketches stores a KLL quantile sketch with every numeric column.
+        """
+        from .profiling import profile_dataframe
+        
+        profiles = profile_dataframe(
+            df, approximate_cardinality=approximate_cardinality, quantile_sketches=quantile_sketches
+        )
         columns = {}
         for col in df.columns:
-            columns[col] = ColumnInfo.from_series(df[col], col)
+            columns[col] = ColumnInfo.from_profile(df[col], col, profiles[col])
         
         # Generate analysis suggestions based on column types
         suggestions = []
@@ -78,43 +118,239 @@ class DatasetSchema(BaseModel):
         )
 
 
-# Global in-memory storage for datasets
-loaded_datasets: Dict[str, pd.DataFrame] = {}
+# Global in-memory storage for datasets (LRU spill-to-disk under a memory budget)
+loaded_datasets: DatasetStore = DatasetStore.from_env()
 dataset_schemas: Dict[str, DatasetSchema] = {}
+# Provenance of datasets registered from tool results (handle -> source info)
+derived_datasets: Dict[str, Dict[str, Any]] = {}
+
+
+def _table_digest(df: pd.DataFrame, kind: str) -> str:
+    """Short content hash of a result table (values, column names and kind)."""
+    digest = hashlib.sha1(repr((kind, [str(col) for col in df.columns])).encode())
+    try:
+        hashed = pd.util.hash_pandas_object(df, index=False)
+    except TypeError:
+        # Unhashable cells (lists, dicts) are hashed by their text
+        hashed = pd.util.hash_pandas_object(df.astype(str), index=False)
+    digest.update(hashed.to_numpy().tobytes())
+    return digest.hexdigest()[:10]
 
 
 class DatasetManager:
     """Simple in-memory dataset management."""
     
     @staticmethod
-    def load_dataset(file_path: str, dataset_name: str) -> dict:
-        """Load dataset into memory with automatic schema discovery."""
+    def load_dataset(
+        file_path: str,
+        dataset_name: str,
+        use_cache: bool = True,
+        optimize: bool = False,
+        approximate_cardinality: bool = False,
+        sheet_name: Optional[str] = None,
+        header_row: Optional[int] = None,
+        cell_range: Optional[str] = None,
+        quantile_sketches: bool = False
+    ) -> dict:
+        """Load dataset into memory with automatic schema discovery.
+        
+        Parsed files are kept in a columnar on-disk cache, so reloading an
+        unchanged file skips parsing and schema discovery. With optimize=True
+        column dtypes are shrunk before the dataset is stored (and cached).
+        
+        Excel workbooks (.xlsx/.xlsm) are read one sheet at a time; sheet_name,
+        header_row and cell_range select the table (see excel_ingest).
+        
+        quantile_sketches builds the numeric columns' quantile sketches during
+        ingestion, so they are cached with the schema instead of being built
+        on the first approximate (exact=False) query.
+        """
+        from . import dataset_cache
+        from .excel_ingest import has_pending_edits, is_excel_file, read_excel_dataset
+        from .memory_optimizer import optimize_dataframe
         
         # Determine format from file extension
         if file_path.endswith('.json'):
-            df = pd.read_json(file_path)
             file_format = 'json'
         elif file_path.endswith('.csv'):
-            df = pd.read_csv(file_path)
             file_format = 'csv'
+        elif is_excel_file(file_path):
+            file_format = 'excel'
         else:
             raise ValueError(f"Unsupported file format: {file_path}")
+        if file_format != 'excel' and (sheet_name or header_row is not None or cell_range):
+            raise ValueError("sheet_name, header_row and cell_range apply to Excel files only")
+        
+        cache_options = {}
+        cache_part = None
+        if file_format == 'excel':
+            # Uncommitted transaction edits are read, but the cache is keyed on the file
+            use_cache = use_cache and not has_pending_edits(file_path)
+            cache_options["header_row"] = header_row
+            cache_part = f"{sheet_name or ''}!{cell_range or ''}"
+        if optimize:
+            cache_options["optimize"] = True
+        if approximate_cardinality:
+            cache_options["approximate_cardinality"] = True
+        if quantile_sketches:
+            cache_options["quantile_sketches"] = True
+        optimization = None
+        excel_details = None
+        cached = dataset_cache.lookup(file_path, cache_options, part=cache_part) if use_cache else None
+        if cached is not None:
+            df, schema_json = cached
+            schema = DatasetSchema.model_validate_json(schema_json)
+            schema.name = dataset_name
+        else:
+            if file_format == 'json':
+                df = pd.read_json(file_path)
+            elif file_format == 'excel':
+                df, excel_details = read_excel_dataset(
+                    file_path, sheet_name=sheet_name, header_row=header_row, cell_range=cell_range
+                )
+            else:
+                df = pd.read_csv(file_path)
+            if optimize:
+                df, optimization = optimize_dataframe(df)
+            schema = DatasetSchema.from_dataframe(
+                df, dataset_name,
+                approximate_cardinality=approximate_cardinality,
+                quantile_sketches=quantile_sketches
+            )
+            if use_cache:
+                dataset_cache.store(file_path, df, schema.model_dump_json(), cache_options, part=cache_part)
         
         # Store in global memory
         loaded_datasets[dataset_name] = df
-        
-        # Discover and cache schema
-        schema = DatasetSchema.from_dataframe(df, dataset_name)
         dataset_schemas[dataset_name] = schema
         
-        return {
+        result = {
             "status": "loaded",
             "dataset_name": dataset_name,
             "rows": len(df),
             "columns": list(df.columns),
             "format": file_format,
-            "memory_usage": f"{df.memory_usage(deep=True).sum() / 1024**2:.1f} MB"
+            "cache_hit": cached is not None,
+            "memory_usage": f"{loaded_datasets.describe(dataset_name)['memory_bytes'] / 1024**2:.1f} MB"
+        }
+        if file_format == 'excel':
+            result["excel"] = excel_details or {
+                "sheet_name": sheet_name, "cell_range": cell_range, "header_row": header_row
+            }
+        if optimization is not None:
+            result["optimization"] = optimization
+        return result
+    
+    @staticmethod
+    def load_dataset_streaming(
+        file_path: str,
+        dataset_name: str,
+        columns: Optional[List[str]] = None,
+        row_filter: Optional[str] = None,
+        sample_size: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        max_memory_mb: Optional[float] = None,
+        optimize: bool = False,
+        approximate_cardinality: bool = False,
+        quantile_sketches: bool = False
+    ) -> dict:
+        """Load a CSV chunk by chunk with projection, filtering and reservoir sampling."""
+        from .streaming import stream_csv, DEFAULT_CHUNK_SIZE
+        from .memory_optimizer import optimize_dataframe
+        
+        if not file_path.endswith('.csv'):
+            raise ValueError(f"Streaming ingestion supports CSV files only: {file_path}")
+        
+        df, stats = stream_csv(
+            file_path,
+            columns=columns,
+            row_filter=row_filter,
+            sample_size=sample_size,
+            chunk_size=chunk_size or DEFAULT_CHUNK_SIZE,
+            max_memory_mb=max_memory_mb
+        )
+        optimization = None
+        if optimize:
+            df, optimization = optimize_dataframe(df)
+        
+        loaded_datasets[dataset_name] = df
+        dataset_schemas[dataset_name] = DatasetSchema.from_dataframe(
+            df, dataset_name,
+            approximate_cardinality=approximate_cardinality,
+            quantile_sketches=quantile_sketches
+        )
+        
+        result = {
+            "status": "loaded",
+            "dataset_name": dataset_name,
+            "rows": len(df),
+            "columns": list(df.columns),
+            "format": "csv",
+            "streaming": stats,
+            "memory_usage": f"{loaded_datasets.describe(dataset_name)['memory_bytes'] / 1024**2:.1f} MB"
+        }
+        if optimization is not None:
+            result["optimization"] = optimization
+        return result
+    
+    @staticmethod
+    def optimize_dataset(
+        dataset_name: str,
+        categorical_threshold: float = 0.5,
+        use_arrow_strings: bool = True,
+        columns: Optional[List[str]] = None
+    ) -> dict:
+        """Shrink column dtypes of a loaded dataset in place and report measured savings."""
+        from .memory_optimizer import optimize_dataframe
+        
+        df = DatasetManager.get_dataset(dataset_name)
+        optimized, report = optimize_dataframe(
+            df,
+            categorical_threshold=categorical_threshold,
+            use_arrow_strings=use_arrow_strings,
+            columns=columns
+        )
+        loaded_datasets[dataset_name] = optimized
+        
+        # Roles are unchanged by downcasting, only the recorded dtypes move
+        schema = dataset_schemas.get(dataset_name)
+        if schema is not None:
+            for conversion in report["conversions"]:
+                column_info = schema.columns.get(conversion["column"])
+                if column_info is not None:
+                    column_info.dtype = conversion["to_dtype"]
+        
+        return report
+    
+    @staticmethod
+    def register_derived_dataset(
+        df: pd.DataFrame,
+        source_dataset: str,
+        kind: str,
+        description: str = ""
+    ) -> str:
+        """Register a tool result table as a dataset and return its handle (dataset name).
+        
+        The handle ends in a digest of the table's contents, so calls with
+        different arguments get their own handles and a handle never comes to
+        point at different data; repeating an identical analysis reuses it.
+        """
+        handle = f"{source_dataset}__{kind}_{_table_digest(df, kind)}"
+        schema = DatasetSchema.from_dataframe(df, handle)
+        provenance = {
+            "source_dataset": source_dataset,
+            "kind": kind,
+            "description": description,
+            "created_at": datetime.now().isoformat()
         }
+        # Schema and provenance go in before the table, all under the store
+        # lock, so a reader never finds the handle without its schema
+        with loaded_datasets.lock:
+            if handle not in loaded_datasets:
+                dataset_schemas[handle] = schema
+                derived_datasets[handle] = provenance
+                loaded_datasets[handle] = df
+        return handle
     
     @staticmethod
     def get_dataset(dataset_name: str) -> pd.DataFrame:
@@ -123,6 +359,86 @@ class DatasetManager:
             raise ValueError(f"Dataset '{dataset_name}' not loaded. Use load_dataset() first.")
         return loaded_datasets[dataset_name]
     
+    @staticmethod
+    def get_columns(dataset_name: str, columns: List[str]) -> pd.DataFrame:
+        """Projection of a dataset onto the columns a tool touches.
+        
+        With pandas copy-on-write the projection shares column buffers with
+        the stored dataset until either side is modified, so tools that sort,
+        convert or add columns pay only for the columns they use instead of
+        copying the whole (possibly wide) table.
+        """
+        df = DatasetManager.get_dataset(dataset_name)
+        return df[list(dict.fromkeys(columns))]
+    
+    @staticmethod
+    def get_datetime_column(dataset_name: str, column: str) -> pd.Series:
+        """A column converted with pd.to_datetime, cached per dataset version."""
+        def parse() -> pd.Series:
+            values = DatasetManager.get_dataset(dataset_name)[column]
+            if pd.api.types.is_datetime64_any_dtype(values):
+                return values
+            return pd.to_datetime(values)
+        
+        if dataset_name not in loaded_datasets:
+            raise ValueError(f"Dataset '{dataset_name}' not loaded. Use load_dataset() first.")
+        return loaded_datasets.derived(dataset_name, ("datetime", column), parse)
+    
+    @staticmethod
+    def get_time_index(dataset_name: str, column: str) -> "TemporalIndex":
+        """Sort permutation and sorted DatetimeIndex of a date column, cached per dataset version."""
+        from .temporal_index import TemporalIndex
+        
+        return loaded_datasets.derived(
+            dataset_name,
+            ("time_index", column),
+            lambda: TemporalIndex(DatasetManager.get_datetime_column(dataset_name, column))
+        )
+
+    @staticmethod
+    def get_column_stats(dataset_name: str) -> "ColumnStats":
+        """Memo of per-column aggregates (moments, quantiles, value counts), cached per dataset version."""
+        from .column_stats import ColumnStats
+
+        return loaded_datasets.derived(
+            dataset_name,
+            ("column_stats",),
+            lambda: ColumnStats(DatasetManager.get_dataset(dataset_name))
+        )
+
+    @staticmethod
+    def get_quantile_sketch(dataset_name: str, column: str) -> "QuantileSketch":
+        """KLL quantile sketch of a numeric column, cached per dataset version.
+        
+        The sketch stored with the column's schema entry is reused while it
+        still covers the column's values; otherwise one is built and stored
+        there for later versions of the same data.
+        """
+        from .quantile_sketch import QuantileSketch
+        
+        def build() -> QuantileSketch:
+            values = DatasetManager.get_dataset(dataset_name)[column]
+            schema = dataset_schemas.get(dataset_name)
+            info = schema.columns.get(column) if schema is not None else None
+            not_null = int(values.notna().sum())
+            if info is not None and info.quantile_sketch and info.quantile_sketch["n"] == not_null:
+                return QuantileSketch.from_dict(info.quantile_sketch)
+            sketch = QuantileSketch.from_values(values)
+            if info is not None and schema.row_count == len(values):
+                info.quantile_sketch = sketch.to_dict()
+            return sketch
+        
+        if dataset_name not in loaded_datasets:
+            raise ValueError(f"Dataset '{dataset_name}' not loaded. Use load_dataset() first.")
+        return loaded_datasets.derived(dataset_name, ("quantile_sketch", column), build)
+    
+    @staticmethod
+    def get_dataset_version(dataset_name: str) -> int:
+        """Get the version of a loaded dataset (bumped on load, merge, sample or optimize)."""
+        if dataset_name not in loaded_datasets:
+            raise ValueError(f"Dataset '{dataset_name}' not loaded")
+        return loaded_datasets.version(dataset_name)
+    
     @staticmethod
     def list_datasets() -> List[str]:
         """Get names of all loaded datasets."""
@@ -130,21 +446,30 @@ class DatasetManager:
     
     @staticmethod
     def get_dataset_info(dataset_name: str) -> dict:
-        """Get basic info about loaded dataset."""
+        """Get basic info about loaded dataset (without reloading spilled data)."""
         if dataset_name not in loaded_datasets:
             raise ValueError(f"Dataset '{dataset_name}' not loaded")
             
-        df = loaded_datasets[dataset_name]
+        info = loaded_datasets.describe(dataset_name)
         schema = dataset_schemas[dataset_name]
         
         return {
             "name": dataset_name,
-            "shape": df.shape,
-            "columns": list(df.columns),
-            "memory_usage_mb": df.memory_usage(deep=True).sum() / 1024**2,
-            "schema": schema.model_dump()
+            "shape": (info["rows"], len(info["columns"])),
+            "columns": info["columns"],
+            "memory_usage_mb": info["memory_bytes"] / 1024**2,
+            "resident": info["resident"],
+            "derived_from": derived_datasets.get(dataset_name),
+            # Quantile sketches are internal state, not dataset information
+            "schema": schema.model_dump(exclude={"columns": {"__all__": {"quantile_sketch"}}})
         }
     
+    @staticmethod
+    def set_memory_budget(budget_mb: Optional[float]) -> dict:
+        """Set the RAM budget for loaded datasets; least recently used ones spill to disk."""
+        loaded_datasets.set_budget(budget_mb)
+        return loaded_datasets.stats()
+    
     @staticmethod
     def clear_dataset(dataset_name: str) -> dict:
         """Remove dataset from memory."""
@@ -153,6 +478,7 @@ class DatasetManager:
         
         del loaded_datasets[dataset_name]
         del dataset_schemas[dataset_name]
+        derived_datasets.pop(dataset_name, None)
         
         return {"status": "success", "message": f"Dataset '{dataset_name}' cleared from memory"}
     
@@ -162,6 +488,7 @@ class DatasetManager:
         count = len(loaded_datasets)
         loaded_datasets.clear()
         dataset_schemas.clear()
+        derived_datasets.clear()
         
         return {"status": "success", "message": f"Cleared {count} datasets from memory"}
 
@@ -0,0 +1,116 @@
+"""Chunked CSV ingestion with bounded memory.
+
+Reads a CSV in fixed-size chunks, applying column projection and a row filter
+to every chunk as it is read. When a sample size is given, a uniform sample is
+kept on the fly with a bottom-k reservoir (every row gets a random key and the
+k smallest keys survive), so peak memory is bounded by the sample rather than
+the file.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+_KEY_COLUMN = "__reservoir_key__"
+_POSITION_COLUMN = "__row_position__"
+
+
+class MemoryCeilingExceeded(ValueError):
+    """Raised when streamed rows would exceed the configured memory ceiling."""
+
+
+def _frame_memory_mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / 1024**2
+
+
+def stream_csv(
+    file_path: str,
+    columns: Optional[List[str]] = None,
+    row_filter: Optional[str] = None,
+    sample_size: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_memory_mb: Optional[float] = None,
+    random_state: int = 42
+) -> Tuple[pd.DataFrame, dict]:
+    """Read a CSV chunk by chunk into a projected, filtered and sampled DataFrame.
+
+    Args:
+        file_path: Path to the CSV file
+        columns: Columns to keep (projection is pushed into the CSV parser)
+        row_filter: pandas query expression applied to every chunk
+        sample_size: Keep a uniform random sample of this many matching rows
+        chunk_size: Rows parsed per chunk
+        max_memory_mb: Fail once the retained rows exceed this many megabytes
+        random_state: Seed for reservoir sampling
+
+    Returns:
+        Tuple of (DataFrame, ingestion statistics)
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer")
+    if sample_size is not None and sample_size <= 0:
+        raise ValueError("sample_size must be a positive integer")
+
+    rng = np.random.default_rng(random_state)
+    retained: List[pd.DataFrame] = []
+    reservoir: Optional[pd.DataFrame] = None
+    retained_mb = 0.0
+    peak_mb = 0.0
+    rows_scanned = 0
+    rows_matched = 0
+    chunks_read = 0
+
+    reader = pd.read_csv(file_path, usecols=columns, chunksize=chunk_size)
+    with reader:
+        for chunk in reader:
+            chunks_read += 1
+            positions = np.arange(rows_scanned, rows_scanned + len(chunk))
+            rows_scanned += len(chunk)
+
+            if row_filter:
+                mask = chunk.eval(row_filter)
+                chunk = chunk[mask.to_numpy()]
+                positions = positions[mask.to_numpy()]
+            rows_matched += len(chunk)
+
+            if sample_size is not None:
+                chunk = chunk.assign(**{_KEY_COLUMN: rng.random(len(chunk)), _POSITION_COLUMN: positions})
+                candidates = chunk if reservoir is None else pd.concat([reservoir, chunk], ignore_index=True)
+                reservoir = candidates.nsmallest(sample_size, _KEY_COLUMN)
+                retained_mb = _frame_memory_mb(reservoir)
+            else:
+                retained.append(chunk)
+                retained_mb += _frame_memory_mb(chunk)
+
+            peak_mb = max(peak_mb, retained_mb)
+            if max_memory_mb is not None and retained_mb > max_memory_mb:
+                raise MemoryCeilingExceeded(
+                    f"Streamed data exceeded the {max_memory_mb} MB memory ceiling after "
+                    f"{rows_scanned} rows. Use sample_size, columns or row_filter to reduce it."
+                )
+
+    if sample_size is not None:
+        if reservoir is None:
+            df = pd.read_csv(file_path, usecols=columns, nrows=0)
+        else:
+            # Restore file order so samples read like the source
+            df = (reservoir.sort_values(_POSITION_COLUMN)
+                  .drop(columns=[_KEY_COLUMN, _POSITION_COLUMN])
+                  .reset_index(drop=True))
+    elif retained:
+        df = pd.concat(retained, ignore_index=True)
+    else:
+        df = pd.read_csv(file_path, usecols=columns, nrows=0)
+
+    stats = {
+        "chunks_read": chunks_read,
+        "rows_scanned": rows_scanned,
+        "rows_matched": rows_matched,
+        "sampled": sample_size is not None and rows_matched > len(df),
+        "peak_memory_mb": round(peak_mb, 2),
+    }
+    return df, stats
@@ -0,0 +1,60 @@
+"""Sorted time index over one date column of a dataset.
+
+time_series_analysis used to parse the date column, sort the frame and
+resample on every call. A TemporalIndex holds the work that only depends on
+the date column: the positions of rows with a date, in time order (the sort
+permutation), and the matching sorted DatetimeIndex. It is cached per
+dataset version (see DatasetManager.get_time_index), so asking for the same
+date column with other value columns or frequencies only gathers the value
+columns and resamples an already sorted index.
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+
+class TemporalIndex:
+    """Sort permutation and sorted DatetimeIndex of a parsed date column."""
+
+    __slots__ = ("order", "index")
+
+    def __init__(self, dates: pd.Series):
+        index = pd.DatetimeIndex(dates)
+        positions = np.flatnonzero(~index.isna())
+        # Rows without a date are left out, as resample would drop them
+        self.order = positions[np.argsort(index.asi8[positions], kind="stable")]
+        self.index = index[self.order]
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def align(self, values: pd.DataFrame) -> pd.DataFrame:
+        """Rows of values (in dataset row order) reordered in time and indexed by date."""
+        return values.take(self.order).set_axis(self.index)
+
+    def resample(self, values: pd.DataFrame, rule: str, how: str = "mean") -> pd.DataFrame:
+        """Resample all columns of values in one pass over the sorted index."""
+        return getattr(self.align(values).resample(rule), how)()
+
+
+def resample_rule(frequency: str) -> str:
+    """Normalize a frequency alias for the installed pandas.
+
+    pandas 2.2 renamed the period-end aliases ("M" -> "ME", "Q" -> "QE",
+    "Y" -> "YE") and pandas 3 rejects the old ones, so older spellings are
+    mapped to whichever form this pandas accepts.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            to_offset(frequency)
+            return frequency
+        except ValueError as error:
+            try:
+                to_offset(f"{frequency}E")
+            except ValueError:
+                raise error
+            return f"{frequency}E"
@@ -36,6 +36,7 @@ Data analysis and manipulation functions:
 • **analyze_distributions** (dataset_name, column_name) - Analyze distribution of any column
 • **detect_outliers** (dataset_name, columns, method) - Detect outliers using configurable methods
 • **time_series_analysis** (dataset_name, date_column, value_column, frequency) - Temporal analysis for date data
+• **run_analysis_batch** (dataset_name, analyses, max_workers) - Run several distribution/outlier/segment analyses with shared aggregates computed once
 • **suggest_analysis** (dataset_name) - AI recommendations based on data characteristics
 
 ### Visualization
@@ -49,6 +50,7 @@ Data analysis and manipulation functions:
 • **calculate_feature_importance** (dataset_name, target_column, feature_columns) - Feature importance for predictive modeling
 • **memory_optimization_report** (dataset_name) - Analyze memory usage and suggest optimizations
 • **export_insights** (dataset_name, format, include_charts) - Export analysis in multiple formats
+• **export_dataset_to_excel** (dataset_name, filepath, sheet_name, as_table) - Write a dataset or result handle to an Excel sheet in bulk
 • **execute_custom_analytics_code** (dataset_name, python_code) - Execute custom Python code against loaded datasets
 
 ### Resource Mirror Tools
@@ -98,7 +98,7 @@ def get_dataset_summary(working_directory: str, dataset_name: str) -> dict:
             summary["numerical_summary"] = df[numerical_cols].describe().to_dict()
         
         # Categorical summary
-        categorical_cols = df.select_dtypes(include=['object', 'category']).columns
+        categorical_cols = df.select_dtypes(include=['object', 'category', 'string']).columns
         if len(categorical_cols) > 0:
             summary["categorical_summary"] = {}
             for col in categorical_cols:
@@ -339,16 +339,21 @@ def get_memory_usage(working_directory: str) -> dict:
                 "memory_mb": round(memory_mb, 1),
                 "rows": info["shape"][0],
                 "columns": info["shape"][1],
+                "resident": info["resident"],
                 "memory_per_row_kb": round(memory_mb * 1024 / info["shape"][0], 2) if info["shape"][0] > 0 else 0
             })
         
         # Sort by memory usage
         usage.sort(key=lambda x: x["memory_mb"], reverse=True)
         
+        store_stats = loaded_datasets.stats()
+        
         return {
             "datasets": usage,
             "total_memory_mb": round(total_memory, 1),
+            "resident_memory_mb": store_stats["resident_mb"],
             "dataset_count": len(usage),
+            "memory_budget": store_stats,
             "memory_recommendations": [
                 "Consider sampling large datasets before analysis",
                 "Clear unused datasets with clear_dataset()",
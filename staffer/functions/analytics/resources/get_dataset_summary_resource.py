@@ -2,11 +2,37 @@
 
 from ..models.schemas import DatasetManager, loaded_datasets, dataset_schemas
 from typing import Dict, Any, Optional
+import pandas as pd
 from google.genai import types
 
 
-def get_dataset_summary(working_directory: str, dataset_name: str) -> dict:
-    """Statistical summary (pandas.describe() equivalent)."""
+def _sketch_describe(dataset_name: str, frame: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+    """describe() of numeric columns with the quartiles read from quantile sketches."""
+    # Counts and moments are single passes; only the quartiles need sorting
+    moments = frame.agg(["count", "mean", "std", "min", "max"]).astype("float64")
+    described = {}
+    for col in frame.columns:
+        q25, q50, q75 = DatasetManager.get_quantile_sketch(dataset_name, col).quantiles((0.25, 0.5, 0.75))
+        column = moments[col]
+        described[col] = {
+            "count": column["count"],
+            "mean": column["mean"],
+            "std": column["std"],
+            "min": column["min"],
+            "25%": q25,
+            "50%": q50,
+            "75%": q75,
+            "max": column["max"]
+        }
+    return described
+
+
+def get_dataset_summary(working_directory: str, dataset_name: str, exact: bool = True) -> dict:
+    """Statistical summary (pandas.describe() equivalent).
+    
+    With exact=False the numeric quartiles come from quantile sketches
+    instead of sorting every column.
+    """
     try:
         df = DatasetManager.get_dataset(dataset_name)
         
@@ -20,10 +46,14 @@ def get_dataset_summary(working_directory: str, dataset_name: str) -> dict:
         # Numerical summary
         numerical_cols = df.select_dtypes(include=['number']).columns
         if len(numerical_cols) > 0:
-            summary["numerical_summary"] = df[numerical_cols].describe().to_dict()
+            if exact:
+                summary["numerical_summary"] = df[numerical_cols].describe().to_dict()
+            else:
+                summary["numerical_summary"] = _sketch_describe(dataset_name, df[numerical_cols])
+                summary["approximate_quantiles"] = True
         
         # Categorical summary
-        categorical_cols = df.select_dtypes(include=['object', 'category']).columns
+        categorical_cols = df.select_dtypes(include=['object', 'category', 'string']).columns
         if len(categorical_cols) > 0:
             summary["categorical_summary"] = {}
             for col in categorical_cols:
@@ -57,6 +87,10 @@ schema_get_dataset_summary = types.FunctionDeclaration(
                 type=types.Type.STRING,
                 description="Name of the dataset to summarize",
             ),
+            "exact": types.Schema(
+                type=types.Type.BOOLEAN,
+                description="Set false on very large datasets to take the quartiles from quantile sketches instead of sorting every column (default: true)",
+            ),
         },
         required=["dataset_name"],
     ),
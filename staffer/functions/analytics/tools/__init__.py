@@ -9,13 +9,16 @@ from .compare_datasets_tool import compare_datasets, schema_compare_datasets
 from .merge_datasets_tool import merge_datasets, schema_merge_datasets
 from .generate_dashboard_tool import generate_dashboard, schema_generate_dashboard
 from .export_insights_tool import export_insights, schema_export_insights
+from .export_dataset_to_excel_tool import export_dataset_to_excel, schema_export_dataset_to_excel
 from .calculate_feature_importance_tool import calculate_feature_importance, schema_calculate_feature_importance
 from .memory_optimization_report_tool import memory_optimization_report, schema_memory_optimization_report
+from .apply_memory_optimizations_tool import apply_memory_optimizations, schema_apply_memory_optimizations
 from .execute_custom_analytics_code_tool import execute_custom_analytics_code, schema_execute_custom_analytics_code
 
 # Pandas tools
 from .load_dataset_tool import load_dataset, schema_load_dataset
 from .list_loaded_datasets_tool import list_loaded_datasets, schema_list_loaded_datasets
+from .run_analysis_batch_tool import run_analysis_batch, schema_run_analysis_batch
 from .segment_by_column_tool import segment_by_column, schema_segment_by_column
 from .find_correlations_tool import find_correlations, schema_find_correlations
 from .create_chart_tool import create_chart, schema_create_chart
@@ -39,10 +42,14 @@ __all__ = [
     "schema_generate_dashboard",
     "export_insights",
     "schema_export_insights",
+    "export_dataset_to_excel",
+    "schema_export_dataset_to_excel",
     "calculate_feature_importance",
     "schema_calculate_feature_importance",
     "memory_optimization_report",
     "schema_memory_optimization_report",
+    "apply_memory_optimizations",
+    "schema_apply_memory_optimizations",
     "execute_custom_analytics_code",
     "schema_execute_custom_analytics_code",
     
@@ -51,6 +58,8 @@ __all__ = [
     "schema_load_dataset",
     "list_loaded_datasets",
     "schema_list_loaded_datasets",
+    "run_analysis_batch",
+    "schema_run_analysis_batch",
     "segment_by_column",
     "schema_segment_by_column",
     "find_correlations",
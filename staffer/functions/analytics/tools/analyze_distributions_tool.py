@@ -4,11 +4,17 @@ import pandas as pd
 import numpy as np
 from typing import List, Dict, Any, Optional, Union
 from ..models.schemas import DatasetManager, loaded_datasets, dataset_schemas, ChartConfig
+from ..models.column_stats import QUARTILES
 from google.genai import types
 
 
-def analyze_distributions(working_directory: str, dataset_name: str, column_name: str) -> dict:
-    """Analyze distribution of any column."""
+def analyze_distributions(working_directory: str, dataset_name: str, column_name: str, exact: bool = True) -> dict:
+    """Analyze distribution of any column.
+    
+    With exact=False the median and quartiles of a numeric column come from
+    its quantile sketch instead of partitioning the column, and the result
+    adds an approximate histogram.
+    """
     try:
         df = DatasetManager.get_dataset(dataset_name)
         
@@ -16,37 +22,50 @@ def analyze_distributions(working_directory: str, dataset_name: str, column_name
             return {"error": f"Column '{column_name}' not found in dataset"}
         
         series = df[column_name]
+        stats = DatasetManager.get_column_stats(dataset_name)
+        null_values = stats.get("nulls", column_name)
         
         result = {
             "dataset": dataset_name,
             "column": column_name,
             "dtype": str(series.dtype),
             "total_values": len(series),
-            "unique_values": series.nunique(),
-            "null_values": series.isnull().sum(),
-            "null_percentage": round(series.isnull().mean() * 100, 2)
+            "unique_values": int(stats.get("nunique", column_name)),
+            "null_values": null_values,
+            "null_percentage": round(null_values / len(series) * 100, 2)
         }
         
         if pd.api.types.is_numeric_dtype(series):
             # Numerical distribution
+            if exact:
+                quartiles = stats.get("quartiles", column_name)
+                median = stats.get("median", column_name)
+            else:
+                sketch = DatasetManager.get_quantile_sketch(dataset_name, column_name)
+                quartiles = dict(zip(QUARTILES, sketch.quantiles(QUARTILES)))
+                median = quartiles[0.5]
             result.update({
                 "distribution_type": "numerical",
-                "mean": round(series.mean(), 3),
-                "median": round(series.median(), 3),
-                "std": round(series.std(), 3),
-                "min": series.min(),
-                "max": series.max(),
+                "mean": round(stats.get("mean", column_name), 3),
+                "median": round(median, 3),
+                "std": round(stats.get("std", column_name), 3),
+                "min": stats.get("min", column_name),
+                "max": stats.get("max", column_name),
                 "quartiles": {
-                    "q25": round(series.quantile(0.25), 3),
-                    "q50": round(series.quantile(0.50), 3),
-                    "q75": round(series.quantile(0.75), 3)
+                    "q25": round(quartiles[0.25], 3),
+                    "q50": round(quartiles[0.5], 3),
+                    "q75": round(quartiles[0.75], 3)
                 },
-                "skewness": round(series.skew(), 3),
-                "kurtosis": round(series.kurtosis(), 3)
+                "skewness": round(stats.get("skew", column_name), 3),
+                "kurtosis": round(stats.get("kurtosis", column_name), 3)
             })
+            if not exact:
+                result["exact"] = False
+                result["quantile_rank_error"] = round(sketch.rank_error, 4)
+                result["histogram"] = sketch.histogram(10)
         else:
             # Categorical distribution
-            value_counts = series.value_counts().head(10)
+            value_counts = stats.get("top_values", column_name)
             result.update({
                 "distribution_type": "categorical",
                 "most_frequent": value_counts.index[0] if len(value_counts) > 0 else None,
@@ -75,6 +94,10 @@ schema_analyze_distributions = types.FunctionDeclaration(
                 type=types.Type.STRING,
                 description="Name of the column to analyze",
             ),
+            "exact": types.Schema(
+                type=types.Type.BOOLEAN,
+                description="Set false on very large datasets to take the median and quartiles from a quantile sketch (about 1% rank error) instead of exact computation (default: true)",
+            ),
         },
         required=["dataset_name", "column_name"],
     ),
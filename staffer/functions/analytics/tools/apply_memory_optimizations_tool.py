@@ -0,0 +1,77 @@
+"""Memory optimization apply tool implementation."""
+
+import pandas as pd
+import numpy as np
+from typing import List, Dict, Any, Optional
+from ..models.schemas import DatasetManager, loaded_datasets, dataset_schemas
+from google.genai import types
+
+
+def apply_memory_optimizations(
+    working_directory: str,
+    dataset_name: str,
+    columns: Optional[List[str]] = None,
+    categorical_threshold: float = 0.5,
+    use_arrow_strings: bool = True
+) -> dict:
+    """Apply dtype optimizations to a loaded dataset and report measured savings."""
+    try:
+        df = DatasetManager.get_dataset(dataset_name)
+        
+        if columns is not None:
+            missing_cols = [col for col in columns if col not in df.columns]
+            if missing_cols:
+                return {"error": f"Columns not found: {missing_cols}"}
+        
+        report = DatasetManager.optimize_dataset(
+            dataset_name,
+            categorical_threshold=categorical_threshold,
+            use_arrow_strings=use_arrow_strings,
+            columns=columns
+        )
+        
+        return {
+            "dataset": dataset_name,
+            "columns_converted": len(report["conversions"]),
+            "conversions": report["conversions"],
+            "memory_usage": {
+                "before_mb": report["before_mb"],
+                "after_mb": report["after_mb"],
+                "saved_mb": report["saved_mb"],
+                "saved_percentage": report["saved_percentage"]
+            },
+            "status": "success"
+        }
+        
+    except Exception as e:
+        return {"error": f"Memory optimization failed: {str(e)}"}
+
+
+# Gemini function schema
+schema_apply_memory_optimizations = types.FunctionDeclaration(
+    name="apply_memory_optimizations",
+    description="Apply dtype optimizations (integer/float downcasting, categorical and Arrow-backed strings) to a loaded dataset and report measured memory savings",
+    parameters=types.Schema(
+        type=types.Type.OBJECT,
+        properties={
+            "dataset_name": types.Schema(
+                type=types.Type.STRING,
+                description="Name of the dataset to optimize",
+            ),
+            "columns": types.Schema(
+                type=types.Type.ARRAY,
+                description="List of columns to optimize. If not specified, all columns are considered",
+                items=types.Schema(type=types.Type.STRING),
+            ),
+            "categorical_threshold": types.Schema(
+                type=types.Type.NUMBER,
+                description="Maximum unique/total ratio for converting strings to categorical (default 0.5)",
+            ),
+            "use_arrow_strings": types.Schema(
+                type=types.Type.BOOLEAN,
+                description="Convert high-cardinality string columns to Arrow-backed strings (default: true)",
+            ),
+        },
+        required=["dataset_name"],
+    ),
+)
@@ -9,6 +9,7 @@ import json
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Union
 from ..models.schemas import DatasetManager, loaded_datasets, dataset_schemas, ChartConfig
+from ..models.result_store import store_result
 from google.genai import types
 
 
@@ -37,6 +38,10 @@ def create_chart(
         if missing_cols:
             return {"error": f"Columns not found: {missing_cols}"}
         
+        # Work on the charted columns only, so sorts and group-bys never
+        # copy the untouched columns of wide tables
+        df = DatasetManager.get_columns(dataset_name, required_cols)
+        
         # Generate title if not provided
         if title is None:
             title = f"{chart_type.title()} Chart: {x_column}"
@@ -48,6 +53,9 @@ def create_chart(
         # Create chart based on type
         fig = None
         chart_data = None
+        handle = None
+        result_kind = "chart_" + "_".join(col for col in (x_column, y_column, groupby_column) if col)
+        result_description = f"Data behind the {chart_type} chart of '{dataset_name}'"
         
         if chart_type == "histogram":
             fig = px.histogram(df, x=x_column, color=groupby_column, title=title)
@@ -57,8 +65,9 @@ def create_chart(
             if not y_column:
                 # Count plot
                 if groupby_column:
-                    chart_data = df.groupby([x_column, groupby_column]).size().unstack(fill_value=0)
-                    fig = px.bar(chart_data, title=title)
+                    count_data = df.groupby([x_column, groupby_column]).size().unstack(fill_value=0)
+                    fig = px.bar(count_data, title=title)
+                    chart_data, handle = store_result(count_data, dataset_name, result_kind, result_description)
                 else:
                     chart_data = df[x_column].value_counts().head(20)
                     fig = px.bar(x=chart_data.index, y=chart_data.values, title=title)
@@ -67,12 +76,12 @@ def create_chart(
                 if groupby_column:
                     agg_data = df.groupby([x_column, groupby_column])[y_column].mean().unstack(fill_value=0)
                     fig = px.bar(agg_data, title=title)
-                    chart_data = agg_data.to_dict()
+                    chart_data, handle = store_result(agg_data, dataset_name, result_kind, result_description)
                 else:
                     agg_data = df.groupby(x_column)[y_column].mean()
                     fig = px.bar(x=agg_data.index, y=agg_data.values, title=title, 
                                 labels={'x': x_column, 'y': f'Mean {y_column}'})
-                    chart_data = agg_data.to_dict()
+                    chart_data, handle = store_result(agg_data, dataset_name, result_kind, result_description)
                     
         elif chart_type == "scatter":
             if not y_column:
@@ -84,14 +93,13 @@ def create_chart(
             if not y_column:
                 return {"error": "Line plot requires both x_column and y_column"}
             
-            # Sort by x_column for proper line plotting
-            df_sorted = df.sort_values(x_column)
-            
             if groupby_column:
+                # Sort by x_column for proper line plotting
+                df_sorted = df.sort_values(x_column)
                 fig = px.line(df_sorted, x=x_column, y=y_column, color=groupby_column, title=title)
             else:
-                # Group by x_column and aggregate y_column
-                line_data = df_sorted.groupby(x_column)[y_column].mean().reset_index()
+                # Group by x_column and aggregate y_column (group keys come out sorted)
+                line_data = df.groupby(x_column)[y_column].mean().reset_index()
                 fig = px.line(line_data, x=x_column, y=y_column, title=title)
                 
             chart_data = {"trend": "line_chart_generated"}
@@ -118,7 +126,7 @@ def create_chart(
             chart_file = str(Path(save_path).with_suffix('.html'))
             fig.write_html(chart_file)
         
-        return {
+        result = {
             "dataset": dataset_name,
             "chart_type": chart_type,
             "chart_config": {
@@ -131,6 +139,9 @@ def create_chart(
             "chart_file": chart_file,
             "status": "success"
         }
+        if handle:
+            result["result_handle"] = handle
+        return result
         
     except Exception as e:
         return {"error": f"Chart creation failed: {str(e)}"}
@@ -145,7 +156,7 @@ schema_create_chart = types.FunctionDeclaration(
         properties={
             "dataset_name": types.Schema(
                 type=types.Type.STRING,
-                description="Name of the dataset to visualize",
+                description="Name of the dataset to visualize, or a dataset_handle returned by another tool",
             ),
             "chart_type": types.Schema(
                 type=types.Type.STRING,
@@ -4,16 +4,70 @@ import pandas as pd
 import numpy as np
 from typing import List, Dict, Any, Optional, Union
 from ..models.schemas import DatasetManager, loaded_datasets, dataset_schemas, ChartConfig
+from ..models.outlier_scoring import (
+    ISOLATION_SAMPLE_SIZE, ISOLATION_THRESHOLD, ISOLATION_TREES, flag_outliers, isolation_scores
+)
+from ..models.result_store import store_result
 from google.genai import types
 
 
+OUTLIER_METHODS = ("iqr", "zscore", "mad", "isolation")
+
+# Robust z-score: 0.6745 * (x - median) / MAD, flagged above 3.5 (Iglewicz & Hoaglin)
+ROBUST_Z_THRESHOLD = 3.5
+MAD_SCALE = 0.6745
+# Mean absolute deviation scale used when the MAD of a column is 0
+MEAN_AD_SCALE = 1.253314
+
+
+def _column_vector(stats, stat: str, columns: List[str]) -> np.ndarray:
+    stats.prefetch(stat, columns)
+    return np.array([stats.get(stat, col) for col in columns], dtype="float64")
+
+
+def _isolation_outliers(dataset_name: str, df: pd.DataFrame, columns: List[str], stats) -> dict:
+    """Multivariate isolation forest scoring of the rows of df over columns."""
+    frame = df[columns]
+    scores = isolation_scores(frame, _column_vector(stats, "median", columns))
+    flagged = np.flatnonzero(scores > ISOLATION_THRESHOLD)
+    flagged = flagged[np.argsort(-scores[flagged], kind="stable")]
+
+    rows = frame.take(flagged)
+    rows.insert(0, "outlier_score", scores[flagged].round(3))
+    rows = rows.rename_axis("row")
+    payload, handle = store_result(
+        rows, dataset_name, "isolation_outliers",
+        description=f"Rows of '{dataset_name}' isolated by an isolation forest over {len(columns)} columns",
+        to_payload=lambda table: table.reset_index().to_dict(orient="records")
+    )
+
+    result = {
+        "outlier_count": len(flagged),
+        "outlier_percentage": round(len(flagged) / len(frame) * 100, 2) if len(frame) else 0.0,
+        "score_threshold": ISOLATION_THRESHOLD,
+        "trees": ISOLATION_TREES,
+        "sample_size": min(ISOLATION_SAMPLE_SIZE, len(frame)),
+        "outlier_rows": payload
+    }
+    if handle:
+        result["result_handle"] = handle
+    return result
+
+
 def detect_outliers(
     working_directory: str,
     dataset_name: str, 
     columns: Optional[List[str]] = None,
-    method: str = "iqr"
+    method: str = "iqr",
+    exact: bool = True
 ) -> dict:
-    """Detect outliers using configurable methods."""
+    """Detect outliers using configurable methods.
+
+    iqr, zscore and mad test each column on its own; all columns are tested
+    together in chunked matrix passes. isolation scores whole rows over all
+    the columns at once. With exact=False the iqr quartiles come from the
+    columns' quantile sketches.
+    """
     try:
         df = DatasetManager.get_dataset(dataset_name)
         
@@ -25,52 +79,81 @@ def detect_outliers(
             return {"error": "No numerical columns found for outlier detection"}
         
         # Filter to existing columns
-        existing_columns = [col for col in columns if col in df.columns]
+        existing_columns = [col for col in dict.fromkeys(columns) if col in df.columns]
         
-        outliers_info = {}
-        total_outliers = 0
+        if method not in OUTLIER_METHODS:
+            return {"error": f"Unsupported method: {method}. Use one of {', '.join(OUTLIER_METHODS)}"}
         
-        for col in existing_columns:
-            series = df[col].dropna()
-            
-            if method == "iqr":
-                Q1 = series.quantile(0.25)
-                Q3 = series.quantile(0.75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                
-                outliers = df[(df[col] < lower_bound) | (df[col] > upper_bound)][col]
-                
-            elif method == "zscore":
-                z_scores = np.abs((series - series.mean()) / series.std())
-                outlier_indices = z_scores > 3
-                outliers = series[outlier_indices]
-                lower_bound = series.mean() - 3 * series.std()
-                upper_bound = series.mean() + 3 * series.std()
-                
+        stats = DatasetManager.get_column_stats(dataset_name)
+        
+        if method == "isolation":
+            isolation = _isolation_outliers(dataset_name, df, existing_columns, stats) if existing_columns else None
+            return {
+                "dataset": dataset_name,
+                "method": method,
+                "columns_analyzed": existing_columns,
+                "total_outliers": isolation["outlier_count"] if isolation else 0,
+                "isolation": isolation
+            }
+        
+        if method == "iqr":
+            if exact:
+                stats.prefetch("quartiles", existing_columns)
+                quartiles = [stats.get("quartiles", col) for col in existing_columns]
             else:
-                return {"error": f"Unsupported method: {method}. Use 'iqr' or 'zscore'"}
+                quartiles = [
+                    dict(zip((0.25, 0.75), DatasetManager.get_quantile_sketch(dataset_name, col).quantiles((0.25, 0.75))))
+                    for col in existing_columns
+                ]
+            Q1 = np.array([q[0.25] for q in quartiles], dtype="float64")
+            Q3 = np.array([q[0.75] for q in quartiles], dtype="float64")
+            IQR = Q3 - Q1
+            lower_bound = Q1 - 1.5 * IQR
+            upper_bound = Q3 + 1.5 * IQR
+            is_outlier = lambda block: (block < lower_bound) | (block > upper_bound)
             
-            outlier_count = len(outliers)
-            total_outliers += outlier_count
+        elif method == "zscore":
+            mean = _column_vector(stats, "mean", existing_columns)
+            std = _column_vector(stats, "std", existing_columns)
+            lower_bound = mean - 3 * std
+            upper_bound = mean + 3 * std
+            is_outlier = lambda block: np.abs((block - mean) / std) > 3
             
+        else:
+            median = _column_vector(stats, "median", existing_columns)
+            scale = _column_vector(stats, "mad", existing_columns) / MAD_SCALE
+            constant = scale == 0
+            if constant.any():
+                no_mad = [col for col, flag in zip(existing_columns, constant) if flag]
+                scale[constant] = _column_vector(stats, "mean_abs_deviation", no_mad) * MEAN_AD_SCALE
+            lower_bound = median - ROBUST_Z_THRESHOLD * scale
+            upper_bound = median + ROBUST_Z_THRESHOLD * scale
+            is_outlier = lambda block: np.abs(block - median) / scale > ROBUST_Z_THRESHOLD
+        
+        stats.prefetch("count", existing_columns)
+        counts, first_rows = flag_outliers(df[existing_columns], is_outlier)
+        
+        outliers_info = {}
+        for i, col in enumerate(existing_columns):
             outliers_info[col] = {
-                "outlier_count": outlier_count,
-                "outlier_percentage": round(outlier_count / len(series) * 100, 2),
-                "lower_bound": round(lower_bound, 3),
-                "upper_bound": round(upper_bound, 3),
-                "outlier_values": outliers.head(10).tolist(),
+                "outlier_count": int(counts[i]),
+                "outlier_percentage": round(int(counts[i]) / int(stats.get("count", col)) * 100, 2),
+                "lower_bound": round(lower_bound[i], 3),
+                "upper_bound": round(upper_bound[i], 3),
+                "outlier_values": df[col].take(first_rows[i]).tolist(),
                 "method": method
             }
         
-        return {
+        result = {
             "dataset": dataset_name,
             "method": method,
             "columns_analyzed": existing_columns,
-            "total_outliers": total_outliers,
+            "total_outliers": int(counts.sum()),
             "outliers_by_column": outliers_info
         }
+        if method == "iqr" and not exact:
+            result["exact"] = False
+        return result
         
     except Exception as e:
         return {"error": f"Outlier detection failed: {str(e)}"}
@@ -94,8 +177,12 @@ schema_detect_outliers = types.FunctionDeclaration(
             ),
             "method": types.Schema(
                 type=types.Type.STRING,
-                description="Method for outlier detection: 'iqr' or 'zscore'",
-                enum=["iqr", "zscore"],
+                description="Method for outlier detection: 'iqr', 'zscore', 'mad' (robust z-score from the median absolute deviation) or 'isolation' (isolation forest over all columns together, scoring whole rows)",
+                enum=["iqr", "zscore", "mad", "isolation"],
+            ),
+            "exact": types.Schema(
+                type=types.Type.BOOLEAN,
+                description="Set false on very large datasets to take the iqr quartiles from quantile sketches instead of exact computation (default: true)",
             ),
         },
         required=["dataset_name"],
@@ -4,69 +4,38 @@ import pandas as pd
 import numpy as np
 from typing import List, Dict, Any, Optional
 from ..models.schemas import DatasetManager, loaded_datasets, dataset_schemas
+from ..code_workers import WorkerTimeout, export_dataset, get_worker_pool
 from google.genai import types
 
 
+EXECUTION_TIMEOUT = 30.0
+
+
 def execute_custom_analytics_code(working_directory: str, dataset_name: str, python_code: str) -> str:
     """
     Execute custom Python code against a loaded dataset.
     
     Implementation steps:
     1. Get dataset from DatasetManager
-    2. Serialize dataset to JSON for subprocess
-    3. Wrap user code in execution template
-    4. Execute via subprocess with uv run python -c
-    5. Capture and return stdout/stderr
+    2. Export dataset to an Arrow IPC file (reused until the dataset changes)
+    3. Run the code in a pre-warmed worker process with the dataset as 'df',
+       in working_directory so files it writes are kept
+    4. Return captured stdout/stderr
     """
-    import subprocess
-    import json
-    
     try:
         # Step 1: Get dataset
         df = DatasetManager.get_dataset(dataset_name)
         
-        # Step 2: Serialize dataset
-        dataset_json = df.to_json(orient='records')
-        
-        # Step 3: Create execution template
-        # Need to properly indent user code
-        import textwrap
-        indented_user_code = textwrap.indent(python_code, '    ')
-        
-        execution_code = f'''
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import json
-
-try:
-    # Load dataset
-    dataset_data = {dataset_json}
-    df = pd.DataFrame(dataset_data)
-    
-    # Execute user code
-{indented_user_code}
-    
-except Exception as e:
-    print(f"ERROR: {{type(e).__name__}}: {{str(e)}}")
-    import traceback
-    print("Traceback:")
-    print(traceback.format_exc())
-'''
-        
-        # Step 4: Execute subprocess
-        process = subprocess.run(
-            ['uv', 'run', '--with', 'pandas', '--with', 'numpy', '--with', 'plotly',
-             'python', '-c', execution_code],
-            capture_output=True,
-            text=True,
-            timeout=30.0
+        # Step 2: Hand the dataset over as a file instead of a source literal
+        data_path, data_format = export_dataset(
+            dataset_name, DatasetManager.get_dataset_version(dataset_name), df
         )
         
-        # Step 5: Get output
-        return process.stdout + process.stderr
+        # Step 3: Execute in a warm worker (pandas, numpy and plotly already imported)
+        return get_worker_pool().run(python_code, data_path, data_format, timeout=EXECUTION_TIMEOUT,
+                                     working_directory=working_directory)
             
-    except subprocess.TimeoutExpired:
+    except WorkerTimeout:
         return "TIMEOUT: Code execution exceeded 30 second limit"
     except Exception as e:
         return f"EXECUTION ERROR: {type(e).__name__}: {str(e)}"
@@ -85,7 +54,7 @@ schema_execute_custom_analytics_code = types.FunctionDeclaration(
             ),
             "python_code": types.Schema(
                 type=types.Type.STRING,
-                description="Python code to execute. The dataset will be available as 'df'",
+                description="Python code to execute. The dataset will be available as 'df'; pd, np and px are pre-imported",
             ),
         },
         required=["dataset_name", "python_code"],
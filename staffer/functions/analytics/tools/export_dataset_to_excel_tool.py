@@ -0,0 +1,117 @@
+"""Dataset to Excel export tool implementation."""
+
+import os
+from typing import List, Optional
+from ..models.schemas import DatasetManager, loaded_datasets, derived_datasets
+from google.genai import types
+
+
+def export_dataset_to_excel(
+    working_directory: str,
+    dataset_name: str,
+    filepath: str,
+    sheet_name: str = "Data",
+    columns: Optional[List[str]] = None,
+    style_header: bool = True,
+    as_table: bool = False,
+    table_style: str = "TableStyleMedium9",
+    replace_sheet: bool = False
+) -> dict:
+    """Write a loaded dataset (or a tool result handle) to an Excel worksheet.
+
+    New workbooks are streamed with openpyxl's write_only mode, so the data
+    never passes through the model as cell values and memory stays flat for
+    large exports. An existing workbook gets the dataset as an extra sheet.
+    """
+    try:
+        from ...excel.data import write_dataframe
+    except ImportError:
+        return {"error": "openpyxl library not available. Please install with: pip install openpyxl"}
+
+    working_dir_abs = os.path.abspath(working_directory)
+    file_abs_path = os.path.abspath(os.path.join(working_dir_abs, filepath))
+    if not file_abs_path.startswith(working_dir_abs):
+        return {"error": f'Cannot access "{filepath}" as it is outside the permitted working directory'}
+    if not file_abs_path.lower().endswith((".xlsx", ".xlsm")):
+        return {"error": f"Export file must be an .xlsx or .xlsm workbook: {filepath}"}
+
+    try:
+        if dataset_name not in loaded_datasets:
+            return {"error": f"Dataset '{dataset_name}' not loaded"}
+
+        df = DatasetManager.get_dataset(dataset_name)
+        if columns:
+            missing = [col for col in columns if col not in df.columns]
+            if missing:
+                return {"error": f"Columns not found in dataset: {missing}"}
+            df = df[columns]
+
+        os.makedirs(os.path.dirname(file_abs_path), exist_ok=True)
+        details = write_dataframe(
+            file_abs_path,
+            df,
+            sheet_name=sheet_name,
+            style_header=style_header,
+            table_name=dataset_name if as_table else None,
+            table_style=table_style,
+            replace_sheet=replace_sheet
+        )
+
+        result = {
+            "status": "success",
+            "dataset": dataset_name,
+            "export_file": os.path.relpath(file_abs_path, working_dir_abs),
+            **details
+        }
+        if dataset_name in derived_datasets:
+            result["derived_from"] = derived_datasets[dataset_name]
+        return result
+
+    except Exception as e:
+        return {"error": f"Export failed: {str(e)}"}
+
+
+# Gemini function schema
+schema_export_dataset_to_excel = types.FunctionDeclaration(
+    name="export_dataset_to_excel",
+    description="Write a loaded dataset or result handle to an Excel worksheet in bulk, without passing the data as cell values",
+    parameters=types.Schema(
+        type=types.Type.OBJECT,
+        properties={
+            "dataset_name": types.Schema(
+                type=types.Type.STRING,
+                description="Name of the dataset to export, or a dataset_handle returned by another tool",
+            ),
+            "filepath": types.Schema(
+                type=types.Type.STRING,
+                description="Path to the .xlsx workbook, relative to the working directory (created if missing)",
+            ),
+            "sheet_name": types.Schema(
+                type=types.Type.STRING,
+                description="Worksheet to write (default: Data)",
+            ),
+            "columns": types.Schema(
+                type=types.Type.ARRAY,
+                description="Only export these columns, in this order",
+                items=types.Schema(type=types.Type.STRING),
+            ),
+            "style_header": types.Schema(
+                type=types.Type.BOOLEAN,
+                description="Bold, shaded header row with frozen panes (default: true)",
+            ),
+            "as_table": types.Schema(
+                type=types.Type.BOOLEAN,
+                description="Define an Excel table over the exported data, named after the dataset",
+            ),
+            "table_style": types.Schema(
+                type=types.Type.STRING,
+                description="Excel table style (default: TableStyleMedium9)",
+            ),
+            "replace_sheet": types.Schema(
+                type=types.Type.BOOLEAN,
+                description="Replace the sheet if it already exists in the workbook",
+            ),
+        },
+        required=["dataset_name", "filepath"],
+    ),
+)
@@ -5,7 +5,7 @@ import numpy as np
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from pathlib import Path
-from ..models.schemas import DatasetManager, loaded_datasets, dataset_schemas
+from ..models.schemas import DatasetManager, loaded_datasets, dataset_schemas, derived_datasets
 from google.genai import types
 
 
@@ -41,6 +41,10 @@ def export_insights(working_directory: str, dataset_name: str, format: str = "js
             "suggested_analyses": schema.suggested_analyses
         }
         
+        # Datasets registered from tool results record where they came from
+        if dataset_name in derived_datasets:
+            insights["derived_from"] = derived_datasets[dataset_name]
+        
         # Add statistical summaries for numerical columns
         numerical_cols = [c for c, info in schema.columns.items() if info.suggested_role == 'numerical']
         if numerical_cols:
@@ -137,6 +141,7 @@ def export_insights(working_directory: str, dataset_name: str, format: str = "js
             "dataset": dataset_name,
             "export_format": format,
             "export_file": export_file,
+            "derived_from": insights.get("derived_from"),
             "insights_summary": {
                 "total_metrics": len(insights),
                 "has_numerical_summary": "numerical_summary" in insights,
@@ -158,7 +163,7 @@ schema_export_insights = types.FunctionDeclaration(
         properties={
             "dataset_name": types.Schema(
                 type=types.Type.STRING,
-                description="Name of the dataset to export insights for",
+                description="Name of the dataset to export insights for, or a dataset_handle returned by another tool",
             ),
             "format": types.Schema(
                 type=types.Type.STRING,
@@ -4,6 +4,7 @@ import pandas as pd
 import numpy as np
 from typing import List, Dict, Any, Optional, Union
 from ..models.schemas import DatasetManager, loaded_datasets, dataset_schemas, ChartConfig
+from ..models.result_store import store_result
 from google.genai import types
 
 
@@ -52,13 +53,21 @@ def find_correlations(
         # Sort by absolute correlation value
         strong_correlations.sort(key=lambda x: abs(x["correlation"]), reverse=True)
         
-        return {
+        matrix_payload, handle = store_result(
+            corr_matrix, dataset_name, "correlations",
+            description=f"Correlation matrix of '{dataset_name}'", index_name="column"
+        )
+        
+        result = {
             "dataset": dataset_name,
-            "correlation_matrix": corr_matrix.to_dict(),
+            "correlation_matrix": matrix_payload,
             "strong_correlations": strong_correlations,
             "columns_analyzed": existing_columns,
             "threshold": threshold
         }
+        if handle:
+            result["result_handle"] = handle
+        return result
         
     except Exception as e:
         return {"error": f"Correlation analysis failed: {str(e)}"}
@@ -73,7 +82,7 @@ schema_find_correlations = types.FunctionDeclaration(
         properties={
             "dataset_name": types.Schema(
                 type=types.Type.STRING,
-                description="Name of the dataset to analyze for correlations",
+                description="Name of the dataset to analyze for correlations, or a dataset_handle returned by another tool",
             ),
             "columns": types.Schema(
                 type=types.Type.ARRAY,
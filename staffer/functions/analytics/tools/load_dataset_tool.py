@@ -3,14 +3,78 @@
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Any, Optional, Union
-from ..models.schemas import DatasetManager, loaded_datasets, dataset_schemas, ChartConfig
+from ..models.schemas import DatasetManager, DatasetSchema, loaded_datasets, dataset_schemas, ChartConfig
 from google.genai import types
 
 
-def load_dataset(working_directory: str, file_path: str, dataset_name: str, sample_size: Optional[int] = None) -> dict:
-    """Load any JSON/CSV dataset into memory with automatic schema discovery."""
+def load_dataset(
+    working_directory: str,
+    file_path: str,
+    dataset_name: str,
+    sample_size: Optional[int] = None,
+    use_cache: bool = True,
+    streaming: bool = False,
+    columns: Optional[List[str]] = None,
+    row_filter: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+    max_memory_mb: Optional[float] = None,
+    optimize: bool = False,
+    approximate_cardinality: bool = False,
+    sheet_name: Optional[str] = None,
+    header_row: Optional[int] = None,
+    cell_range: Optional[str] = None,
+    quantile_sketches: bool = False
+) -> dict:
+    """Load any JSON/CSV/Excel dataset into memory with automatic schema discovery."""
     try:
-        result = DatasetManager.load_dataset(file_path, dataset_name)
+        # Projection, filters and memory ceilings are applied while reading a
+        # CSV, so peak memory is bounded by what is kept rather than the file
+        # size; streaming reads and memory ceilings are CSV only
+        is_csv = file_path.endswith('.csv')
+        if streaming or max_memory_mb or (is_csv and (columns or row_filter)):
+            return DatasetManager.load_dataset_streaming(
+                file_path,
+                dataset_name,
+                columns=columns,
+                row_filter=row_filter,
+                sample_size=sample_size,
+                chunk_size=chunk_size,
+                max_memory_mb=max_memory_mb,
+                optimize=optimize,
+                approximate_cardinality=approximate_cardinality,
+                quantile_sketches=quantile_sketches
+            )
+        
+        result = DatasetManager.load_dataset(
+            file_path,
+            dataset_name,
+            use_cache=use_cache,
+            optimize=optimize,
+            approximate_cardinality=approximate_cardinality,
+            sheet_name=sheet_name,
+            header_row=header_row,
+            cell_range=cell_range,
+            quantile_sketches=quantile_sketches
+        )
+        
+        # JSON and Excel files are read whole, then projected and filtered
+        if columns or row_filter:
+            df = DatasetManager.get_dataset(dataset_name)
+            if columns:
+                missing = [col for col in columns if col not in df.columns]
+                if missing:
+                    raise ValueError(f"Columns not found in {file_path}: {missing}")
+                df = df[columns]
+            if row_filter:
+                df = df.query(row_filter).reset_index(drop=True)
+            loaded_datasets[dataset_name] = df
+            dataset_schemas[dataset_name] = DatasetSchema.from_dataframe(
+                df, dataset_name,
+                approximate_cardinality=approximate_cardinality,
+                quantile_sketches=quantile_sketches
+            )
+            result["rows"] = len(df)
+            result["columns"] = list(df.columns)
         
         # Apply sampling if requested
         if sample_size and sample_size < result["rows"]:
@@ -38,13 +102,13 @@ def load_dataset(working_directory: str, file_path: str, dataset_name: str, samp
 # Gemini function schema
 schema_load_dataset = types.FunctionDeclaration(
     name="load_dataset",
-    description="Load any JSON/CSV dataset into memory with automatic schema discovery",
+    description="Load any JSON/CSV/Excel (.xlsx/.xlsm) dataset into memory with automatic schema discovery",
     parameters=types.Schema(
         type=types.Type.OBJECT,
         properties={
             "file_path": types.Schema(
                 type=types.Type.STRING,
-                description="Path to the dataset file (JSON or CSV format)",
+                description="Path to the dataset file (JSON, CSV or Excel .xlsx/.xlsm format)",
             ),
             "dataset_name": types.Schema(
                 type=types.Type.STRING,
@@ -54,6 +118,55 @@ schema_load_dataset = types.FunctionDeclaration(
                 type=types.Type.INTEGER,
                 description="Optional number of rows to sample for large datasets",
             ),
+            "use_cache": types.Schema(
+                type=types.Type.BOOLEAN,
+                description="Reuse the on-disk columnar cache when the file is unchanged (default: true)",
+            ),
+            "streaming": types.Schema(
+                type=types.Type.BOOLEAN,
+                description="Read a CSV in chunks with bounded memory; sample_size then uses reservoir sampling during the read",
+            ),
+            "columns": types.Schema(
+                type=types.Type.ARRAY,
+                description="Only load these columns (applied during the read for CSV, after loading for JSON/Excel)",
+                items=types.Schema(type=types.Type.STRING),
+            ),
+            "row_filter": types.Schema(
+                type=types.Type.STRING,
+                description="pandas query expression applied while reading a CSV (after loading for JSON/Excel), e.g. \"region == 'North' and amount > 100\"",
+            ),
+            "chunk_size": types.Schema(
+                type=types.Type.INTEGER,
+                description="Rows per chunk for streaming reads (default: 100000)",
+            ),
+            "max_memory_mb": types.Schema(
+                type=types.Type.NUMBER,
+                description="CSV only: abort a streaming read once the loaded rows exceed this many MB",
+            ),
+            "optimize": types.Schema(
+                type=types.Type.BOOLEAN,
+                description="Shrink column dtypes on load (downcast numbers, categorical/Arrow strings)",
+            ),
+            "approximate_cardinality": types.Schema(
+                type=types.Type.BOOLEAN,
+                description="Estimate unique counts with HyperLogLog during schema discovery (faster for very large, wide tables)",
+            ),
+            "sheet_name": types.Schema(
+                type=types.Type.STRING,
+                description="Excel only: worksheet to load (default: the first sheet)",
+            ),
+            "header_row": types.Schema(
+                type=types.Type.INTEGER,
+                description="Excel only: sheet row number holding the column names; 0 if the table has no header (default: detected, skipping title rows)",
+            ),
+            "cell_range": types.Schema(
+                type=types.Type.STRING,
+                description="Excel only: cell range holding the table, e.g. 'B3:H2000' (default: the used range)",
+            ),
+            "quantile_sketches": types.Schema(
+                type=types.Type.BOOLEAN,
+                description="Build a quantile sketch per numeric column while loading, so exact=False distribution, outlier and summary queries answer immediately (otherwise built on first use)",
+            ),
         },
         required=["file_path", "dataset_name"],
     ),
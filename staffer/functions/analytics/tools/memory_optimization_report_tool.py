@@ -4,6 +4,7 @@ import pandas as pd
 import numpy as np
 from typing import List, Dict, Any, Optional
 from ..models.schemas import DatasetManager, loaded_datasets, dataset_schemas
+from ..models.memory_optimizer import convert_series
 from google.genai import types
 
 
@@ -16,7 +17,7 @@ def memory_optimization_report(working_directory: str, dataset_name: str) -> dic
         memory_usage = df.memory_usage(deep=True)
         total_memory = memory_usage.sum()
         
-        # Analyze each column for optimization potential
+        # Dry-run each conversion and measure its real footprint
         optimization_suggestions = []
         potential_savings = 0
         
@@ -32,43 +33,14 @@ def memory_optimization_report(working_directory: str, dataset_name: str) -> dic
                 "potential_savings_kb": 0
             }
             
-            # String optimization
-            if col_type == 'object':
-                if df[col].apply(lambda x: isinstance(x, str)).all():
-                    # Check if can be categorical
-                    unique_ratio = df[col].nunique() / len(df)
-                    if unique_ratio < 0.5:
-                        suggestion["suggestion"] = "Convert to categorical"
-                        suggestion["potential_savings_kb"] = round(col_memory * 0.6 / 1024, 2)
-                        potential_savings += col_memory * 0.6
-            
-            # Integer optimization
-            elif 'int64' in col_type:
-                col_min, col_max = df[col].min(), df[col].max()
-                if col_min >= 0 and col_max <= 255:
-                    suggestion["suggestion"] = "Convert to uint8"
-                    suggestion["potential_savings_kb"] = round(col_memory * 0.875 / 1024, 2)
-                    potential_savings += col_memory * 0.875
-                elif col_min >= -128 and col_max <= 127:
-                    suggestion["suggestion"] = "Convert to int8"
-                    suggestion["potential_savings_kb"] = round(col_memory * 0.875 / 1024, 2)
-                    potential_savings += col_memory * 0.875
-                elif col_min >= -32768 and col_max <= 32767:
-                    suggestion["suggestion"] = "Convert to int16"
-                    suggestion["potential_savings_kb"] = round(col_memory * 0.75 / 1024, 2)
-                    potential_savings += col_memory * 0.75
-                elif col_min >= -2147483648 and col_max <= 2147483647:
-                    suggestion["suggestion"] = "Convert to int32"
-                    suggestion["potential_savings_kb"] = round(col_memory * 0.5 / 1024, 2)
-                    potential_savings += col_memory * 0.5
-            
-            # Float optimization
-            elif 'float64' in col_type:
-                # Check if values fit in float32
-                if df[col].between(-3.4e38, 3.4e38).all():
-                    suggestion["suggestion"] = "Convert to float32"
-                    suggestion["potential_savings_kb"] = round(col_memory * 0.5 / 1024, 2)
-                    potential_savings += col_memory * 0.5
+            converted = convert_series(df[col])
+            if converted is not None:
+                savings = col_memory - converted.memory_usage(deep=True, index=False)
+                if savings > 0:
+                    target = "categorical" if str(converted.dtype) == "category" else str(converted.dtype)
+                    suggestion["suggestion"] = f"Convert to {target}"
+                    suggestion["potential_savings_kb"] = round(savings / 1024, 2)
+                    potential_savings += savings
             
             if suggestion["suggestion"]:
                 optimization_suggestions.append(suggestion)
@@ -84,7 +56,9 @@ def memory_optimization_report(working_directory: str, dataset_name: str) -> dic
                 "total_mb": round(potential_savings / 1024**2, 2),
                 "percentage": round(potential_savings / total_memory * 100, 2)
             },
+            "measured": True,
             "recommendations": [
+                "Use apply_memory_optimizations() to apply these conversions",
                 "Convert low-cardinality strings to categorical",
                 "Use smaller integer types when possible",
                 "Consider float32 for decimal numbers",
@@ -17,9 +17,24 @@ def merge_datasets(
         if len(dataset_configs) < 2:
             return {"error": "Need at least 2 datasets to merge"}
         
+        # Each dataset enters the merge projected onto its "columns" (plus
+        # any join columns), so untouched columns of wide tables are never copied
+        join_columns = {config["join_column"] for config in dataset_configs if config.get("join_column")}
+        
+        def project(config: Dict[str, Any]) -> pd.DataFrame:
+            df = DatasetManager.get_dataset(config["dataset_name"])
+            columns = config.get("columns")
+            if not columns:
+                return df
+            missing = [col for col in columns if col not in df.columns]
+            if missing:
+                raise ValueError(f"Columns {missing} not found in dataset '{config['dataset_name']}'")
+            keys = [col for col in df.columns if col in join_columns and col not in columns]
+            return DatasetManager.get_columns(config["dataset_name"], keys + list(columns))
+        
         # Start with first dataset
         first_config = dataset_configs[0]
-        merged_df = DatasetManager.get_dataset(first_config["dataset_name"])
+        merged_df = project(first_config)
         
         merge_info = {
             "merge_strategy": join_strategy,
@@ -28,14 +43,29 @@ def merge_datasets(
             "merge_steps": []
         }
         
+        # Consecutive concatenations are collected and done in one pd.concat
+        # instead of re-copying the growing result at every step
+        pending_concat: List[pd.DataFrame] = []
+        concat_rows = len(merged_df)
+        concat_columns = dict.fromkeys(merged_df.columns)
+        
+        def flush_concat(df: pd.DataFrame) -> pd.DataFrame:
+            if not pending_concat:
+                return df
+            combined = pd.concat([df, *pending_concat], ignore_index=True, sort=False)
+            pending_concat.clear()
+            return combined
+        
         # Merge with each subsequent dataset
         for config in dataset_configs[1:]:
             dataset_name = config["dataset_name"]
             join_column = config.get("join_column")
             
-            df_to_merge = DatasetManager.get_dataset(dataset_name)
+            df_to_merge = project(config)
             
             if join_column:
+                merged_df = flush_concat(merged_df)
+                
                 # Merge on specific column
                 if join_column not in merged_df.columns:
                     return {"error": f"Join column '{join_column}' not found in merged dataset"}
@@ -45,6 +75,8 @@ def merge_datasets(
                 before_shape = merged_df.shape
                 merged_df = merged_df.merge(df_to_merge, on=join_column, how=join_strategy, suffixes=('', f'_{dataset_name}'))
                 after_shape = merged_df.shape
+                concat_rows = len(merged_df)
+                concat_columns = dict.fromkeys(merged_df.columns)
                 
                 merge_info["merge_steps"].append({
                     "merged_with": dataset_name,
@@ -56,9 +88,11 @@ def merge_datasets(
                 })
             else:
                 # Concatenate datasets
-                before_shape = merged_df.shape
-                merged_df = pd.concat([merged_df, df_to_merge], ignore_index=True, sort=False)
-                after_shape = merged_df.shape
+                before_shape = (concat_rows, len(concat_columns))
+                pending_concat.append(df_to_merge)
+                concat_rows += len(df_to_merge)
+                concat_columns.update(dict.fromkeys(df_to_merge.columns))
+                after_shape = (concat_rows, len(concat_columns))
                 
                 merge_info["merge_steps"].append({
                     "concatenated_with": dataset_name,
@@ -69,6 +103,8 @@ def merge_datasets(
             
             merge_info["datasets_merged"].append(dataset_name)
         
+        merged_df = flush_concat(merged_df)
+        
         # Save merged dataset
         merged_name = f"merged_{'_'.join(merge_info['datasets_merged'])}"
         loaded_datasets[merged_name] = merged_df
@@ -100,7 +136,7 @@ schema_merge_datasets = types.FunctionDeclaration(
         properties={
             "dataset_configs": types.Schema(
                 type=types.Type.ARRAY,
-                description="List of dataset configurations to merge",
+                description="List of dataset configurations to merge: {dataset_name, join_column (omit to concatenate rows), columns (optional list of columns to keep)}",
                 items=types.Schema(type=types.Type.OBJECT),
             ),
             "join_strategy": types.Schema(
@@ -0,0 +1,168 @@
+"""Batched analysis tool implementation."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+import pandas as pd
+from ..models.schemas import DatasetManager, loaded_datasets
+from .analyze_distributions_tool import analyze_distributions
+from .detect_outliers_tool import detect_outliers
+from .segment_by_column_tool import segment_by_column
+from google.genai import types
+
+
+BATCH_ANALYSES = {
+    "analyze_distributions": analyze_distributions,
+    "detect_outliers": detect_outliers,
+    "segment_by_column": segment_by_column,
+}
+
+_DISTRIBUTION_STATS = ("nulls", "nunique")
+_NUMERIC_DISTRIBUTION_STATS = ("mean", "median", "std", "min", "max", "quartiles", "skew", "kurtosis")
+# Statistics a quantile sketch answers when an analysis passes exact=False
+_SKETCHED_STATS = {"median", "quartiles"}
+_OUTLIER_STATS = {
+    "iqr": ("count", "quartiles"),
+    "zscore": ("count", "mean", "std"),
+    "mad": ("count", "median", "mad"),
+    "isolation": ("median",),
+}
+
+
+def _plan(df: pd.DataFrame, analyses: List[Dict[str, Any]]) -> Tuple[Dict[str, List[str]], List[Tuple[str, List[str]]], List[str]]:
+    """Shared aggregates a batch needs: {stat: columns}, the group-by tables and the quantile sketches."""
+    numeric = df.select_dtypes(include=[np.number]).columns.tolist()
+    stats: Dict[str, Dict[str, None]] = {}
+    segments: Dict[str, List[str]] = {}
+    sketches: Dict[str, None] = {}
+
+    def need(names, columns, exact=True):
+        for name in names:
+            if not exact and name in _SKETCHED_STATS:
+                sketches.update(dict.fromkeys(columns))
+            else:
+                stats.setdefault(name, {}).update(dict.fromkeys(columns))
+
+    for spec in analyses:
+        analysis = spec.get("analysis")
+        exact = spec.get("exact", True)
+        if analysis == "analyze_distributions":
+            column = spec.get("column_name")
+            if column in df.columns:
+                need(_DISTRIBUTION_STATS, [column])
+                if pd.api.types.is_numeric_dtype(df[column]):
+                    need(_NUMERIC_DISTRIBUTION_STATS, [column], exact)
+                else:
+                    need(["top_values"], [column])
+        elif analysis == "detect_outliers":
+            columns = spec.get("columns")
+            columns = numeric if columns is None else [col for col in columns if col in df.columns]
+            method = spec.get("method", "iqr")
+            need(_OUTLIER_STATS.get(method, ()), columns, exact or method != "iqr")
+        elif analysis == "segment_by_column":
+            column = spec.get("column_name")
+            if column in df.columns:
+                segments[column] = [col for col in numeric if col != column]
+
+    return {name: list(columns) for name, columns in stats.items()}, list(segments.items()), list(sketches)
+
+
+def run_analysis_batch(
+    working_directory: str,
+    dataset_name: str,
+    analyses: List[Dict[str, Any]],
+    max_workers: Optional[int] = None
+) -> dict:
+    """Run several analyses of one dataset as a single planned batch.
+
+    The aggregates the analyses have in common (null counts, moments,
+    quartiles, top values, group-by tables) are computed once, each over all
+    the columns that need it, in parallel on a thread pool; the analyses then
+    read them from the dataset's shared column statistics. Each result is
+    what the corresponding tool returns on its own.
+    """
+    try:
+        if dataset_name not in loaded_datasets:
+            return {"error": f"Dataset '{dataset_name}' not loaded"}
+        if not analyses:
+            return {"error": "No analyses given"}
+
+        invalid = [spec for spec in analyses if not isinstance(spec, dict) or spec.get("analysis") not in BATCH_ANALYSES]
+        if invalid:
+            return {"error": f"Each analysis needs an 'analysis' of {sorted(BATCH_ANALYSES)}; got {invalid}"}
+
+        df = DatasetManager.get_dataset(dataset_name)
+        stats = DatasetManager.get_column_stats(dataset_name)
+        computed_before = stats.computed
+        planned_stats, planned_segments, planned_sketches = _plan(df, analyses)
+
+        def run(spec: Dict[str, Any]) -> dict:
+            args = {key: value for key, value in spec.items() if key != "analysis"}
+            try:
+                result = BATCH_ANALYSES[spec["analysis"]](working_directory, dataset_name, **args)
+            except TypeError as e:
+                result = {"error": f"Invalid arguments for {spec['analysis']}: {str(e)}"}
+            return {"analysis": spec["analysis"], "arguments": args, "result": result}
+
+        workers = max_workers or min(32, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Shared aggregates first, then the analyses that read them
+            prefetches = [executor.submit(stats.prefetch, name, columns) for name, columns in planned_stats.items()]
+            prefetches += [executor.submit(stats.segments, column, numerical_cols)
+                           for column, numerical_cols in planned_segments]
+            prefetches += [executor.submit(DatasetManager.get_quantile_sketch, dataset_name, column)
+                           for column in planned_sketches]
+            for future in prefetches:
+                try:
+                    future.result()
+                except Exception:
+                    # Left uncached: the analyses that need the aggregate
+                    # compute it themselves and report their own errors
+                    pass
+            results = list(executor.map(run, analyses))
+
+        return {
+            "dataset": dataset_name,
+            "analyses_run": len(results),
+            "failed": sum(1 for entry in results if "error" in entry["result"]),
+            "shared_aggregates": {
+                "statistics": {name: len(columns) for name, columns in planned_stats.items()},
+                "group_by_columns": [column for column, _ in planned_segments],
+                "quantile_sketches": planned_sketches,
+                "computed": stats.computed - computed_before
+            },
+            "results": results,
+            # Derived datasets the analyses registered for large result tables
+            "result_handles": [entry["result"]["result_handle"] for entry in results
+                               if "result_handle" in entry["result"]]
+        }
+
+    except Exception as e:
+        return {"error": f"Analysis batch failed: {str(e)}"}
+
+
+# Gemini function schema
+schema_run_analysis_batch = types.FunctionDeclaration(
+    name="run_analysis_batch",
+    description="Run several distribution, outlier and segmentation analyses of one dataset together, computing shared aggregates once and in parallel",
+    parameters=types.Schema(
+        type=types.Type.OBJECT,
+        properties={
+            "dataset_name": types.Schema(
+                type=types.Type.STRING,
+                description="Name of the dataset to analyze",
+            ),
+            "analyses": types.Schema(
+                type=types.Type.ARRAY,
+                description="Analyses to run: {analysis: analyze_distributions|detect_outliers|segment_by_column, plus that tool's arguments, e.g. column_name, columns, method, top_n}",
+                items=types.Schema(type=types.Type.OBJECT),
+            ),
+            "max_workers": types.Schema(
+                type=types.Type.INTEGER,
+                description="Threads used for the shared aggregates and analyses (default: number of CPUs)",
+            ),
+        },
+        required=["dataset_name", "analyses"],
+    ),
+)
@@ -4,6 +4,7 @@ import pandas as pd
 import numpy as np
 from typing import List, Dict, Any, Optional, Union
 from ..models.schemas import DatasetManager, loaded_datasets, dataset_schemas, ChartConfig
+from ..models.result_store import store_result
 from google.genai import types
 
 
@@ -28,19 +29,12 @@ def segment_by_column(
         if column_name in numerical_cols:
             numerical_cols.remove(column_name)
         
+        # Group-by tables are shared with other calls on this dataset version
+        segments = DatasetManager.get_column_stats(dataset_name).segments(column_name, numerical_cols)
         if not numerical_cols:
             # No numerical columns - just count
-            segments = df.groupby(column_name).size().to_frame('count')
             segments = segments.sort_values('count', ascending=False).head(top_n)
         else:
-            # Aggregate numerical columns
-            agg_dict = {}
-            for col in numerical_cols:
-                agg_dict[col] = ['count', 'mean', 'sum', 'std']
-            
-            segments = df.groupby(column_name).agg(agg_dict)
-            # Flatten column names
-            segments.columns = ['_'.join(col).strip() for col in segments.columns]
             segments = segments.head(top_n)
         
         # Calculate percentages
@@ -53,14 +47,22 @@ def segment_by_column(
             segments['count'] = counts
             segments['percentage'] = (counts / total_rows * 100).round(2)
         
-        return {
+        segments_payload, handle = store_result(
+            segments, dataset_name, f"segments_by_{column_name}",
+            description=f"Segments of '{dataset_name}' by {column_name}"
+        )
+        
+        result = {
             "dataset": dataset_name,
             "segmented_by": column_name,
             "segment_count": len(segments),
-            "segments": segments.to_dict(),
+            "segments": segments_payload,
             "total_rows": total_rows,
             "numerical_columns_analyzed": numerical_cols
         }
+        if handle:
+            result["result_handle"] = handle
+        return result
         
     except Exception as e:
         return {"error": f"Segmentation failed: {str(e)}"}
@@ -75,7 +77,7 @@ schema_segment_by_column = types.FunctionDeclaration(
         properties={
             "dataset_name": types.Schema(
                 type=types.Type.STRING,
-                description="Name of the dataset to segment",
+                description="Name of the dataset to segment, or a dataset_handle returned by another tool",
             ),
             "column_name": types.Schema(
                 type=types.Type.STRING,
@@ -4,81 +4,109 @@ import pandas as pd
 import numpy as np
 from typing import List, Dict, Any, Optional, Union
 from ..models.schemas import DatasetManager, loaded_datasets, dataset_schemas, ChartConfig
+from ..models.temporal_index import resample_rule
 from google.genai import types
 
 
+def _summarize(ts_resampled: pd.Series) -> dict:
+    """Trend and statistics of one resampled series."""
+    # Calculate trend (simple linear), skipping periods without data
+    x = np.arange(len(ts_resampled))
+    observed = ts_resampled.notna().to_numpy()
+    if observed.sum() < 2:
+        # A line needs at least two observed periods
+        trend = {"slope": None, "direction": "insufficient data"}
+    else:
+        slope, intercept = np.polyfit(x[observed], ts_resampled.to_numpy()[observed], 1)
+        trend = {
+            "slope": round(slope, 4),
+            "direction": "increasing" if slope > 0 else "decreasing" if slope < 0 else "stable"
+        }
+    
+    return {
+        "trend": trend,
+        "statistics": {
+            "mean": round(ts_resampled.mean(), 3),
+            "std": round(ts_resampled.std(), 3),
+            "min": round(ts_resampled.min(), 3),
+            "max": round(ts_resampled.max(), 3)
+        },
+        "sample_values": ts_resampled.head(10).to_dict()
+    }
+
+
 def time_series_analysis(
     working_directory: str,
     dataset_name: str, 
     date_column: str, 
-    value_column: str,
-    frequency: str = "auto"
+    value_column: Optional[str] = None,
+    frequency: str = "auto",
+    value_columns: Optional[List[str]] = None
 ) -> dict:
-    """Temporal analysis when dates are detected."""
+    """Temporal analysis when dates are detected.
+    
+    Pass value_columns to resample several value columns in one pass; each
+    then gets its own trend, statistics and sample values under "columns".
+    """
     try:
         df = DatasetManager.get_dataset(dataset_name)
         
         if date_column not in df.columns:
             return {"error": f"Date column '{date_column}' not found"}
-        if value_column not in df.columns:
-            return {"error": f"Value column '{value_column}' not found"}
-        
-        # Ensure date column is datetime
-        df_ts = df.copy()
-        df_ts[date_column] = pd.to_datetime(df_ts[date_column])
+        columns = list(dict.fromkeys(([value_column] if value_column else []) + list(value_columns or [])))
+        if not columns:
+            return {"error": "Provide value_column or value_columns"}
+        for column in columns:
+            if column not in df.columns:
+                return {"error": f"Value column '{column}' not found"}
         
-        # Sort by date
-        df_ts = df_ts.sort_values(date_column)
+        # Parsed dates, their sort permutation and the sorted DatetimeIndex
+        # are cached per dataset version; only the value columns are gathered
+        time_index = DatasetManager.get_time_index(dataset_name, date_column)
+        if len(time_index) == 0:
+            return {"error": f"Date column '{date_column}' has no valid dates"}
         
         # Basic time series statistics
-        date_range = df_ts[date_column].max() - df_ts[date_column].min()
+        start, end = time_index.index[0], time_index.index[-1]
+        date_range = end - start
         
         # Group by date and aggregate value
         if frequency == "auto":
             # Determine frequency based on data span
             if date_range.days > 365:
-                freq = "M"  # Monthly
+                freq = resample_rule("M")  # Monthly
             elif date_range.days > 31:
                 freq = "W"  # Weekly
             else:
                 freq = "D"  # Daily
         else:
-            freq = frequency
-        
-        # Resample time series
-        df_ts.set_index(date_column, inplace=True)
-        ts_resampled = df_ts[value_column].resample(freq).mean()
+            freq = resample_rule(frequency)
         
-        # Calculate trend (simple linear)
-        x = np.arange(len(ts_resampled))
-        y = ts_resampled.values
-        slope, intercept = np.polyfit(x, y, 1)
+        # Resample every value column in one pass
+        resampled = time_index.resample(DatasetManager.get_columns(dataset_name, columns), freq)
         
-        # Calculate basic statistics
         result = {
             "dataset": dataset_name,
             "date_column": date_column,
-            "value_column": value_column,
             "frequency": freq,
             "date_range": {
-                "start": df_ts.index.min().isoformat(),
-                "end": df_ts.index.max().isoformat(),
+                "start": start.isoformat(),
+                "end": end.isoformat(),
                 "days": date_range.days
             },
-            "trend": {
-                "slope": round(slope, 4),
-                "direction": "increasing" if slope > 0 else "decreasing" if slope < 0 else "stable"
-            },
-            "statistics": {
-                "mean": round(ts_resampled.mean(), 3),
-                "std": round(ts_resampled.std(), 3),
-                "min": round(ts_resampled.min(), 3),
-                "max": round(ts_resampled.max(), 3)
-            },
-            "data_points": len(ts_resampled),
-            "sample_values": ts_resampled.head(10).to_dict()
+            "data_points": len(resampled)
         }
         
+        if value_columns:
+            result["value_columns"] = columns
+            result["columns"] = {column: _summarize(resampled[column]) for column in columns}
+        else:
+            summary = _summarize(resampled[value_column])
+            result["value_column"] = value_column
+            result["trend"] = summary["trend"]
+            result["statistics"] = summary["statistics"]
+            result["sample_values"] = summary["sample_values"]
+        
         return result
         
     except Exception as e:
@@ -106,9 +134,14 @@ schema_time_series_analysis = types.FunctionDeclaration(
             ),
             "frequency": types.Schema(
                 type=types.Type.STRING,
-                description="Frequency for time series aggregation (default: auto)",
+                description="Frequency for time series aggregation, e.g. D, W, ME (month end), QE (default: auto)",
+            ),
+            "value_columns": types.Schema(
+                type=types.Type.ARRAY,
+                description="Several value columns to resample in one pass instead of value_column; results are reported per column",
+                items=types.Schema(type=types.Type.STRING),
             ),
         },
-        required=["dataset_name", "date_column", "value_column"],
+        required=["dataset_name", "date_column"],
     ),
 )
\ No newline at end of file
@@ -1,5 +1,6 @@
 import logging
-from typing import Any, Dict, List, Optional
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
 
 from openpyxl.worksheet.worksheet import Worksheet
 from openpyxl.utils.cell import coordinate_from_string, column_index_from_string
@@ -33,6 +34,71 @@ def get_data_validation_for_cell(worksheet: Worksheet, cell_address: str) -> Opt
         logger.warning(f"Failed to get validation for cell {cell_address}: {e}")
         return None
 
+class ValidationIndex:
+    """Interval index of a worksheet's data validation ranges for per-cell lookups.
+
+    get_data_validation_for_cell scans every rule and every sqref range for
+    each cell, so reading a range costs O(cells x rules x ranges). The index
+    is built once per read: the distinct row boundaries of all ranges split
+    the sheet into row bands, and each band keeps only the column intervals
+    of the rules covering it, in rule order. A lookup bisects to the band and
+    checks those intervals; the matching rule for a (band, column) pair and
+    the metadata of each rule (including resolved list values) are cached,
+    so the rest of a column within a band costs a dictionary lookup.
+
+    Like get_data_validation_for_cell, the first rule covering a cell wins.
+    """
+
+    def __init__(self, worksheet: Worksheet):
+        self.worksheet = worksheet
+        self.rules = list(worksheet.data_validations.dataValidation)
+        intervals: List[Tuple[int, int, int, int, int]] = []
+        for rule_index, dv in enumerate(self.rules):
+            try:
+                for cell_range in dv.sqref.ranges:
+                    intervals.append((cell_range.min_row, cell_range.max_row,
+                                      cell_range.min_col, cell_range.max_col, rule_index))
+            except Exception as e:
+                logger.warning(f"Skipping validation with unreadable sqref '{getattr(dv, 'sqref', 'N/A')}': {e}")
+
+        # Band i covers rows [bounds[i], bounds[i + 1])
+        self._bounds = sorted({row for interval in intervals for row in (interval[0], interval[1] + 1)})
+        self._bands: List[List[Tuple[int, int, int]]] = [[] for _ in self._bounds]
+        for min_row, max_row, min_col, max_col, rule_index in intervals:
+            first = bisect_right(self._bounds, min_row) - 1
+            last = bisect_right(self._bounds, max_row) - 1
+            for band in range(first, last + 1):
+                self._bands[band].append((min_col, max_col, rule_index))
+        for band in self._bands:
+            band.sort(key=lambda interval: interval[2])
+
+        self._rule_cache: Dict[Tuple[int, int], Optional[int]] = {}
+        self._metadata_cache: Dict[int, Dict[str, Any]] = {}
+
+    def rule_for_cell(self, row: int, col: int) -> Optional[int]:
+        """Index into self.rules of the first rule covering the cell, or None."""
+        band = bisect_right(self._bounds, row) - 1
+        if band < 0:
+            return None
+        key = (band, col)
+        if key not in self._rule_cache:
+            self._rule_cache[key] = next(
+                (rule_index for min_col, max_col, rule_index in self._bands[band] if min_col <= col <= max_col),
+                None
+            )
+        return self._rule_cache[key]
+
+    def get_validation(self, row: int, col: int, cell_address: str) -> Optional[Dict[str, Any]]:
+        """Validation metadata for a cell, in the format of get_data_validation_for_cell."""
+        rule_index = self.rule_for_cell(row, col)
+        if rule_index is None:
+            return None
+        metadata = self._metadata_cache.get(rule_index)
+        if metadata is None:
+            metadata = _extract_validation_metadata(self.rules[rule_index], cell_address, self.worksheet)
+            self._metadata_cache[rule_index] = metadata
+        return {**metadata, "cell": cell_address}
+
 def _cell_in_validation_range(row: int, col: int, data_validation) -> bool:
     """Check if a cell is within a data validation range."""
     try:
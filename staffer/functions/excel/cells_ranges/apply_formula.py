@@ -5,7 +5,7 @@ from pathlib import Path
 from google.genai import types
 
 try:
-    from openpyxl import load_workbook
+    from ..workbook_session import open_workbook, save_workbook
     OPENPYXL_AVAILABLE = True
 except ImportError:
     OPENPYXL_AVAILABLE = False
@@ -40,7 +40,7 @@ def apply_formula(working_directory, filepath, sheet_name, cell, formula):
             return f"Error: File '{filepath}' does not exist"
         
         # Load workbook
-        wb = load_workbook(file_abs_path)
+        wb = open_workbook(file_abs_path)
         
         # Check if sheet exists
         if sheet_name not in wb.sheetnames:
@@ -64,7 +64,7 @@ def apply_formula(working_directory, filepath, sheet_name, cell, formula):
         cell_obj.value = formula_normalized
         
         # Save workbook
-        wb.save(file_abs_path)
+        save_workbook(wb, file_abs_path)
         
         return f"Applied formula '{formula_normalized}' to cell {cell}"
         
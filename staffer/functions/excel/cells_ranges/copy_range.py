@@ -5,7 +5,7 @@ from copy import copy as copy_style
 from google.genai import types
 
 try:
-    from openpyxl import load_workbook
+    from ..workbook_session import open_workbook, save_workbook
     from openpyxl.utils import column_index_from_string
     OPENPYXL_AVAILABLE = True
 except ImportError:
@@ -43,7 +43,7 @@ def copy_range(working_directory, filepath, sheet_name, source_start, source_end
             return f"Error: File {filepath} does not exist"
         
         # Load workbook
-        wb = load_workbook(file_abs_path)
+        wb = open_workbook(file_abs_path)
         
         # Check if source sheet exists
         if sheet_name not in wb.sheetnames:
@@ -104,7 +104,7 @@ def copy_range(working_directory, filepath, sheet_name, source_start, source_end
                 cells_copied += 1
         
         # Save workbook
-        wb.save(file_abs_path)
+        save_workbook(wb, file_abs_path)
         wb.close()
         
         # Format result message
@@ -4,7 +4,7 @@ import os
 from google.genai import types
 
 try:
-    from openpyxl import load_workbook
+    from ..workbook_session import open_workbook, save_workbook
     from openpyxl.utils import column_index_from_string, get_column_letter
     OPENPYXL_AVAILABLE = True
 except ImportError:
@@ -45,7 +45,7 @@ def delete_range(working_directory, filepath, sheet_name, start_cell, end_cell,
             return f"Error: Invalid shift direction: {shift_direction}. Must be 'up' or 'left'"
         
         # Load workbook
-        wb = load_workbook(file_abs_path)
+        wb = open_workbook(file_abs_path)
         
         # Check if sheet exists
         if sheet_name not in wb.sheetnames:
@@ -99,7 +99,7 @@ def delete_range(working_directory, filepath, sheet_name, start_cell, end_cell,
             ws.delete_cols(start_col_idx, cols_to_delete)
         
         # Save workbook
-        wb.save(file_abs_path)
+        save_workbook(wb, file_abs_path)
         wb.close()
         
         return f"Range {range_string} deleted successfully"
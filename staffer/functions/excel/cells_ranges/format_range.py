@@ -5,7 +5,7 @@ from pathlib import Path
 from google.genai import types
 
 try:
-    from openpyxl import load_workbook
+    from ..workbook_session import open_workbook, save_workbook
     from openpyxl.styles import Font, PatternFill, Border, Side, Alignment, Protection
     from openpyxl.utils import get_column_letter
     OPENPYXL_AVAILABLE = True
@@ -57,7 +57,7 @@ def format_range(working_directory, filepath, sheet_name, start_cell, end_cell=N
             return f"Error: File {filepath} does not exist"
         
         # Load workbook
-        wb = load_workbook(file_abs_path)
+        wb = open_workbook(file_abs_path)
         
         # Check if sheet exists
         if sheet_name not in wb.sheetnames:
@@ -143,7 +143,7 @@ def format_range(working_directory, filepath, sheet_name, start_cell, end_cell=N
             ws.merge_cells(f"{start_cell}:{end_cell}")
         
         # Save workbook
-        wb.save(file_abs_path)
+        save_workbook(wb, file_abs_path)
         wb.close()
         
         return f"Range {range_str} formatted successfully in sheet '{sheet_name}'"
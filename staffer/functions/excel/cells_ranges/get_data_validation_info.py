@@ -6,7 +6,7 @@ from pathlib import Path
 from google.genai import types
 
 try:
-    from openpyxl import load_workbook
+    from ..workbook_session import open_workbook
     OPENPYXL_AVAILABLE = True
 except ImportError:
     OPENPYXL_AVAILABLE = False
@@ -39,7 +39,7 @@ def get_data_validation_info(working_directory, filepath, sheet_name):
             return f"Error: File '{filepath}' does not exist"
         
         # Load workbook
-        wb = load_workbook(file_abs_path, read_only=False)
+        wb = open_workbook(file_abs_path, edit=False)
         
         # Check if sheet exists
         if sheet_name not in wb.sheetnames:
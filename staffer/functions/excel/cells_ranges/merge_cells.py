@@ -4,7 +4,7 @@ import os
 from google.genai import types
 
 try:
-    from openpyxl import load_workbook
+    from ..workbook_session import open_workbook, save_workbook
     OPENPYXL_AVAILABLE = True
 except ImportError:
     OPENPYXL_AVAILABLE = False
@@ -39,7 +39,7 @@ def merge_cells(working_directory, filepath, sheet_name, start_cell, end_cell):
             return f"Error: File {filepath} does not exist"
         
         # Load workbook
-        wb = load_workbook(file_abs_path)
+        wb = open_workbook(file_abs_path)
         
         # Check if sheet exists
         if sheet_name not in wb.sheetnames:
@@ -69,7 +69,7 @@ def merge_cells(working_directory, filepath, sheet_name, start_cell, end_cell):
         ws.merge_cells(range_string)
         
         # Save workbook
-        wb.save(file_abs_path)
+        save_workbook(wb, file_abs_path)
         wb.close()
         
         return f"Range {range_string} merged in sheet '{sheet_name}'"
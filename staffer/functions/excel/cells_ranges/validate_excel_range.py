@@ -6,6 +6,7 @@ from google.genai import types
 
 try:
     from openpyxl import load_workbook
+    from ..workbook_session import workbook_session
     OPENPYXL_AVAILABLE = True
 except ImportError:
     OPENPYXL_AVAILABLE = False
@@ -39,8 +40,8 @@ def validate_excel_range(working_directory, filepath, sheet_name, start_cell, en
         if not os.path.exists(file_abs_path):
             return f"Error: File {filepath} does not exist"
         
-        # Load workbook
-        wb = load_workbook(file_abs_path, read_only=True)
+        # Edits pending in a transaction are read from memory, not written out
+        wb = workbook_session.open_for_read(file_abs_path)
         
         # Check if sheet exists
         if sheet_name not in wb.sheetnames:
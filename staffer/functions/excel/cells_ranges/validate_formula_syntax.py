@@ -5,7 +5,7 @@ from pathlib import Path
 from google.genai import types
 
 try:
-    from openpyxl import load_workbook
+    from ..workbook_session import open_workbook
     OPENPYXL_AVAILABLE = True
 except ImportError:
     OPENPYXL_AVAILABLE = False
@@ -40,7 +40,7 @@ def validate_formula_syntax(working_directory, filepath, sheet_name, cell, formu
             return f"Error: File '{filepath}' does not exist"
         
         # Load workbook
-        wb = load_workbook(file_abs_path)
+        wb = open_workbook(file_abs_path, edit=False)
         
         # Check if sheet exists
         if sheet_name not in wb.sheetnames:
@@ -5,7 +5,7 @@ from pathlib import Path
 from google.genai import types
 
 try:
-    from openpyxl import load_workbook
+    from ..workbook_session import open_workbook, save_workbook
     from openpyxl.chart import BarChart, LineChart, PieChart, AreaChart, ScatterChart, Reference
     OPENPYXL_AVAILABLE = True
 except ImportError:
@@ -43,7 +43,7 @@ def create_chart(working_directory, filepath, sheet_name, data_range, chart_type
             return f"Error: File {filepath} does not exist"
         
         # Load workbook
-        wb = load_workbook(file_abs_path)
+        wb = open_workbook(file_abs_path)
         
         # Check if sheet exists
         if sheet_name not in wb.sheetnames:
@@ -107,7 +107,7 @@ def create_chart(working_directory, filepath, sheet_name, data_range, chart_type
         ws.add_chart(chart)
         
         # Save workbook
-        wb.save(file_abs_path)
+        save_workbook(wb, file_abs_path)
         wb.close()
         
         return f"Chart '{chart_type}' created successfully in sheet '{sheet_name}' at {target_cell}"
@@ -5,7 +5,7 @@ from pathlib import Path
 from google.genai import types
 
 try:
-    from openpyxl import load_workbook
+    from ..workbook_session import open_workbook, save_workbook
     from openpyxl.worksheet.table import Table, TableStyleInfo
     OPENPYXL_AVAILABLE = True
 except ImportError:
@@ -41,7 +41,7 @@ def create_table(working_directory, filepath, sheet_name, table_name, data_range
             return f"Error: File {filepath} does not exist"
         
         # Load workbook
-        wb = load_workbook(file_abs_path)
+        wb = open_workbook(file_abs_path)
         
         # Check if sheet exists
         if sheet_name not in wb.sheetnames:
@@ -78,7 +78,7 @@ def create_table(working_directory, filepath, sheet_name, table_name, data_range
         ws.add_table(table)
         
         # Save workbook
-        wb.save(file_abs_path)
+        save_workbook(wb, file_abs_path)
         wb.close()
         
         return f"Table '{table_name}' created successfully in sheet '{sheet_name}' with range {data_range}"
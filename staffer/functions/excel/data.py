@@ -1,86 +1,148 @@
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, TYPE_CHECKING
 import logging
+import warnings
 
-from openpyxl import load_workbook
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
+from openpyxl.worksheet.table import Table, TableStyleInfo
 from openpyxl.worksheet.worksheet import Worksheet
 from openpyxl.utils import get_column_letter
 
 from .exceptions import DataError
 from .cell_utils import parse_cell_range
-from .cell_validation import get_data_validation_for_cell
+from .cell_validation import ValidationIndex
+from .workbook_session import workbook_session, open_workbook, save_workbook
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
-def read_excel_range(
+# Rows per chunk when streaming a range
+DEFAULT_CHUNK_SIZE = 10_000
+# Rows returned by read_excel_range(preview_only=True)
+PREVIEW_ROWS = 10
+# Worksheet row limit of the .xlsx format
+MAX_EXCEL_ROWS = 1_048_576
+HEADER_FONT = Font(bold=True)
+HEADER_FILL = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
+
+
+def _parse_cell(cell_ref: str, label: str) -> tuple[int, int]:
+    try:
+        coords = parse_cell_range(f"{cell_ref}:{cell_ref}")
+        if not coords or not all(coord is not None for coord in coords[:2]):
+            raise DataError(f"Invalid {label} cell reference: {cell_ref}")
+        return coords[0], coords[1]
+    except ValueError as e:
+        raise DataError(f"Invalid {label} cell format: {str(e)}")
+
+
+def iter_excel_range(
     filepath: Path | str,
     sheet_name: str,
     start_cell: str = "A1",
     end_cell: str | None = None,
-    preview_only: bool = False
-) -> list[dict[str, Any]]:
-    """Read data from Excel range with optional preview mode"""
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_rows: int | None = None,
+    skip_empty: bool = True
+) -> Iterator[list[list[Any]]]:
+    """Stream the values of an Excel range in chunks of rows.
+
+    Uses openpyxl's read-only reader with ``iter_rows(values_only=True)``
+    bounded to the range, so no cell objects or sheet object model are built
+    and memory stays proportional to one chunk. Fully empty rows are skipped
+    unless skip_empty is False.
+
+    Args:
+        filepath: Path to Excel file
+        sheet_name: Name of worksheet
+        start_cell: Starting cell, or a whole range such as "A1:D100"
+        end_cell: Ending cell (optional; defaults to the sheet's used range)
+        chunk_size: Rows per yielded chunk
+        max_rows: Stop after this many rows
+        skip_empty: Leave out rows whose cells are all empty
+
+    Yields:
+        Lists of up to chunk_size rows, each a list of cell values
+    """
+    if ':' in start_cell:
+        start_cell, end_cell = start_cell.split(':')
+    start_row, start_col = _parse_cell(start_cell, "start")
+    end_row = end_col = None
+    if end_cell:
+        end_row, end_col = _parse_cell(end_cell, "end")
+
+    try:
+        # Edits pending in an Excel transaction are read from memory
+        wb = workbook_session.open_for_read(str(filepath))
+    except Exception as e:
+        raise DataError(f"Failed to open workbook: {str(e)}")
+
     try:
-        wb = load_workbook(filepath, read_only=False)
-        
         if sheet_name not in wb.sheetnames:
             raise DataError(f"Sheet '{sheet_name}' not found")
-            
         ws = wb[sheet_name]
 
-        # Parse start cell
-        if ':' in start_cell:
-            start_cell, end_cell = start_cell.split(':')
-            
-        # Get start coordinates
-        try:
-            start_coords = parse_cell_range(f"{start_cell}:{start_cell}")
-            if not start_coords or not all(coord is not None for coord in start_coords[:2]):
-                raise DataError(f"Invalid start cell reference: {start_cell}")
-            start_row, start_col = start_coords[0], start_coords[1]
-        except ValueError as e:
-            raise DataError(f"Invalid start cell format: {str(e)}")
-
-        # Determine end coordinates
-        if end_cell:
-            try:
-                end_coords = parse_cell_range(f"{end_cell}:{end_cell}")
-                if not end_coords or not all(coord is not None for coord in end_coords[:2]):
-                    raise DataError(f"Invalid end cell reference: {end_cell}")
-                end_row, end_col = end_coords[0], end_coords[1]
-            except ValueError as e:
-                raise DataError(f"Invalid end cell format: {str(e)}")
-        else:
-            # If no end_cell, use the full data range of the sheet
-            if ws.max_row == 1 and ws.max_column == 1 and ws.cell(1, 1).value is None:
-                # Handle empty sheet
-                end_row, end_col = start_row, start_col
-            else:
-                # Use the sheet's own boundaries
+        if end_cell is None:
+            # Without an end cell, read the sheet's used range; from the
+            # default A1 that starts at the first used row/column
+            if start_cell.upper() == "A1" and ws.min_row and ws.min_column:
                 start_row, start_col = ws.min_row, ws.min_column
-                end_row, end_col = ws.max_row, ws.max_column
+            if ws.max_column:
+                end_col = ws.max_column
+            if ws.max_row and ws.max_column and (start_row > ws.max_row or start_col > ws.max_column):
+                logger.warning(
+                    f"Start cell {start_cell} is outside the sheet's data boundary "
+                    f"({get_column_letter(ws.min_column)}{ws.min_row}:{get_column_letter(ws.max_column)}{ws.max_row}). "
+                    f"No data will be read."
+                )
+                return
 
-        # Validate range bounds
-        if start_row > ws.max_row or start_col > ws.max_column:
-            # This case can happen if start_cell is outside the used area on a sheet with data
-            # or on a completely empty sheet.
-            logger.warning(
-                f"Start cell {start_cell} is outside the sheet's data boundary "
-                f"({get_column_letter(ws.min_column)}{ws.min_row}:{get_column_letter(ws.max_column)}{ws.max_row}). "
-                f"No data will be read."
-            )
-            return []
+        chunk: list[list[Any]] = []
+        rows_read = 0
+        for values in ws.iter_rows(
+            min_row=start_row, max_row=end_row,
+            min_col=start_col, max_col=end_col,
+            values_only=True
+        ):
+            if skip_empty and not any(v is not None for v in values):
+                continue
+            chunk.append(list(values))
+            rows_read += 1
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+            if max_rows is not None and rows_read >= max_rows:
+                break
+        if chunk:
+            yield chunk
+    finally:
+        # Read-only workbooks keep the archive open until closed
+        wb.close()
 
-        data = []
-        for row in range(start_row, end_row + 1):
-            row_data = []
-            for col in range(start_col, end_col + 1):
-                cell = ws.cell(row=row, column=col)
-                row_data.append(cell.value)
-            if any(v is not None for v in row_data):
-                data.append(row_data)
 
-        wb.close()
+def read_excel_range(
+    filepath: Path | str,
+    sheet_name: str,
+    start_cell: str = "A1",
+    end_cell: str | None = None,
+    preview_only: bool = False
+) -> list[list[Any]]:
+    """Read data from Excel range with optional preview mode
+
+    Reads through the streaming read-only path (see iter_excel_range);
+    preview_only stops after the first PREVIEW_ROWS rows.
+    """
+    try:
+        data = []
+        for chunk in iter_excel_range(
+            filepath, sheet_name, start_cell, end_cell,
+            max_rows=PREVIEW_ROWS if preview_only else None
+        ):
+            data.extend(chunk)
         return data
     except DataError as e:
         logger.error(str(e))
@@ -89,6 +151,74 @@ def read_excel_range(
         logger.error(f"Failed to read Excel range: {e}")
         raise DataError(str(e))
 
+
+def read_excel_range_as_dataframe(
+    filepath: Path | str,
+    sheet_name: str,
+    start_cell: str = "A1",
+    end_cell: str | None = None,
+    header: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> "pd.DataFrame":
+    """Read an Excel range straight into a DataFrame.
+
+    Rows are streamed in chunks and each chunk is converted to a DataFrame as
+    it arrives, so the full range is never held as a list of lists.
+
+    Args:
+        filepath: Path to Excel file
+        sheet_name: Name of worksheet
+        start_cell: Starting cell, or a whole range such as "A1:D100"
+        end_cell: Ending cell (optional; defaults to the sheet's used range)
+        header: Use the first row as column names
+        chunk_size: Rows converted per chunk
+
+    Returns:
+        DataFrame of the range values
+    """
+    import pandas as pd
+
+    try:
+        columns = None
+        frames = []
+        for chunk in iter_excel_range(filepath, sheet_name, start_cell, end_cell, chunk_size=chunk_size):
+            if header and columns is None:
+                columns = make_header_names(chunk[0])
+                chunk = chunk[1:]
+            if chunk:
+                if columns is not None:
+                    # Rows of sheets without a recorded used range can be ragged
+                    width = len(columns)
+                    chunk = [row[:width] + [None] * (width - len(row)) for row in chunk]
+                frames.append(pd.DataFrame(chunk, columns=columns))
+
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, ignore_index=True)
+    except DataError as e:
+        logger.error(str(e))
+        raise
+    except Exception as e:
+        logger.error(f"Failed to read Excel range: {e}")
+        raise DataError(str(e))
+
+
+def make_header_names(values: list[Any]) -> list[str]:
+    """Column names from a header row: blanks become column_N, duplicates get a suffix."""
+    names = []
+    seen: dict[str, int] = {}
+    for position, value in enumerate(values, start=1):
+        name = str(value).strip() if value is not None and str(value).strip() else f"column_{position}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}_{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
 def write_data(
     filepath: str,
     sheet_name: str | None,
@@ -135,6 +265,168 @@ def write_data(
         logger.error(f"Failed to write data: {e}")
         raise DataError(str(e))
 
+def _dataframe_rows(df: "pd.DataFrame", chunk_size: int) -> Iterator[tuple]:
+    """Yield DataFrame rows as tuples of plain Python values, converting a chunk at a time.
+
+    Missing values become empty cells and timezone-aware datetimes are written
+    as naive local times, since Excel has no timezone-aware cell type.
+    """
+    import pandas as pd
+
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size]
+        columns = []
+        for position in range(chunk.shape[1]):
+            column = chunk.iloc[:, position]
+            if isinstance(column.dtype, pd.DatetimeTZDtype):
+                column = column.dt.tz_localize(None)
+            elif isinstance(column.dtype, pd.PeriodDtype):
+                column = column.astype(str)
+            values = column.tolist()
+            missing = column.isna().to_numpy()
+            if missing.any():
+                values = [None if is_missing else value for value, is_missing in zip(values, missing)]
+            columns.append(values)
+        yield from zip(*columns)
+
+
+def _unique_table_name(name: str, existing: set[str]) -> str:
+    """Excel table display name: letters, digits and underscores, unique in the workbook."""
+    base = "".join(ch if ch.isalnum() else "_" for ch in name) or "Table"
+    if not (base[0].isalpha() or base[0] == "_"):
+        base = f"Table_{base}"
+    candidate, suffix = base, 1
+    while candidate.lower() in existing:
+        suffix += 1
+        candidate = f"{base}_{suffix}"
+    return candidate
+
+
+def write_dataframe(
+    filepath: Path | str,
+    df: "pd.DataFrame",
+    sheet_name: str = "Data",
+    style_header: bool = True,
+    table_name: str | None = None,
+    table_style: str = "TableStyleMedium9",
+    replace_sheet: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> dict[str, Any]:
+    """Write a DataFrame to a worksheet, header first, appending rows in chunks.
+
+    A new workbook is written with openpyxl's write_only mode, which streams
+    rows to disk as they are appended, so memory stays flat however many rows
+    are exported. Adding a sheet to an existing workbook needs the workbook
+    loaded in full (write_only cannot edit files); rows are still appended in
+    bulk rather than set cell by cell.
+
+    Args:
+        filepath: Path to the workbook (created if it does not exist)
+        df: Data to write; a non-default index is written as leading columns
+        sheet_name: Worksheet to write
+        style_header: Bold, shaded header row with frozen panes below it
+        table_name: Also define an Excel table over the data with this name
+        table_style: Style of the table
+        replace_sheet: Replace sheet_name if it already exists in the workbook
+        chunk_size: Rows converted from the DataFrame at a time
+
+    Returns:
+        Dictionary describing the sheet, range, table and write mode used
+    """
+    import pandas as pd
+
+    if not isinstance(df.index, pd.RangeIndex):
+        df = df.reset_index()
+    if len(df) + 1 > MAX_EXCEL_ROWS:
+        raise DataError(
+            f"{len(df)} rows exceed the Excel limit of {MAX_EXCEL_ROWS - 1} data rows per sheet; filter or sample the dataset first"
+        )
+    if df.shape[1] == 0:
+        raise DataError("No columns to write")
+
+    path = Path(filepath)
+    # Excel tables need unique text headers
+    header = make_header_names(list(df.columns)) if table_name else [str(col) for col in df.columns]
+    data_range = f"A1:{get_column_letter(len(header))}{len(df) + 1}"
+
+    try:
+        if path.exists():
+            wb = open_workbook(str(path))
+            if sheet_name in wb.sheetnames:
+                if not replace_sheet:
+                    raise DataError(f"Sheet '{sheet_name}' already exists; pass replace_sheet to overwrite it")
+                wb.remove(wb[sheet_name])
+            existing_tables = {name.lower() for ws in wb.worksheets for name in ws.tables}
+            ws = wb.create_sheet(sheet_name)
+            mode = "append"
+        else:
+            workbook_session.discard(str(path))
+            wb = Workbook(write_only=True)
+            existing_tables = set()
+            ws = wb.create_sheet(sheet_name)
+            mode = "write_only"
+
+        if style_header:
+            ws.freeze_panes = "A2"
+            if mode == "write_only":
+                header_row = []
+                for name in header:
+                    cell = WriteOnlyCell(ws, value=name)
+                    cell.font = HEADER_FONT
+                    cell.fill = HEADER_FILL
+                    header_row.append(cell)
+                ws.append(header_row)
+            else:
+                ws.append(header)
+                for cell in ws[1]:
+                    cell.font = HEADER_FONT
+                    cell.fill = HEADER_FILL
+        else:
+            ws.append(header)
+
+        for row in _dataframe_rows(df, chunk_size):
+            ws.append(row)
+
+        if table_name:
+            table_name = _unique_table_name(table_name, existing_tables)
+            table = Table(displayName=table_name, ref=data_range)
+            table.tableStyleInfo = TableStyleInfo(
+                name=table_style,
+                showFirstColumn=False,
+                showLastColumn=False,
+                showRowStripes=True,
+                showColumnStripes=False
+            )
+            # write_only sheets cannot read the header back from their cells,
+            # so the table columns are named here (openpyxl warns regardless)
+            table._initialise_columns()
+            for column, name in zip(table.tableColumns, header):
+                column.name = name
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore", message="In write-only mode")
+                ws.add_table(table)
+
+        if mode == "write_only":
+            wb.save(str(path))
+        else:
+            save_workbook(wb, str(path))
+
+        return {
+            "message": f"Wrote {len(df)} rows x {len(header)} columns to sheet '{sheet_name}'",
+            "sheet_name": sheet_name,
+            "range": data_range,
+            "rows": len(df),
+            "columns": header,
+            "table_name": table_name,
+            "mode": mode,
+        }
+    except DataError as e:
+        logger.error(str(e))
+        raise
+    except Exception as e:
+        logger.error(f"Failed to write DataFrame: {e}")
+        raise DataError(str(e))
+
 def _write_data_to_worksheet(
     worksheet: Worksheet, 
     data: list[list], 
@@ -243,6 +535,7 @@ def read_excel_range_with_metadata(
             "sheet_name": sheet_name,
             "cells": []
         }
+        validation_index = ValidationIndex(ws) if include_validation else None
         
         for row in range(start_row, end_row + 1):
             for col in range(start_col, end_col + 1):
@@ -258,7 +551,7 @@ def read_excel_range_with_metadata(
                 
                 # Add validation metadata if requested
                 if include_validation:
-                    validation_info = get_data_validation_for_cell(ws, cell_address)
+                    validation_info = validation_index.get_validation(row, col, cell_address)
                     if validation_info:
                         cell_data["validation"] = validation_info
                     else:
@@ -2,17 +2,26 @@ from typing import Any
 import uuid
 import logging
 
-from openpyxl import load_workbook
+import pandas as pd
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.table import Table, TableStyleInfo
 from openpyxl.styles import Font
 
-from .data import read_excel_range
 from .cell_utils import parse_cell_range
 from .exceptions import ValidationError, PivotError
+from .workbook_session import open_workbook, save_workbook
 
 logger = logging.getLogger(__name__)
 
+# Pivot aggregation name -> pandas groupby aggregation
+AGG_FUNCS = {
+    "sum": "sum",
+    "average": "mean",
+    "count": "count",
+    "min": "min",
+    "max": "max",
+}
+
 def create_pivot_table(
     filepath: str,
     sheet_name: str,
@@ -20,44 +29,49 @@ def create_pivot_table(
     rows: list[str],
     values: list[str],
     columns: list[str] | None = None,
-    agg_func: str = "sum"
+    agg_func: str = "sum",
+    pivot_sheet_name: str | None = None
 ) -> dict[str, Any]:
     """Create pivot table in sheet using Excel table functionality
-    
+
+    The pivot is computed with a single pandas group-by over the source
+    rows; only row/column combinations present in the data are written.
+
     Args:
         filepath: Path to Excel file
         sheet_name: Name of worksheet containing source data
         data_range: Source data range reference
-        target_cell: Cell reference for pivot table position
         rows: Fields for row labels
         values: Fields for values
-        columns: Optional fields for column labels
+        columns: Optional fields for column labels; each value field gets
+            one output column per combination of column field values
         agg_func: Aggregation function (sum, count, average, max, min)
-        
+        pivot_sheet_name: Sheet to write the pivot to (default: "<sheet_name>_pivot")
+
     Returns:
         Dictionary with status message and pivot table dimensions
     """
     try:
-        wb = load_workbook(filepath)
+        wb = open_workbook(filepath)
         if sheet_name not in wb.sheetnames:
             raise ValidationError(f"Sheet '{sheet_name}' not found")
-        
+
         # Parse ranges
         if ':' not in data_range:
             raise ValidationError("Data range must be in format 'A1:B2'")
-            
+
         try:
             start_cell, end_cell = data_range.split(':')
             start_row, start_col, end_row, end_col = parse_cell_range(start_cell, end_cell)
         except ValueError as e:
             raise ValidationError(f"Invalid data range format: {str(e)}")
-            
+
         if end_row is None or end_col is None:
             raise ValidationError("Invalid data range format: missing end coordinates")
-            
+
         # Create range string
         data_range_str = f"{get_column_letter(start_col)}{start_row}:{get_column_letter(end_col)}{end_row}"
-        
+
         # Clean up field names by removing aggregation suffixes
         def clean_field_name(field: str) -> str:
             field = str(field).strip()
@@ -66,119 +80,97 @@ def create_pivot_table(
                     return field[:-len(suffix)]
             return field
 
-        # Read source data and convert to list of dicts
+        # Read source data in one pass from the already loaded workbook
         try:
-            data_as_list = read_excel_range(filepath, sheet_name, start_cell, end_cell)
-            if not data_as_list or len(data_as_list) < 2:
+            source_rows = [
+                row for row in wb[sheet_name].iter_rows(
+                    min_row=start_row, max_row=end_row,
+                    min_col=start_col, max_col=end_col,
+                    values_only=True
+                )
+                if any(v is not None for v in row)
+            ]
+            if len(source_rows) < 2:
                 raise PivotError("Source data must have a header row and at least one data row.")
-            
-            headers = [str(h) for h in data_as_list[0]]
-            data = [dict(zip(headers, row)) for row in data_as_list[1:]]
 
-            if not data:
-                raise PivotError("No data rows found after header.")
+            headers = [str(h) for h in source_rows[0]]
+            data = pd.DataFrame(source_rows[1:], columns=headers)
+            # Later duplicate headers win, as when rows were read into dicts
+            data = data.loc[:, ~data.columns.duplicated(keep="last")]
 
         except Exception as e:
             raise PivotError(f"Failed to read or process source data: {str(e)}")
 
         # Validate aggregation function
-        valid_agg_funcs = ["sum", "average", "count", "min", "max"]
-        if agg_func.lower() not in valid_agg_funcs:
+        agg_func = agg_func.lower()
+        if agg_func not in AGG_FUNCS:
             raise ValidationError(
-                f"Invalid aggregation function. Must be one of: {', '.join(valid_agg_funcs)}"
+                f"Invalid aggregation function. Must be one of: {', '.join(AGG_FUNCS)}"
             )
 
-        # Validate field names exist in data
-        if data:
-            available_fields_raw = data[0].keys()
-            available_fields = {clean_field_name(str(header)).lower() for header in available_fields_raw}
-            
-            for field_list, field_type in [(rows, "row"), (values, "value")]:
-                for field in field_list:
-                    if clean_field_name(str(field)).lower() not in available_fields:
-                        raise ValidationError(
-                            f"Invalid {field_type} field '{field}'. "
-                            f"Available fields: {', '.join(sorted(available_fields_raw))}"
-                        )
-
-            if columns:
-                for field in columns:
-                    if clean_field_name(str(field)).lower() not in available_fields:
-                        raise ValidationError(
-                            f"Invalid column field '{field}'. "
-                            f"Available fields: {', '.join(sorted(available_fields_raw))}"
-                        )
+        # Validate field names exist in data and resolve them to source headers
+        available_fields = {clean_field_name(header).lower(): header for header in data.columns}
+        columns = columns or []
+
+        def resolve(field_list: list[str], field_type: str) -> list[str]:
+            resolved = []
+            for field in field_list:
+                header = available_fields.get(clean_field_name(str(field)).lower())
+                if header is None:
+                    raise ValidationError(
+                        f"Invalid {field_type} field '{field}'. "
+                        f"Available fields: {', '.join(sorted(data.columns))}"
+                    )
+                resolved.append(header)
+            return resolved
+
+        if not values:
+            raise ValidationError("At least one value field is required")
+        row_headers = resolve(rows, "row")
+        value_headers = resolve(values, "value")
+        column_headers = resolve(columns, "column")
 
         # Clean up row and value field names
         cleaned_rows = [clean_field_name(field) for field in rows]
         cleaned_values = [clean_field_name(field) for field in values]
 
+        try:
+            pivot = _pivot_frame(data, row_headers, value_headers, column_headers, agg_func)
+        except Exception as e:
+            raise PivotError(f"Failed to aggregate values: {str(e)}")
+
         # Create pivot sheet
-        pivot_sheet_name = f"{sheet_name}_pivot"
+        pivot_sheet_name = pivot_sheet_name or f"{sheet_name}_pivot"
+        if pivot_sheet_name == sheet_name:
+            raise ValidationError("Pivot sheet must differ from the source sheet")
         if pivot_sheet_name in wb.sheetnames:
             wb.remove(wb[pivot_sheet_name])
         pivot_ws = wb.create_sheet(pivot_sheet_name)
 
-        # Write headers
-        current_row = 1
-        current_col = 1
-        
-        # Write row field headers
-        for field in cleaned_rows:
-            cell = pivot_ws.cell(row=current_row, column=current_col, value=field)
-            cell.font = Font(bold=True)
-            current_col += 1
-            
-        # Write value field headers
-        for field in cleaned_values:
-            cell = pivot_ws.cell(row=current_row, column=current_col, value=f"{field} ({agg_func})")
+        # Write header and data rows in bulk
+        value_labels = [
+            _value_label(key, cleaned_values, agg_func, bool(column_headers))
+            for key in pivot.columns
+        ]
+        pivot_ws.append(cleaned_rows + value_labels)
+        for cell in pivot_ws[1]:
             cell.font = Font(bold=True)
-            current_col += 1
 
-        # Get unique values for each row field
-        field_values = {}
-        for field in cleaned_rows:
-            all_values = []
-            for record in data:
-                value = str(record.get(field, ''))
-                all_values.append(value)
-            field_values[field] = sorted(set(all_values))
-
-        # Generate all combinations of row field values
-        row_combinations = _get_combinations(field_values)
+        labels = pivot.index.tolist() if row_headers else [()] * len(pivot)
+        for label, row_values in zip(labels, pivot.itertuples(index=False, name=None)):
+            if not isinstance(label, tuple):
+                label = (label,)
+            pivot_ws.append([_cell_value(v) for v in label] + [_cell_value(v) for v in row_values])
 
         # Calculate table dimensions for formatting
-        total_rows = len(row_combinations) + 1  # +1 for header
-        total_cols = len(cleaned_rows) + len(cleaned_values)
-        
-        # Write data rows
-        current_row = 2
-        for combo in row_combinations:
-            # Write row field values
-            col = 1
-            for field in cleaned_rows:
-                pivot_ws.cell(row=current_row, column=col, value=combo[field])
-                col += 1
-            
-            # Filter data for current combination
-            filtered_data = _filter_data(data, combo, {})
-            
-            # Calculate and write aggregated values
-            for value_field in cleaned_values:
-                try:
-                    value = _aggregate_values(filtered_data, value_field, agg_func)
-                    pivot_ws.cell(row=current_row, column=col, value=value)
-                except Exception as e:
-                    raise PivotError(f"Failed to aggregate values for field '{value_field}': {str(e)}")
-                col += 1
-                
-            current_row += 1
+        total_rows = len(pivot) + 1  # +1 for header
+        total_cols = len(cleaned_rows) + len(value_labels)
 
         # Create a table for the pivot data
         try:
             pivot_range = f"A1:{get_column_letter(total_cols)}{total_rows}"
             pivot_table = Table(
-                displayName=f"PivotTable_{uuid.uuid4().hex[:8]}", 
+                displayName=f"PivotTable_{uuid.uuid4().hex[:8]}",
                 ref=pivot_range
             )
             style = TableStyleInfo(
@@ -194,22 +186,24 @@ def create_pivot_table(
             raise PivotError(f"Failed to create pivot table formatting: {str(e)}")
 
         try:
-            wb.save(filepath)
+            save_workbook(wb, filepath)
         except Exception as e:
             raise PivotError(f"Failed to save workbook: {str(e)}")
-        
+
         return {
             "message": "Summary table created successfully",
             "details": {
                 "source_range": data_range_str,
                 "pivot_sheet": pivot_sheet_name,
                 "rows": cleaned_rows,
-                "columns": columns or [],
+                "columns": columns,
                 "values": cleaned_values,
-                "aggregation": agg_func
+                "aggregation": agg_func,
+                "pivot_range": pivot_range,
+                "source_rows": len(data)
             }
         }
-        
+
     except (ValidationError, PivotError) as e:
         logger.error(str(e))
         raise
@@ -218,53 +212,79 @@ def create_pivot_table(
         raise PivotError(str(e))
 
 
-def _get_combinations(field_values: dict[str, set]) -> list[dict]:
-    """Get all combinations of field values."""
-    result = [{}]
-    for field, values in list(field_values.items()):  # Convert to list to avoid runtime changes
-        new_result = []
-        for combo in result:
-            for value in sorted(values):  # Sort for consistent ordering
-                new_combo = combo.copy()
-                new_combo[field] = value
-                new_result.append(new_combo)
-        result = new_result
-    return result
-
-
-def _filter_data(data: list[dict], row_filters: dict, col_filters: dict) -> list[dict]:
-    """Filter data based on row and column filters."""
-    result = []
-    for record in data:
-        matches = True
-        for field, value in row_filters.items():
-            if record.get(field) != value:
-                matches = False
-                break
-        for field, value in col_filters.items():
-            if record.get(field) != value:
-                matches = False
-                break
-        if matches:
-            result.append(record)
-    return result
-
-
-def _aggregate_values(data: list[dict], field: str, agg_func: str) -> float:
-    """Aggregate values using the specified function."""
-    values = [record[field] for record in data if field in record and isinstance(record[field], (int, float))]
-    if not values:
-        return 0
-        
-    if agg_func == "sum":
-        return sum(values)
-    elif agg_func == "average":
-        return sum(values) / len(values)
-    elif agg_func == "count":
-        return len(values)
-    elif agg_func == "min":
-        return min(values)
-    elif agg_func == "max":
-        return max(values)
-    else:
-        return sum(values)  # Default to sum
+def _numeric_values(series: pd.Series) -> tuple[pd.Series, bool]:
+    """Keep only numeric cells of a column (text, dates and booleans become NaN).
+
+    Returns the values and whether every numeric cell is an integer.
+    """
+    if pd.api.types.is_bool_dtype(series):
+        return pd.Series(float("nan"), index=series.index), False
+    if pd.api.types.is_numeric_dtype(series):
+        return series, pd.api.types.is_integer_dtype(series)
+    numeric_types = series.map(type)
+    mask = numeric_types.isin((int, float))
+    values = pd.to_numeric(series.where(mask), errors="coerce")
+    return values, bool(numeric_types[mask].eq(int).all())
+
+
+def _pivot_frame(
+    data: pd.DataFrame,
+    row_fields: list[str],
+    value_fields: list[str],
+    column_fields: list[str],
+    agg_func: str
+) -> pd.DataFrame:
+    """Aggregate value fields by row (and column) fields with one hash group-by.
+
+    Returns a frame indexed by row field values. With column fields the
+    columns are (value field, column value, ...) tuples, otherwise value
+    field names. Groups without numeric values aggregate to 0.
+    """
+    work = pd.DataFrame(index=data.index)
+    integer_fields = set()
+    for position, field in enumerate(value_fields):
+        work[position], is_integer = _numeric_values(data[field])
+        if is_integer:
+            integer_fields.add(position)
+
+    # A constant row key groups everything into one row when there are no row fields
+    row_keys = [data[field] for field in row_fields] or [pd.Series(0, index=data.index)]
+    keys = row_keys + [data[field] for field in column_fields]
+    try:
+        grouped = work.groupby(keys, sort=True, dropna=False).agg(AGG_FUNCS[agg_func])
+    except TypeError:
+        # Mixed label types (e.g. numbers and text) cannot be sorted together
+        grouped = work.groupby([key.astype(str) for key in keys], sort=True, dropna=False).agg(AGG_FUNCS[agg_func])
+    grouped = grouped.fillna(0)
+
+    if agg_func == "count":
+        grouped = grouped.astype("int64")
+    elif agg_func != "average":
+        for position in integer_fields:
+            grouped[position] = grouped[position].astype("int64")
+
+    if column_fields:
+        grouped = grouped.unstack(list(range(len(row_keys), len(keys))), fill_value=0)
+    return grouped
+
+
+def _value_label(key: Any, cleaned_values: list[str], agg_func: str, has_columns: bool) -> str:
+    """Header text for one pivot value column."""
+    if not has_columns:
+        return f"{cleaned_values[key]} ({agg_func})"
+    position, *column_values = key
+    return f"{cleaned_values[position]} ({agg_func}) - {' / '.join(str(_cell_value(v)) for v in column_values)}"
+
+
+def _cell_value(value: Any) -> Any:
+    """Convert pandas/NumPy scalars to values openpyxl can write."""
+    if value is None:
+        return None
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    if hasattr(value, "item"):
+        return value.item()
+    return value
@@ -0,0 +1,278 @@
+"""Session cache for parsed Excel workbooks.
+
+Every Excel tool used to run load_workbook and wb.save on its own, so a
+session with 30 edits parsed and re-zipped the same .xlsx 30 times. Tools now
+go through ``open_workbook`` / ``save_workbook``:
+
+- Parsed workbooks are cached by absolute path and reused while the file's
+  mtime and size are unchanged, so each edit skips the parse.
+- Outside a transaction every save is written through immediately, so the file
+  on disk always reflects the last successful edit. If a tool opened a workbook
+  for editing and never saved it (it failed part way), the cached copy may hold
+  partial changes and is reloaded from disk on the next open.
+- Inside a transaction (``begin``), saves only mark the workbook dirty. Edits
+  accumulate on one in-memory Workbook and are written once on ``commit``, at
+  the end of the model turn, after EXCEL_IDLE_FLUSH_SECONDS without edits, or
+  at interpreter exit. ``rollback`` discards unflushed edits. A tool that
+  fails part way through a transaction leaves its partial changes in the
+  pending workbook; roll back to drop them. Read-only tools read pending
+  edits from memory (``open_for_read``) and never write them out.
+
+Set EXCEL_WORKBOOK_CACHE=0 to disable caching (every open loads from disk).
+"""
+
+import atexit
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from openpyxl import load_workbook
+from openpyxl.workbook.workbook import Workbook
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKBOOKS = 4
+DEFAULT_IDLE_FLUSH_SECONDS = 5.0
+
+
+def _file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class _Entry:
+    __slots__ = ("workbook", "stamp", "dirty", "in_use")
+
+    def __init__(self, workbook: Workbook, stamp: Optional[Tuple[int, int]]):
+        self.workbook = workbook
+        self.stamp = stamp
+        # Saved inside a transaction but not yet written to disk
+        self.dirty = False
+        # Opened for editing and not saved since
+        self.in_use = False
+
+
+class WorkbookSession:
+    """Cache of parsed workbooks keyed by path and mtime, with deferred-save transactions."""
+
+    def __init__(self, max_workbooks: int = DEFAULT_MAX_WORKBOOKS,
+                 idle_flush_seconds: float = DEFAULT_IDLE_FLUSH_SECONDS, enabled: bool = True):
+        self.max_workbooks = max_workbooks
+        self.idle_flush_seconds = idle_flush_seconds
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._transaction = False
+        self._idle_timer: Optional[threading.Timer] = None
+        self.loads = 0
+        self.saves = 0
+        self.hits = 0
+
+    @classmethod
+    def from_env(cls) -> "WorkbookSession":
+        """Create a session configured from EXCEL_WORKBOOK_CACHE* / EXCEL_IDLE_FLUSH_SECONDS."""
+        return cls(
+            max_workbooks=int(os.environ.get("EXCEL_WORKBOOK_CACHE_SIZE", DEFAULT_MAX_WORKBOOKS)),
+            idle_flush_seconds=float(os.environ.get("EXCEL_IDLE_FLUSH_SECONDS", DEFAULT_IDLE_FLUSH_SECONDS)),
+            enabled=os.environ.get("EXCEL_WORKBOOK_CACHE", "1").lower() not in ("0", "false", "no"),
+        )
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._transaction
+
+    def open(self, path: str, edit: bool = True) -> Workbook:
+        """Return the parsed workbook at path, loading it only if the cached copy is stale.
+
+        Pass edit=False for callers that only read, so the cached copy is not
+        treated as possibly half-edited afterwards.
+        """
+        path = os.path.abspath(path)
+        if not self.enabled:
+            self.loads += 1
+            return load_workbook(path)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and not entry.dirty:
+                if entry.in_use or entry.stamp != _file_stamp(path):
+                    del self._entries[path]
+                    entry = None
+
+            if entry is None:
+                entry = _Entry(load_workbook(path), _file_stamp(path))
+                self._entries[path] = entry
+                self.loads += 1
+                self._evict()
+            else:
+                self.hits += 1
+            self._entries.move_to_end(path)
+
+            if edit:
+                entry.in_use = True
+            return entry.workbook
+
+    def open_for_read(self, path: str) -> Workbook:
+        """Workbook for a read-only tool, without writing pending edits to disk.
+
+        While a transaction holds unflushed edits of path, the pending
+        in-memory workbook is returned so reads see them; otherwise the file
+        is opened with the streaming read-only reader. Callers close the
+        result as usual (a no-op for the pending workbook).
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.dirty:
+                self.hits += 1
+                return entry.workbook
+        return load_workbook(path, read_only=True)
+
+    def save(self, workbook: Workbook, path: str) -> None:
+        """Save an edited workbook, deferring the write while a transaction is open."""
+        path = os.path.abspath(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry.workbook is not workbook:
+                # Not from this cache (new workbook or caching disabled)
+                workbook.save(path)
+                self.saves += 1
+                if entry is not None and not entry.dirty:
+                    del self._entries[path]
+                return
+
+            entry.in_use = False
+            if self._transaction:
+                entry.dirty = True
+                self._schedule_idle_flush()
+                return
+            self._write(path, entry)
+
+    def discard(self, path: str) -> None:
+        """Forget the cached copy of path (including unflushed edits)."""
+        with self._lock:
+            self._entries.pop(os.path.abspath(path), None)
+
+    def flush(self, path: Optional[str] = None, skip_in_use: bool = False) -> List[str]:
+        """Write dirty workbooks (or just path) to disk; returns the paths written.
+
+        With skip_in_use, workbooks a tool may still be editing are left for later.
+        """
+        with self._lock:
+            paths = [os.path.abspath(path)] if path else list(self._entries)
+            written = []
+            for entry_path in paths:
+                entry = self._entries.get(entry_path)
+                if entry is None or not entry.dirty or (skip_in_use and entry.in_use):
+                    continue
+                self._write(entry_path, entry)
+                written.append(entry_path)
+            return written
+
+    def begin(self) -> None:
+        """Start deferring saves until commit."""
+        with self._lock:
+            self._transaction = True
+
+    def commit(self) -> List[str]:
+        """Write all pending edits once and end the transaction."""
+        with self._lock:
+            written = self.flush()
+            self._transaction = False
+            self._cancel_idle_flush()
+            return written
+
+    def rollback(self) -> List[str]:
+        """Discard unflushed edits and end the transaction; returns the paths discarded."""
+        with self._lock:
+            discarded = [path for path, entry in self._entries.items() if entry.dirty]
+            for path in discarded:
+                del self._entries[path]
+            self._transaction = False
+            self._cancel_idle_flush()
+            return discarded
+
+    def pending(self) -> List[str]:
+        """Paths with edits not yet written to disk."""
+        with self._lock:
+            return [path for path, entry in self._entries.items() if entry.dirty]
+
+    def clear(self) -> None:
+        """Drop every cached workbook without writing."""
+        with self._lock:
+            self._entries.clear()
+            self._transaction = False
+            self._cancel_idle_flush()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "cached_workbooks": len(self._entries),
+                "pending": self.pending(),
+                "in_transaction": self._transaction,
+                "loads": self.loads,
+                "saves": self.saves,
+                "hits": self.hits,
+            }
+
+    def _write(self, path: str, entry: _Entry) -> None:
+        if entry.dirty and entry.stamp is not None and entry.stamp != _file_stamp(path):
+            logger.warning(f"{path} changed on disk during the transaction; overwriting with pending edits")
+        entry.workbook.save(path)
+        entry.stamp = _file_stamp(path)
+        entry.dirty = False
+        self.saves += 1
+
+    def _evict(self) -> None:
+        """Drop least recently used clean workbooks beyond the size limit."""
+        excess = len(self._entries) - self.max_workbooks
+        for path in list(self._entries):
+            if excess <= 0:
+                break
+            if not self._entries[path].dirty:
+                del self._entries[path]
+                excess -= 1
+
+    def _schedule_idle_flush(self) -> None:
+        self._cancel_idle_flush()
+        if self.idle_flush_seconds <= 0:
+            return
+        self._idle_timer = threading.Timer(self.idle_flush_seconds, self._idle_flush)
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+
+    def _cancel_idle_flush(self) -> None:
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _idle_flush(self) -> None:
+        with self._lock:
+            self._idle_timer = None
+            try:
+                self.flush(skip_in_use=True)
+            except Exception as e:
+                logger.error(f"Idle write-back of Excel workbooks failed: {e}")
+            if self.pending():
+                # A workbook may still be being edited; try again later
+                self._schedule_idle_flush()
+
+
+# Process-wide session used by the Excel tools
+workbook_session = WorkbookSession.from_env()
+atexit.register(workbook_session.flush)
+
+
+def open_workbook(path: str, edit: bool = True) -> Workbook:
+    """Drop-in replacement for load_workbook(path) backed by the session cache."""
+    return workbook_session.open(path, edit=edit)
+
+
+def save_workbook(workbook: Workbook, path: str) -> None:
+    """Drop-in replacement for workbook.save(path) that honours transactions."""
+    workbook_session.save(workbook, path)
@@ -6,6 +6,7 @@ from google.genai import types
 
 try:
     from openpyxl import Workbook
+    from ..workbook_session import workbook_session
     OPENPYXL_AVAILABLE = True
 except ImportError:
     OPENPYXL_AVAILABLE = False
@@ -38,7 +39,8 @@ def create_workbook(working_directory, filepath):
         # Ensure directory exists
         Path(file_abs_path).parent.mkdir(parents=True, exist_ok=True)
         
-        # Save workbook
+        # Save workbook, replacing any cached copy of an earlier file at this path
+        workbook_session.discard(file_abs_path)
         wb.save(file_abs_path)
         
         return f"Created workbook at {filepath}"
@@ -0,0 +1,80 @@
+"""Excel edit transaction function."""
+
+import os
+from google.genai import types
+
+try:
+    from ..workbook_session import workbook_session
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+
+def excel_transaction(working_directory, action):
+    """Begin, commit or roll back a batch of Excel edits.
+
+    While a transaction is open, Excel edit functions work on one cached
+    in-memory copy of each workbook and the file is written once on commit
+    (pending edits are also written at the end of each turn and after a few
+    idle seconds).
+
+    Args:
+        working_directory: The permitted working directory
+        action: "begin", "commit", "rollback" or "status"
+
+    Returns:
+        String result message
+    """
+    if not OPENPYXL_AVAILABLE:
+        return "Error: openpyxl library not available. Please install with: pip install openpyxl"
+
+    working_dir_abs = os.path.abspath(working_directory)
+
+    def relative(paths):
+        return [os.path.relpath(path, working_dir_abs) for path in paths]
+
+    try:
+        if action == "begin":
+            if workbook_session.in_transaction:
+                return "Error: An Excel transaction is already open"
+            workbook_session.begin()
+            return "Excel transaction started; edits will be saved on commit"
+
+        if action == "commit":
+            if not workbook_session.in_transaction:
+                return "Error: No Excel transaction is open"
+            written = workbook_session.commit()
+            return f"Excel transaction committed; saved {len(written)} workbook(s): {relative(written)}"
+
+        if action == "rollback":
+            if not workbook_session.in_transaction:
+                return "Error: No Excel transaction is open"
+            discarded = workbook_session.rollback()
+            return f"Excel transaction rolled back; discarded unsaved edits to {len(discarded)} workbook(s): {relative(discarded)}"
+
+        if action == "status":
+            state = "open" if workbook_session.in_transaction else "not open"
+            return f"Excel transaction {state}; workbooks with unsaved edits: {relative(workbook_session.pending())}"
+
+        return f"Error: Unknown action '{action}'. Use 'begin', 'commit', 'rollback' or 'status'"
+
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
+# Schema for Google AI function declaration
+schema_excel_transaction = types.FunctionDeclaration(
+    name="excel_transaction",
+    description="Batch several Excel edits: 'begin' defers saving so edits accumulate in memory, 'commit' saves each changed workbook once, 'rollback' discards unsaved edits",
+    parameters=types.Schema(
+        type=types.Type.OBJECT,
+        properties={
+            "action": types.Schema(
+                type=types.Type.STRING,
+                description="Transaction action",
+                enum=["begin", "commit", "rollback", "status"],
+            ),
+        },
+        required=["action"],
+    ),
+)
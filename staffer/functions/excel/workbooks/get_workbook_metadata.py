@@ -7,6 +7,7 @@ from google.genai import types
 
 try:
     from openpyxl import load_workbook
+    from ..workbook_session import workbook_session
     from openpyxl.utils import get_column_letter
     OPENPYXL_AVAILABLE = True
 except ImportError:
@@ -39,8 +40,8 @@ def get_workbook_metadata(working_directory, filepath, include_ranges=False):
         return f'Error: Workbook "{filepath}" does not exist'
     
     try:
-        # Load workbook
-        wb = load_workbook(file_abs_path, read_only=True)
+        # Edits pending in a transaction are read from memory, not written out
+        wb = workbook_session.open_for_read(file_abs_path)
         
         # Get file info
         path = Path(file_abs_path)
@@ -5,7 +5,7 @@ from pathlib import Path
 from google.genai import types
 
 try:
-    from openpyxl import load_workbook
+    from ..workbook_session import open_workbook, save_workbook
     OPENPYXL_AVAILABLE = True
 except ImportError:
     OPENPYXL_AVAILABLE = False
@@ -39,7 +39,7 @@ def copy_worksheet(working_directory, filepath, source_sheet, target_sheet):
             return f"Error: File {filepath} does not exist"
         
         # Load workbook
-        wb = load_workbook(file_abs_path)
+        wb = open_workbook(file_abs_path)
         
         # Check if source sheet exists
         if source_sheet not in wb.sheetnames:
@@ -57,7 +57,7 @@ def copy_worksheet(working_directory, filepath, source_sheet, target_sheet):
         target_ws.title = target_sheet
         
         # Save workbook
-        wb.save(file_abs_path)
+        save_workbook(wb, file_abs_path)
         wb.close()
         
         return f"Successfully copied sheet '{source_sheet}' to '{target_sheet}'"
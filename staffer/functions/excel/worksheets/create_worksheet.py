@@ -5,7 +5,7 @@ from pathlib import Path
 from google.genai import types
 
 try:
-    from openpyxl import load_workbook
+    from ..workbook_session import open_workbook, save_workbook
     OPENPYXL_AVAILABLE = True
 except ImportError:
     OPENPYXL_AVAILABLE = False
@@ -38,7 +38,7 @@ def create_worksheet(working_directory, filepath, sheet_name):
     
     try:
         # Load existing workbook
-        wb = load_workbook(file_abs_path)
+        wb = open_workbook(file_abs_path)
         
         # Check if sheet name already exists
         if sheet_name in wb.sheetnames:
@@ -48,7 +48,7 @@ def create_worksheet(working_directory, filepath, sheet_name):
         wb.create_sheet(sheet_name)
         
         # Save workbook
-        wb.save(file_abs_path)
+        save_workbook(wb, file_abs_path)
         
         return f"Created worksheet '{sheet_name}' in {filepath}"
         
@@ -4,7 +4,7 @@ import os
 from google.genai import types
 
 try:
-    from openpyxl import load_workbook
+    from ..workbook_session import open_workbook, save_workbook
     OPENPYXL_AVAILABLE = True
 except ImportError:
     OPENPYXL_AVAILABLE = False
@@ -37,7 +37,7 @@ def delete_worksheet(working_directory, filepath, sheet_name):
     
     try:
         # Load workbook
-        wb = load_workbook(file_abs_path)
+        wb = open_workbook(file_abs_path)
         
         # Check if sheet exists
         if sheet_name not in wb.sheetnames:
@@ -51,7 +51,7 @@ def delete_worksheet(working_directory, filepath, sheet_name):
         del wb[sheet_name]
         
         # Save workbook
-        wb.save(file_abs_path)
+        save_workbook(wb, file_abs_path)
         
         return f"Successfully deleted sheet '{sheet_name}' from {filepath}"
         
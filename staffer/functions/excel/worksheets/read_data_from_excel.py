@@ -7,20 +7,34 @@ from google.genai import types
 
 try:
     from openpyxl import load_workbook
+    from openpyxl.utils import get_column_letter
+    from ..cell_utils import parse_cell_range
+    from ..data import iter_excel_range
+    from ..workbook_session import workbook_session
     OPENPYXL_AVAILABLE = True
 except ImportError:
     OPENPYXL_AVAILABLE = False
 
 
-def read_data_from_excel(working_directory, filepath, sheet_name, start_cell="A1", end_cell=None):
+# Rows returned per call unless max_rows says otherwise
+DEFAULT_MAX_ROWS = 1000
+
+
+def read_data_from_excel(working_directory, filepath, sheet_name, start_cell="A1", end_cell=None,
+                         max_rows=DEFAULT_MAX_ROWS):
     """Read data from Excel worksheet.
     
+    Rows are streamed through the read-only reader (see iter_excel_range)
+    and at most max_rows are returned; a longer range is marked truncated
+    with the cell to continue from.
+    
     Args:
         working_directory: The permitted working directory
         filepath: Path to Excel file, relative to working directory
         sheet_name: Name of worksheet to read from
         start_cell: Starting cell (default A1)
         end_cell: Ending cell (optional, auto-expands if not provided)
+        max_rows: Most rows to return (default 1000)
         
     Returns:
         String containing the data or error message
@@ -40,54 +54,45 @@ def read_data_from_excel(working_directory, filepath, sheet_name, start_cell="A1
         if not os.path.exists(file_abs_path):
             return f"Error: File {filepath} does not exist"
         
-        # Load workbook
-        wb = load_workbook(file_abs_path, read_only=True)
-        
-        # Check if sheet exists
-        if sheet_name not in wb.sheetnames:
-            return f"Error: Sheet '{sheet_name}' not found in workbook"
-        
-        ws = wb[sheet_name]
-        
-        # If no end_cell specified, try to find used range
-        if end_cell is None:
-            # Find the maximum row and column with data
-            max_row = ws.max_row
-            max_col = ws.max_column
-            if max_row == 1 and max_col == 1:
-                # Check if A1 has data
-                if ws['A1'].value is None:
-                    return "No data found in worksheet"
-                end_cell = "A1"
-            else:
-                # Convert column number to letter
-                from openpyxl.utils import get_column_letter
-                end_cell = f"{get_column_letter(max_col)}{max_row}"
+        # Edits pending in a transaction are read from memory, not written out
+        wb = workbook_session.open_for_read(file_abs_path)
+        try:
+            # Check if sheet exists
+            if sheet_name not in wb.sheetnames:
+                return f"Error: Sheet '{sheet_name}' not found in workbook"
+            
+            ws = wb[sheet_name]
+            
+            # If no end_cell specified, try to find used range
+            if end_cell is None:
+                # Find the maximum row and column with data
+                max_row = ws.max_row
+                max_col = ws.max_column
+                if max_row == 1 and max_col == 1:
+                    # Check if A1 has data
+                    if ws['A1'].value is None:
+                        return "No data found in worksheet"
+                    end_cell = "A1"
+                else:
+                    end_cell = f"{get_column_letter(max_col)}{max_row}"
+        finally:
+            wb.close()
         
         # Parse cell range
         try:
-            cell_range = f"{start_cell}:{end_cell}" if end_cell != start_cell else start_cell
-            cells = ws[cell_range]
+            start_row, start_col, _, _ = parse_cell_range(start_cell, end_cell)
         except Exception as e:
             return f"Error: Invalid cell range {start_cell}:{end_cell} - {str(e)}"
         
-        # Extract data
+        # Stream the rows, keeping empty ones so rows line up with the sheet;
+        # one extra row tells whether the range goes on
+        max_rows = max(1, int(DEFAULT_MAX_ROWS if max_rows is None else max_rows))
         data = []
-        if isinstance(cells, tuple):
-            # Multiple rows
-            for row in cells:
-                if isinstance(row, tuple):
-                    # Multiple columns in row
-                    row_data = [cell.value for cell in row]
-                else:
-                    # Single column
-                    row_data = [row.value]
-                data.append(row_data)
-        else:
-            # Single cell
-            data = [[cells.value]]
-        
-        wb.close()
+        for chunk in iter_excel_range(file_abs_path, sheet_name, start_cell, end_cell,
+                                      max_rows=max_rows + 1, skip_empty=False):
+            data.extend(chunk)
+        truncated = len(data) > max_rows
+        data = data[:max_rows]
         
         # Format result as JSON string
         result = {
@@ -97,6 +102,9 @@ def read_data_from_excel(working_directory, filepath, sheet_name, start_cell="A1
             "rows": len(data),
             "columns": len(data[0]) if data else 0
         }
+        if truncated:
+            result["truncated"] = True
+            result["next_start_cell"] = f"{get_column_letter(start_col)}{start_row + max_rows}"
         
         return json.dumps(result, indent=2, default=str)
         
@@ -127,6 +135,10 @@ schema_read_data_from_excel = types.FunctionDeclaration(
                 type=types.Type.STRING,
                 description="Ending cell (optional, auto-expands if not provided)",
             ),
+            "max_rows": types.Schema(
+                type=types.Type.INTEGER,
+                description="Most rows to return (default 1000); a longer range is marked truncated with next_start_cell to continue from",
+            ),
         },
         required=["filepath", "sheet_name"],
     ),
@@ -4,7 +4,7 @@ import os
 from google.genai import types
 
 try:
-    from openpyxl import load_workbook
+    from ..workbook_session import open_workbook, save_workbook
     OPENPYXL_AVAILABLE = True
 except ImportError:
     OPENPYXL_AVAILABLE = False
@@ -38,7 +38,7 @@ def rename_worksheet(working_directory, filepath, old_name, new_name):
     
     try:
         # Load workbook
-        wb = load_workbook(file_abs_path)
+        wb = open_workbook(file_abs_path)
         
         # Check if old sheet exists
         if old_name not in wb.sheetnames:
@@ -53,7 +53,7 @@ def rename_worksheet(working_directory, filepath, old_name, new_name):
         sheet.title = new_name
         
         # Save workbook
-        wb.save(file_abs_path)
+        save_workbook(wb, file_abs_path)
         
         return f"Successfully renamed sheet from '{old_name}' to '{new_name}' in {filepath}"
         
@@ -5,7 +5,7 @@ from pathlib import Path
 from google.genai import types
 
 try:
-    from openpyxl import load_workbook
+    from ..workbook_session import open_workbook, save_workbook
     OPENPYXL_AVAILABLE = True
 except ImportError:
     OPENPYXL_AVAILABLE = False
@@ -51,7 +51,7 @@ def write_data_to_excel(working_directory, filepath, sheet_name, data, start_cel
                 return f"Error: Row {i} must be a list of values"
         
         # Load workbook
-        wb = load_workbook(file_abs_path)
+        wb = open_workbook(file_abs_path)
         
         # Check if sheet exists
         if sheet_name not in wb.sheetnames:
@@ -81,7 +81,7 @@ def write_data_to_excel(working_directory, filepath, sheet_name, data, start_cel
             rows_written += 1
         
         # Save workbook
-        wb.save(file_abs_path)
+        save_workbook(wb, file_abs_path)
         wb.close()
         
         return f"Successfully wrote {rows_written} rows ({cells_written} cells) to sheet '{sheet_name}' starting at {start_cell}"
@@ -0,0 +1,199 @@
+"""Token-budgeted conversation history.
+
+Every model request resends the whole conversation, so one bulky tool
+result (a full correlation matrix, a 500-row sample) is paid for again on
+every later turn. HistoryManager keeps the history under a token budget:
+
+1. Recent turns are always kept verbatim.
+2. Older bulky tool results and function-call arguments are replaced with
+   compact digests (scalars kept, large lists/dicts/strings elided).
+3. If that is not enough, the oldest whole turns are dropped.
+
+Token counts are estimated from serialized size (about 4 characters per
+token), which is close enough for budgeting without a tokenizer round trip.
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.genai import types
+
+
+DEFAULT_TOKEN_BUDGET = 32_000
+DEFAULT_RECENT_TURNS = 2
+# Parts estimated above this many tokens are compacted once they are old
+DIGEST_THRESHOLD_TOKENS = 300
+
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+
+MAX_DIGEST_STRING = 200
+MAX_DIGEST_ITEMS = 3
+MAX_DIGEST_KEYS = 20
+
+COMPACTED_NOTE = "Older result condensed to save context; call the function again for full details."
+
+
+def _part_payload(part: types.Part) -> Any:
+    if part.text:
+        return part.text
+    if part.function_call:
+        return {"name": part.function_call.name, "args": part.function_call.args}
+    if part.function_response:
+        return {"name": part.function_response.name, "response": part.function_response.response}
+    return ""
+
+
+def estimate_part_tokens(part: types.Part) -> int:
+    payload = _part_payload(part)
+    if not isinstance(payload, str):
+        payload = json.dumps(payload, default=str)
+    return len(payload) // CHARS_PER_TOKEN + 1
+
+
+def estimate_tokens(message: types.Content) -> int:
+    """Estimate the prompt tokens one message costs."""
+    return MESSAGE_OVERHEAD_TOKENS + sum(estimate_part_tokens(part) for part in message.parts or [])
+
+
+def digest(value: Any, depth: int = 0) -> Any:
+    """Condense a JSON-like value: keep scalars and structure, elide bulk."""
+    if isinstance(value, str):
+        if len(value) <= MAX_DIGEST_STRING or value.endswith(" more chars)"):
+            return value
+        return f"{value[:MAX_DIGEST_STRING]}... ({len(value) - MAX_DIGEST_STRING} more chars)"
+    if isinstance(value, dict):
+        if depth >= 2:
+            return f"<{len(value)} keys elided>"
+        items = list(value.items())
+        condensed = {str(k): digest(v, depth + 1) for k, v in items[:MAX_DIGEST_KEYS]}
+        if len(items) > MAX_DIGEST_KEYS:
+            condensed["..."] = f"{len(items) - MAX_DIGEST_KEYS} more keys"
+        return condensed
+    if isinstance(value, (list, tuple)):
+        if depth >= 2:
+            return f"<{len(value)} items elided>"
+        if len(value) == MAX_DIGEST_ITEMS + 1 and str(value[-1]).endswith(" more items"):
+            # Already digested
+            return list(value)
+        condensed = [digest(item, depth + 1) for item in value[:MAX_DIGEST_ITEMS]]
+        if len(value) > MAX_DIGEST_ITEMS:
+            condensed.append(f"... {len(value) - MAX_DIGEST_ITEMS} more items")
+        return condensed
+    return value
+
+
+def _is_compacted(response: Any) -> bool:
+    return isinstance(response, dict) and response.get("compacted") == COMPACTED_NOTE
+
+
+def _compact_part(part: types.Part) -> Optional[types.Part]:
+    """Digest a bulky function response or call, or None if it cannot shrink further."""
+    if estimate_part_tokens(part) <= DIGEST_THRESHOLD_TOKENS:
+        return None
+    if part.function_response and not _is_compacted(part.function_response.response):
+        return types.Part(function_response=types.FunctionResponse(
+            name=part.function_response.name,
+            response={"compacted": COMPACTED_NOTE, **digest(part.function_response.response or {})},
+        ))
+    if part.function_call:
+        args = digest(part.function_call.args or {})
+        if args != part.function_call.args:
+            return types.Part(function_call=types.FunctionCall(name=part.function_call.name, args=args))
+    return None
+
+
+def _starts_turn(message: types.Content) -> bool:
+    """A turn starts with a user message carrying text (not a tool response)."""
+    return message.role == "user" and any(part.text for part in message.parts or [])
+
+
+class HistoryManager:
+    """Keep conversation history within a token budget."""
+
+    def __init__(self, token_budget: int = DEFAULT_TOKEN_BUDGET, recent_turns: int = DEFAULT_RECENT_TURNS):
+        self.token_budget = token_budget
+        self.recent_turns = recent_turns
+        # id(message) -> (message, tokens); holding the message keeps ids stable
+        self._estimates: Dict[int, Tuple[types.Content, int]] = {}
+        self.last_stats: dict = {}
+
+    @classmethod
+    def from_env(cls) -> "HistoryManager":
+        """Create a manager configured from HISTORY_TOKEN_BUDGET / HISTORY_RECENT_TURNS."""
+        return cls(
+            token_budget=int(os.environ.get("HISTORY_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET)),
+            recent_turns=int(os.environ.get("HISTORY_RECENT_TURNS", DEFAULT_RECENT_TURNS)),
+        )
+
+    def tokens(self, message: types.Content) -> int:
+        cached = self._estimates.get(id(message))
+        if cached is not None and cached[0] is message:
+            return cached[1]
+        tokens = estimate_tokens(message)
+        self._estimates[id(message)] = (message, tokens)
+        return tokens
+
+    def _recent_start(self, messages: List[types.Content]) -> int:
+        """Index of the first message of the recent turns kept verbatim."""
+        turns = 0
+        for index in range(len(messages) - 1, -1, -1):
+            if _starts_turn(messages[index]):
+                turns += 1
+                if turns >= self.recent_turns:
+                    return index
+        return 0
+
+    def _compact(self, message: types.Content) -> types.Content:
+        parts = message.parts or []
+        condensed = [_compact_part(part) for part in parts]
+        if not any(condensed):
+            return message
+        return types.Content(role=message.role, parts=[
+            new_part or part for part, new_part in zip(parts, condensed)
+        ])
+
+    def fit(self, messages: List[types.Content]) -> List[types.Content]:
+        """Return a history within the token budget. Does not mutate messages."""
+        before = sum(self.tokens(message) for message in messages)
+        fitted = list(messages)
+        compacted = dropped = 0
+
+        if before > self.token_budget:
+            recent_start = self._recent_start(fitted)
+
+            # Condense old bulky payloads first
+            for index in range(recent_start):
+                condensed = self._compact(fitted[index])
+                if condensed is not fitted[index]:
+                    fitted[index] = condensed
+                    compacted += 1
+
+            # Then drop whole old turns until the budget is met
+            total = sum(self.tokens(message) for message in fitted)
+            while total > self.token_budget and recent_start > 0:
+                end = 1
+                while end < recent_start and not _starts_turn(fitted[end]):
+                    end += 1
+                total -= sum(self.tokens(message) for message in fitted[:end])
+                dropped += end
+                del fitted[:end]
+                recent_start -= end
+
+        # Forget estimates of messages no longer in the history
+        live = {id(message) for message in fitted}
+        self._estimates = {key: value for key, value in self._estimates.items() if key in live}
+
+        self.last_stats = {
+            "tokens_before": before,
+            "tokens_after": sum(self.tokens(message) for message in fitted),
+            "token_budget": self.token_budget,
+            "messages_compacted": compacted,
+            "messages_dropped": dropped,
+        }
+        return fitted
+
+
+# Process-wide manager used by process_prompt
+history_manager = HistoryManager.from_env()
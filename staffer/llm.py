@@ -1,28 +1,76 @@
-"""LLM client abstraction for dependency injection."""
+"""LLM client abstraction for dependency injection.
+
+The client is created once per process and reused across turns, so its HTTP
+connection pool (and the TLS sessions in it) stay warm between prompts.
+Pool limits can be tuned with LLM_MAX_CONNECTIONS, LLM_MAX_KEEPALIVE and
+LLM_KEEPALIVE_SECONDS.
+"""
 
 import os
+import threading
 from dotenv import load_dotenv
 from google import genai
+from google.genai import types
 
 load_dotenv()
 
 
+DEFAULT_MAX_CONNECTIONS = 10
+DEFAULT_MAX_KEEPALIVE = 5
+DEFAULT_KEEPALIVE_SECONDS = 120.0
+
+
+def _http_options():
+    """HTTP options with keep-alive pool limits taken from the environment."""
+    import httpx
+    limits = httpx.Limits(
+        max_connections=int(os.environ.get("LLM_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)),
+        max_keepalive_connections=int(os.environ.get("LLM_MAX_KEEPALIVE", DEFAULT_MAX_KEEPALIVE)),
+        keepalive_expiry=float(os.environ.get("LLM_KEEPALIVE_SECONDS", DEFAULT_KEEPALIVE_SECONDS)),
+    )
+    return types.HttpOptions(client_args={"limits": limits}, async_client_args={"limits": limits})
+
+
 def _default_client_factory():
     """Default factory that creates real Google AI client."""
     api_key = os.environ.get("GEMINI_API_KEY")
-    return genai.Client(api_key=api_key)
+    return genai.Client(api_key=api_key, http_options=_http_options())
 
 
 # Client factory - can be replaced for testing
 _client_factory = _default_client_factory
 
+# Process-wide client, tied to the factory that created it
+_cached_client = None
+_cached_factory = None
+_client_lock = threading.Lock()
+
 
 def get_client():
-    """Get the current LLM client (real or fake)."""
-    return _client_factory()
+    """Get the current LLM client (real or fake).
+
+    The client is cached per factory; replacing ``_client_factory`` (directly
+    or through set_client_factory) makes the next call build a new one.
+    """
+    global _cached_client, _cached_factory
+    factory = _client_factory
+    with _client_lock:
+        if _cached_client is None or _cached_factory is not factory:
+            _cached_client = factory()
+            _cached_factory = factory
+        return _cached_client
+
+
+def reset_client():
+    """Drop the cached client so the next get_client() builds a fresh one."""
+    global _cached_client, _cached_factory
+    with _client_lock:
+        _cached_client = None
+        _cached_factory = None
 
 
 def set_client_factory(factory):
     """Set a custom client factory (for testing)."""
     global _client_factory
-    _client_factory = factory
\ No newline at end of file
+    _client_factory = factory
+    reset_client()
@@ -3,8 +3,14 @@ import argparse
 from pathlib import Path
 from google.genai import types
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from .available_functions import get_available_functions, call_function
+from .function_registries import concurrent_safe_functions
 from .llm import get_client
+from .history import history_manager
+
+# Upper bound on read-only function calls from one turn executed at once
+MAX_PARALLEL_FUNCTION_CALLS = 6
 
 def _is_ancestor(path: Path, cwd: Path) -> bool:
     """Check if path is an ancestor of cwd (parent, grandparent, etc)."""
@@ -14,8 +20,12 @@ def _is_ancestor(path: Path, cwd: Path) -> bool:
         return False
 
 
-def prune_stale_dir_msgs(msgs, cwd: Path, max_messages=120):
-    """Filter stale directory context with ancestor path detection. Returns new list, no mutation."""
+def prune_stale_dir_msgs(msgs, cwd: Path, max_messages=None):
+    """Filter stale directory context with ancestor path detection. Returns new list, no mutation.
+    
+    History size is bounded by the token budget in history_manager; max_messages
+    is an optional additional hard cap on the message count.
+    """
     cwd_str = str(cwd)
     
     # Get all ancestor paths to filter out
@@ -62,14 +72,48 @@ def prune_stale_dir_msgs(msgs, cwd: Path, max_messages=120):
         if not skip_message:
             kept.append(m)
     
-    # Hard limit on message count to prevent token overflow
-    if len(kept) > max_messages:
+    # Optional hard limit on message count
+    if max_messages is not None and len(kept) > max_messages:
         # Keep most recent messages to preserve context
         kept = kept[-max_messages:]
     
     return kept
 
 
+def execute_function_calls(function_calls, working_directory, verbose=False, parallel=True):
+    """Execute the function calls of one model turn, returning results in call order.
+    
+    Consecutive read-only calls run concurrently on a thread pool. Any other
+    call (load_dataset, merge_datasets, file writes, ...) acts as a barrier:
+    it starts after earlier calls finish and runs before later ones start.
+    """
+    results = [None] * len(function_calls)
+    
+    def run(index):
+        if verbose:
+            results[index] = call_function(function_calls[index], working_directory, verbose=True)
+        else:
+            results[index] = call_function(function_calls[index], working_directory)
+    
+    if not parallel or len(function_calls) < 2:
+        for index in range(len(function_calls)):
+            run(index)
+        return results
+    
+    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_FUNCTION_CALLS) as executor:
+        batch = []
+        for index, function_call in enumerate(function_calls):
+            if (function_call.name or "").lower() in concurrent_safe_functions:
+                batch.append(index)
+                continue
+            list(executor.map(run, batch))
+            batch = []
+            run(index)
+        list(executor.map(run, batch))
+    
+    return results
+
+
 def build_prompt(messages, working_directory=None):
     """Build system prompt with working directory and function info."""
     if working_directory is None:
@@ -100,8 +144,139 @@ All paths you provide should be relative to the working directory: {working_dire
 You have access to these functions - use them confidently to explore directories, read files, and accomplish tasks."""
 
 
-def process_prompt(prompt, verbose=False, messages=None, terminal=None, spinner=None):
-    """Process a single prompt using the AI agent."""
+def _function_response_parts(function_calls, function_call_results):
+    """Convert call_function results into function response parts for the tool message."""
+    function_response_parts = []
+    for function_call, function_call_result in zip(function_calls, function_call_results):
+        if not function_call_result.parts[0].function_response.response:
+            sys.exit(1)
+        function_response_parts.append(
+            types.Part(function_response=types.FunctionResponse(
+                name=function_call.name,
+                response=function_call_result.parts[0].function_response.response
+            ))
+        )
+    return function_response_parts
+
+
+class StreamingCallDispatcher:
+    """Start a turn's function calls while the model response is still streaming.
+    
+    Follows the same ordering rules as execute_function_calls: read-only calls
+    run concurrently and any other call waits for every earlier call to finish
+    and blocks later ones until it is done.
+    """
+    
+    def __init__(self, working_directory, verbose=False, parallel=True):
+        self.working_directory = working_directory
+        self.verbose = verbose
+        self.parallel = parallel
+        self.function_calls = []
+        self._futures = []
+        self._barrier = None
+        self._executor = ThreadPoolExecutor(max_workers=MAX_PARALLEL_FUNCTION_CALLS)
+    
+    def _run(self, function_call, dependencies):
+        for dependency in dependencies:
+            dependency.result()
+        if self.verbose:
+            return call_function(function_call, self.working_directory, verbose=True)
+        return call_function(function_call, self.working_directory)
+    
+    def submit(self, function_call):
+        is_safe = self.parallel and (function_call.name or "").lower() in concurrent_safe_functions
+        if is_safe:
+            dependencies = [self._barrier] if self._barrier is not None else []
+        else:
+            dependencies = list(self._futures)
+        future = self._executor.submit(self._run, function_call, dependencies)
+        if not is_safe:
+            self._barrier = future
+        self.function_calls.append(function_call)
+        self._futures.append(future)
+    
+    def results(self):
+        """Wait for all submitted calls and return their results in call order."""
+        try:
+            return [future.result() for future in self._futures]
+        finally:
+            self._executor.shutdown(wait=True)
+
+
+def flush_pending_workbooks(verbose=False):
+    """Write back Excel edits deferred by an open transaction at the end of a turn.
+    
+    A no-op unless an Excel tool has been used, so openpyxl is never imported here.
+    """
+    session_module = sys.modules.get("staffer.functions.excel.workbook_session")
+    if session_module is None:
+        return []
+    try:
+        written = session_module.workbook_session.flush()
+    except Exception as e:
+        print(f"Warning: could not save pending Excel edits: {e}")
+        return []
+    if verbose and written:
+        print(f"Saved pending Excel edits: {written}")
+    return written
+
+
+def _stream_response(client, request, working_directory, verbose, parallel_tools, terminal, before_output):
+    """Run one streaming model turn.
+    
+    Text is rendered as it arrives and function calls are dispatched as soon
+    as their part is received. Returns the assembled model content, the
+    function calls with their results, and the final usage metadata.
+    """
+    dispatcher = StreamingCallDispatcher(working_directory, verbose=verbose, parallel=parallel_tools)
+    parts = []
+    usage_metadata = None
+    text_started = False
+    
+    for chunk in client.models.generate_content_stream(**request):
+        if chunk.usage_metadata is not None:
+            usage_metadata = chunk.usage_metadata
+        if not chunk.candidates or chunk.candidates[0].content is None:
+            continue
+        for part in chunk.candidates[0].content.parts or []:
+            if part.function_call:
+                before_output()
+                if terminal:
+                    terminal.display_function_call(part.function_call.name)
+                dispatcher.submit(part.function_call)
+                parts.append(part)
+            elif part.text:
+                before_output()
+                if terminal:
+                    terminal.stream_ai_response(part.text)
+                else:
+                    print(part.text if text_started else f"-> {part.text}", end="", flush=True)
+                text_started = True
+                # Merge streamed text fragments back into one part for the history
+                if parts and parts[-1].text and not parts[-1].function_call:
+                    parts[-1] = types.Part(text=parts[-1].text + part.text)
+                else:
+                    parts.append(part)
+            else:
+                parts.append(part)
+    
+    if text_started:
+        if terminal:
+            terminal.finish_ai_response()
+        else:
+            print()
+    
+    content = types.Content(role="model", parts=parts)
+    return content, dispatcher.function_calls, dispatcher.results(), usage_metadata
+
+
+def process_prompt(prompt, verbose=False, messages=None, terminal=None, spinner=None, parallel_tools=True, stream=False):
+    """Process a single prompt using the AI agent.
+    
+    With stream=True the response is requested with generate_content_stream:
+    text renders incrementally and function calls start before the response
+    has finished arriving.
+    """
     if messages is None:
         messages = []
     working_directory = Path(os.getcwd())
@@ -123,8 +298,10 @@ def process_prompt(prompt, verbose=False, messages=None, terminal=None, spinner=
         print(f"Working directory: {working_directory}")
         print(f"User prompt: {prompt}")
 
-    # Filter stale directory context from conversation history
-    clean_messages = prune_stale_dir_msgs(messages, working_directory)
+    # Filter stale directory context, then fit the history to the token budget
+    clean_messages = history_manager.fit(prune_stale_dir_msgs(messages, working_directory))
+    if verbose and (history_manager.last_stats["messages_compacted"] or history_manager.last_stats["messages_dropped"]):
+        print(f"History compacted: {history_manager.last_stats}")
     system_prompt = build_prompt(clean_messages, working_directory)
 
     # Add current user prompt
@@ -137,17 +314,43 @@ def process_prompt(prompt, verbose=False, messages=None, terminal=None, spinner=
     conversation_for_llm = clean_messages + [current_message]
 
     client = get_client()
+    promptTokens = responseTokens = None
     
     for i in range(20):
         function_called = False
-        res = client.models.generate_content(
+        request = dict(
             model="gemini-2.0-flash-001",
             contents=conversation_for_llm,
             config=types.GenerateContentConfig(
                 tools=[available_functions],
                 system_instruction=system_prompt
-            )   
-        )    
+            )
+        )
+        
+        if stream:
+            content, function_calls, function_call_results, usage_metadata = _stream_response(
+                client, request, working_directory, verbose, parallel_tools, terminal, stop_spinner_once
+            )
+            if usage_metadata is not None:
+                promptTokens = usage_metadata.prompt_token_count
+                responseTokens = usage_metadata.candidates_token_count
+            
+            # Add assistant response to conversation history (validate parts first)
+            if content.parts:
+                conversation_for_llm.append(content)
+            elif verbose:
+                print(f"   ⚠️  Skipping empty content from conversation history")
+            
+            if not function_calls:
+                stop_spinner_once()
+                break
+            conversation_for_llm.append(types.Content(
+                role="tool",
+                parts=_function_response_parts(function_calls, function_call_results)
+            ))
+            continue
+        
+        res = client.models.generate_content(**request)
 
         promptTokens = res.usage_metadata.prompt_token_count
         responseTokens = res.usage_metadata.candidates_token_count
@@ -158,27 +361,19 @@ def process_prompt(prompt, verbose=False, messages=None, terminal=None, spinner=
                 function_response_parts = []
                 # Handle potential None parts (malformed LLM response)
                 parts = candidate.content.parts or []
-                for part in parts:
-                    if part.function_call:
-                        function_called = True
-                        # Stop spinner before first output
-                        stop_spinner_once()
-                        # Display function call indicator if terminal provided
-                        if terminal:
-                            terminal.display_function_call(part.function_call.name)
-                        if verbose:
-                            function_call_result = call_function(part.function_call, working_directory, verbose=True)
-                        else:
-                            function_call_result = call_function(part.function_call, working_directory)
-                        if not function_call_result.parts[0].function_response.response:
-                            sys.exit(1)
-                        else:
-                            function_response_parts.append(
-                                types.Part(function_response=types.FunctionResponse(
-                                    name=part.function_call.name,
-                                    response=function_call_result.parts[0].function_response.response
-                                ))
-                            )
+                function_calls = [part.function_call for part in parts if part.function_call]
+                if function_calls:
+                    function_called = True
+                    # Stop spinner before first output
+                    stop_spinner_once()
+                    # Display function call indicators if terminal provided
+                    if terminal:
+                        for function_call in function_calls:
+                            terminal.display_function_call(function_call.name)
+                    function_call_results = execute_function_calls(
+                        function_calls, working_directory, verbose=verbose, parallel=parallel_tools
+                    )
+                    function_response_parts = _function_response_parts(function_calls, function_call_results)
                 
                 # Add assistant response to conversation history (validate parts first)
                 if candidate.content.parts and len(candidate.content.parts) > 0:
@@ -203,6 +398,8 @@ def process_prompt(prompt, verbose=False, messages=None, terminal=None, spinner=
                 break
         i+=1
 
+    flush_pending_workbooks(verbose)
+
     if verbose:
         print(f"Prompt tokens: {promptTokens}")
         print(f"Response tokens: {responseTokens}")
@@ -210,7 +407,6 @@ def process_prompt(prompt, verbose=False, messages=None, terminal=None, spinner=
     # Return conversation_for_llm which now contains all the new responses
     return conversation_for_llm
 
-
 def main():
     parser = argparse.ArgumentParser(
         description="Analytics Agent CLI - AI analytics agent for data analysis and insights",
@@ -240,6 +436,7 @@ Terminal Experience:
     parser.add_argument("prompt", nargs='?', help="The task or question for the AI agent")
     parser.add_argument("--verbose", action="store_true", help="Show detailed function call information")
     parser.add_argument("--interactive", action="store_true", help="Start interactive mode")
+    parser.add_argument("--no-stream", action="store_true", help="Wait for complete responses instead of streaming them")
     parser.add_argument("--version", action="version", version="Analytics Agent CLI 0.1.0")
     
     args = parser.parse_args()
@@ -247,11 +444,11 @@ Terminal Experience:
     # Handle interactive mode - either explicit flag or no prompt provided
     if args.interactive or not args.prompt:
         from .cli.interactive import main as interactive_main
-        interactive_main(verbose=args.verbose)
+        interactive_main(verbose=args.verbose, stream=not args.no_stream)
         return
     
     # Single command mode with prompt
-    process_prompt(args.prompt, args.verbose)
+    process_prompt(args.prompt, args.verbose, stream=not args.no_stream)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,303 @@
+"""Size-bounded encoding of function results for the model.
+
+Function results are converted to JSON-safe values before they are sent back
+as function responses. NumPy arrays, pandas Series and DataFrames are
+converted in bulk through pandas' C JSON writer instead of element by
+element, and every response is held to a byte budget:
+
+- a response that fits the budget is returned in full; responses whose
+  item and row counts alone rule that out skip the full encode
+- otherwise it is re-encoded with progressively tighter item, string and
+  key limits; arrays, lists and tables longer than the item limit become
+  head/tail samples plus summary statistics, marked with ``"truncated": True``
+
+pandas and NumPy are only touched when the value actually contains their
+objects, so file operations never import them.
+"""
+
+import json
+import math
+import os
+import sys
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Optional
+
+
+DEFAULT_MAX_BYTES = 48_000
+
+# (max items per list/array/table, max string length, max dict keys),
+# tried in order until the response fits the budget; the first step
+# encodes everything and is skipped when min_json_size rules it out
+SHRINK_STEPS = [
+    (None, None, None),
+    (200, None, None),
+    (50, 2_000, None),
+    (20, 500, 200),
+    (10, 200, 50),
+    (5, 100, 20),
+]
+
+MAX_SUMMARY_COLUMNS = 50
+
+
+def max_response_bytes() -> int:
+    return int(os.environ.get("TOOL_RESPONSE_MAX_BYTES", DEFAULT_MAX_BYTES))
+
+
+def json_size(value: Any) -> int:
+    return len(json.dumps(value, separators=(",", ":"), default=str))
+
+
+def min_json_size(value: Any, limit: int) -> int:
+    """Lower bound on the compact JSON size of value, counted without encoding it.
+
+    Every list item, array element and table cell takes at least one byte
+    plus a separator, and record keys repeat on every row. Counting stops
+    once the bound passes limit, so huge results are never walked in full.
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        return 1
+    if isinstance(value, str):
+        return len(value) + 2
+    if isinstance(value, dict):
+        # {"key":value,...}
+        size = 1
+        for key, item in value.items():
+            size += len(str(key)) + 4 + min_json_size(item, limit - size)
+            if size > limit:
+                break
+        return max(size, 2)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        size = 1
+        for item in value:
+            size += 1 + min_json_size(item, limit - size)
+            if size > limit:
+                break
+        return max(size, 2)
+
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(value, pd.DataFrame):
+        keys = {str(col) for col in value.columns}
+        row = 1 + sum(len(key) + 5 for key in keys) if keys else 2
+        return 1 + len(value) * (row + 1) if len(value) else 2
+    if pd is not None and isinstance(value, (pd.Series, pd.Index)):
+        return 1 + 2 * len(value) if len(value) else 2
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(value, np.ndarray):
+        return 1 + 2 * value.size if value.size else 2
+    return 1
+
+
+def _finite(value: float) -> Optional[float]:
+    return value if math.isfinite(value) else None
+
+
+def _cap_string(value: str, max_string: Optional[int]) -> str:
+    if max_string is None or len(value) <= max_string:
+        return value
+    return f"{value[:max_string]}... [truncated {len(value) - max_string} chars]"
+
+
+def _head_tail_sizes(max_items: int) -> tuple:
+    tail = max_items // 2
+    return max_items - tail, tail
+
+
+def _numeric_summary(values: list) -> dict:
+    numbers = [v for v in values if isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v)]
+    if not numbers:
+        return {}
+    return {"min": min(numbers), "max": max(numbers), "mean": sum(numbers) / len(numbers)}
+
+
+class _Encoder:
+    def __init__(self, max_items: Optional[int], max_string: Optional[int], max_keys: Optional[int]):
+        self.max_items = max_items
+        self.max_string = max_string
+        self.max_keys = max_keys
+
+    def encode(self, obj: Any) -> Any:
+        if obj is None or isinstance(obj, bool):
+            return obj
+        if isinstance(obj, str):
+            return _cap_string(obj, self.max_string)
+        if type(obj) is int:
+            return obj
+        if type(obj) is float:
+            return _finite(obj)
+        if isinstance(obj, dict):
+            return self._encode_dict(obj)
+        if isinstance(obj, (list, tuple, set, frozenset)):
+            return self._encode_list(list(obj))
+        if isinstance(obj, Path):
+            return str(obj)
+
+        # Only values created by pandas/NumPy can need them, and those are
+        # only possible once the modules are imported
+        if "numpy" in sys.modules or "pandas" in sys.modules:
+            encoded = self._encode_array_like(obj)
+            if encoded is not NotImplemented:
+                return encoded
+
+        if isinstance(obj, (datetime, date)):
+            return obj.isoformat()
+        if isinstance(obj, int):
+            return int(obj)
+        if isinstance(obj, float):
+            return _finite(float(obj))
+        return _cap_string(str(obj), self.max_string)
+
+    def _encode_dict(self, obj: dict) -> dict:
+        items = list(obj.items())
+        encoded = {str(k): self.encode(v) for k, v in items[:self.max_keys]}
+        if self.max_keys is not None and len(items) > self.max_keys:
+            encoded["truncated_keys"] = len(items) - self.max_keys
+        return encoded
+
+    def _encode_list(self, items: list) -> Any:
+        if self.max_items is None or len(items) <= self.max_items:
+            return [self.encode(item) for item in items]
+        if items and all(isinstance(item, dict) for item in items):
+            # A list of records is a table
+            if "pandas" in sys.modules:
+                import pandas as pd
+                try:
+                    return self._encode_frame(pd.DataFrame.from_records(items))
+                except Exception:
+                    pass
+        head, tail = _head_tail_sizes(self.max_items)
+        result = {
+            "truncated": True,
+            "total_items": len(items),
+            "head": [self.encode(item) for item in items[:head]],
+            "tail": [self.encode(item) for item in items[len(items) - tail:]] if tail else [],
+        }
+        summary = _numeric_summary(items)
+        if summary:
+            result["summary"] = summary
+        return result
+
+    def _encode_array_like(self, obj: Any) -> Any:
+        np = sys.modules.get("numpy")
+        pd = sys.modules.get("pandas")
+
+        if pd is not None:
+            if isinstance(obj, pd.DataFrame):
+                return self._encode_frame(obj)
+            if isinstance(obj, (pd.Series, pd.Index)):
+                return self._encode_values(pd.Series(obj) if isinstance(obj, pd.Index) else obj)
+            if isinstance(obj, pd.Timestamp):
+                return obj.isoformat()
+            if isinstance(obj, pd.Timedelta):
+                return str(obj)
+            if obj is pd.NA or obj is pd.NaT:
+                return None
+
+        if np is not None:
+            if isinstance(obj, np.ndarray):
+                if obj.ndim == 1 and pd is not None:
+                    return self._encode_values(pd.Series(obj))
+                return self._encode_list(obj.tolist())
+            if isinstance(obj, np.datetime64):
+                return None if np.isnat(obj) else str(obj)
+            if isinstance(obj, np.generic):
+                return self.encode(obj.item())
+
+        return NotImplemented
+
+    def _encode_values(self, series) -> Any:
+        """Encode a Series as a list, or a head/tail sample with stats when too long."""
+        if self.max_items is None or len(series) <= self.max_items:
+            return self._series_to_list(series)
+        head, tail = _head_tail_sizes(self.max_items)
+        result = {
+            "truncated": True,
+            "total_items": len(series),
+            "head": self._series_to_list(series.iloc[:head]),
+            "tail": self._series_to_list(series.iloc[len(series) - tail:]) if tail else [],
+        }
+        summary = self._series_summary(series)
+        if summary:
+            result["summary"] = summary
+        return result
+
+    def _series_to_list(self, series) -> list:
+        try:
+            values = json.loads(series.to_json(orient="values", date_format="iso", default_handler=str))
+        except Exception:
+            return [self.encode(item) for item in series.tolist()]
+        if self.max_string is not None:
+            values = [self.encode(value) for value in values]
+        return values
+
+    def _series_summary(self, series) -> dict:
+        import pandas as pd
+        summary = {"nulls": int(series.isna().sum())}
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            stats = series.agg(["min", "max", "mean"])
+            summary.update({key: self.encode(stats[key]) for key in ("min", "max", "mean")})
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            summary.update({"min": self.encode(series.min()), "max": self.encode(series.max())})
+        return summary
+
+    def _frame_to_records(self, df) -> list:
+        try:
+            records = json.loads(df.to_json(orient="records", date_format="iso", default_handler=str))
+        except Exception:
+            # Duplicate column names and other shapes to_json rejects
+            return [self.encode(record) for record in df.to_dict(orient="records")]
+        if self.max_string is not None or self.max_keys is not None:
+            records = [self.encode(record) for record in records]
+        return records
+
+    def _encode_frame(self, df) -> Any:
+        """Encode a DataFrame as records, or a head/tail sample with column stats when too long."""
+        if self.max_items is None or len(df) <= self.max_items:
+            return self._frame_to_records(df)
+        head, tail = _head_tail_sizes(self.max_items)
+        columns = list(df.columns)
+        summary = {}
+        for col in columns[:MAX_SUMMARY_COLUMNS]:
+            column = df[col]
+            if isinstance(column, type(df)):
+                continue
+            summary[str(col)] = self._series_summary(column)
+        return {
+            "truncated": True,
+            "total_rows": len(df),
+            "columns": [str(col) for col in columns],
+            "head": self._frame_to_records(df.iloc[:head]),
+            "tail": self._frame_to_records(df.iloc[len(df) - tail:]) if tail else [],
+            "summary": summary,
+        }
+
+
+def to_jsonable(obj: Any, max_items: Optional[int] = None, max_string: Optional[int] = None,
+                max_keys: Optional[int] = None) -> Any:
+    """Convert a value to JSON-safe Python types, optionally truncating bulky parts."""
+    return _Encoder(max_items, max_string, max_keys).encode(obj)
+
+
+def encode_response(obj: Any, max_bytes: Optional[int] = None) -> Any:
+    """Encode a function result so its JSON form fits within max_bytes."""
+    if max_bytes is None:
+        max_bytes = max_response_bytes()
+
+    steps = SHRINK_STEPS
+    if min_json_size(obj, max_bytes) > max_bytes:
+        # Too many items to fit even fully encoded, so start sampling at once
+        steps = SHRINK_STEPS[1:]
+
+    for max_items, max_string, max_keys in steps:
+        encoded = to_jsonable(obj, max_items, max_string, max_keys)
+        size = json_size(encoded)
+        if size <= max_bytes:
+            return encoded
+
+    preview = json.dumps(encoded, default=str)[:max_bytes // 2]
+    return {
+        "truncated": True,
+        "note": f"Result was {size} bytes after condensing, over the {max_bytes} byte response limit",
+        "preview": preview,
+    }
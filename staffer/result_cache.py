@@ -0,0 +1,148 @@
+"""Memoization of read-only tool results keyed by dataset version.
+
+The model often re-issues the same analysis call within a session. Results of
+functions registered as cacheable are memoized on (function, normalized args,
+versions of the datasets named in the args). Loading, merging, sampling or
+optimizing a dataset gives it a new version, which naturally invalidates any
+result computed from the old contents.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+
+DEFAULT_MAX_ENTRIES = 256
+
+_MISS = object()
+
+
+def _loaded_datasets():
+    # Imported lazily: the dataset store pulls in pandas, which CLI startup avoids
+    from .functions.analytics.models.schemas import loaded_datasets
+    return loaded_datasets
+
+
+def _referenced_datasets(value: Any, found: set) -> None:
+    """Collect string argument values that name loaded datasets."""
+    loaded_datasets = _loaded_datasets()
+    if isinstance(value, str):
+        if value in loaded_datasets:
+            found.add(value)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _referenced_datasets(item, found)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _referenced_datasets(item, found)
+
+
+def _result_handles(result: Any) -> List[str]:
+    """Derived dataset handles a (serialized) result refers to."""
+    if not isinstance(result, dict):
+        return []
+    handles = [result["result_handle"]] if isinstance(result.get("result_handle"), dict) else []
+    handles += [handle for handle in result.get("result_handles") or [] if isinstance(handle, dict)]
+    return [handle["dataset_handle"] for handle in handles if "dataset_handle" in handle]
+
+
+def _handles_loaded(result: Any) -> bool:
+    handles = _result_handles(result)
+    if not handles:
+        return True
+    loaded_datasets = _loaded_datasets()
+    return all(handle in loaded_datasets for handle in handles)
+
+
+class ResultCache:
+    """Size-bounded LRU cache of serialized function results."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def make_key(self, function_name: str, args: dict) -> Optional[Tuple]:
+        """Build a cache key, or None when the call references no loaded dataset."""
+        datasets = set()
+        _referenced_datasets(args, datasets)
+        if not datasets:
+            return None
+        try:
+            normalized_args = json.dumps(args, sort_keys=True, default=str)
+        except (TypeError, ValueError):
+            return None
+        loaded_datasets = _loaded_datasets()
+        try:
+            versions = tuple(sorted((name, loaded_datasets.version(name)) for name in datasets))
+        except KeyError:
+            # Dataset was cleared while building the key
+            return None
+        return (function_name, normalized_args, versions)
+
+    def get(self, key: Tuple) -> Any:
+        """Return the cached result, or the module-level miss sentinel.
+
+        A result whose dataset handles have since been cleared is dropped and
+        counted as a miss, so the call runs again and re-registers them.
+        """
+        with self._lock:
+            if key in self._entries:
+                result = self._entries[key]
+                if _handles_loaded(result):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return result
+                del self._entries[key]
+            self.misses += 1
+            return _MISS
+
+    def put(self, key: Tuple, result: Any) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+def is_miss(value: Any) -> bool:
+    """Check whether a ResultCache.get() result is a miss."""
+    return value is _MISS
+
+
+def is_cacheable_result(result: Any) -> bool:
+    """Error results are never memoized so a retry can succeed.
+
+    Results carrying derived dataset handles are memoized like any other;
+    ResultCache.get checks that their handles are still loaded.
+    """
+    if isinstance(result, dict):
+        return "error" not in result and result.get("status") != "error"
+    if isinstance(result, str):
+        return not result.startswith("Error")
+    return True
+
+
+# Process-wide cache used by call_function
+result_cache = ResultCache()
@@ -112,38 +112,85 @@ class TerminalUI:
         if not response:
             return
             
-        # Simple code block detection and highlighting
-        lines = response.split('\n')
-        in_code_block = False
-        code_lines = []
-        language = "text"
+        self._reset_stream()
+        for line in response.split('\n'):
+            self._render_line(line)
         
-        for line in lines:
-            if line.strip().startswith('```'):
-                if in_code_block:
-                    # End of code block
-                    if code_lines:
-                        code = '\n'.join(code_lines)
-                        self.display_code(code, language)
-                        code_lines = []
-                    in_code_block = False
-                else:
-                    # Start of code block
-                    language = line.strip()[3:] or "text"
-                    in_code_block = True
-            elif in_code_block:
-                code_lines.append(line)
+        # Handle unterminated code block
+        self._flush_code_block()
+    
+    def stream_ai_response(self, chunk: str):
+        """Render a chunk of a streamed AI response as soon as it arrives.
+        
+        Plain text is printed immediately; fenced code blocks are held back
+        until they are closed so they can be syntax highlighted.
+        """
+        if not chunk:
+            return
+        if not hasattr(self, '_stream_line'):
+            self._reset_stream()
+        
+        self._stream_line += chunk
+        while '\n' in self._stream_line:
+            line, self._stream_line = self._stream_line.split('\n', 1)
+            if self._stream_printed:
+                # Start of this line is already on screen
+                self.console.print(line[self._stream_printed:], markup=False)
             else:
-                # Regular text
-                if line.strip():
-                    self.console.print(line)
-                else:
-                    self.console.print()
+                self._render_line(line)
+            self._stream_printed = 0
         
-        # Handle unterminated code block
-        if in_code_block and code_lines:
-            code = '\n'.join(code_lines)
-            self.display_code(code, language)
+        # Print the unfinished line unless it may turn out to be a code fence
+        pending = self._stream_line
+        if pending.strip() and not self._in_code_block and not pending.lstrip().startswith('`'):
+            self.console.print(pending[self._stream_printed:], end='', markup=False)
+            self._stream_printed = len(pending)
+    
+    def finish_ai_response(self):
+        """Flush the rest of a streamed AI response."""
+        if not hasattr(self, '_stream_line'):
+            return
+        if self._stream_printed:
+            self.console.print(self._stream_line[self._stream_printed:], markup=False)
+        elif self._stream_line:
+            self._render_line(self._stream_line)
+        self._flush_code_block()
+        self._reset_stream()
+    
+    def _reset_stream(self):
+        self._stream_line = ''
+        self._stream_printed = 0
+        self._in_code_block = False
+        self._code_lines = []
+        self._code_language = "text"
+    
+    def _render_line(self, line: str):
+        """Render one complete line, collecting fenced code blocks."""
+        if line.strip().startswith('```'):
+            if self._in_code_block:
+                # End of code block
+                if self._code_lines:
+                    self.display_code('\n'.join(self._code_lines), self._code_language)
+                    self._code_lines = []
+                self._in_code_block = False
+            else:
+                # Start of code block
+                self._code_language = line.strip()[3:] or "text"
+                self._in_code_block = True
+        elif self._in_code_block:
+            self._code_lines.append(line)
+        else:
+            # Regular text
+            if line.strip():
+                self.console.print(line)
+            else:
+                self.console.print()
+    
+    def _flush_code_block(self):
+        if self._in_code_block and self._code_lines:
+            self.display_code('\n'.join(self._code_lines), self._code_language)
+        self._in_code_block = False
+        self._code_lines = []
     
     def display_welcome(self):
         """Display welcome message."""
@@ -189,6 +236,14 @@ class BasicTerminalUI:
         """Display AI response as plain text."""
         print(response)
     
+    def stream_ai_response(self, chunk: str):
+        """Print a chunk of a streamed AI response as it arrives."""
+        print(chunk, end="", flush=True)
+    
+    def finish_ai_response(self):
+        """End a streamed AI response."""
+        print()
+    
     def display_welcome(self):
         """Display welcome message."""
         print("🚀 Analytics Agent CLI")
@@ -79,6 +79,10 @@ class FakeGeminiModels:
     
     def generate_content(self, **kwargs):
         return self.gemini.generate_content(**kwargs)
+    
+    def generate_content_stream(self, **kwargs):
+        """Stream the same response as a single chunk."""
+        yield self.gemini.generate_content(**kwargs)
 
 
 class FakeGeminiClient:
@@ -0,0 +1,119 @@
+"""Tests for the pre-warmed worker pool behind execute_custom_analytics_code."""
+
+import os
+
+import pytest
+import pandas as pd
+
+from staffer.functions.analytics import code_workers
+from staffer.functions.analytics.code_workers import CodeWorkerPool, WorkerTimeout, export_dataset
+from staffer.functions.analytics.models.schemas import DatasetManager, DatasetSchema, loaded_datasets, dataset_schemas
+from staffer.functions.analytics.tools.execute_custom_analytics_code_tool import execute_custom_analytics_code
+
+
+@pytest.fixture
+def pool():
+    pool = CodeWorkerPool(size=1, max_calls_per_worker=2)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.fixture
+def sales():
+    df = pd.DataFrame({
+        "date": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-03"]),
+        "revenue": [100, 250, 175],
+    })
+    loaded_datasets["sales"] = df
+    dataset_schemas["sales"] = DatasetSchema.from_dataframe(df, "sales")
+    yield df
+    DatasetManager.clear_all_datasets()
+
+
+def test_dataset_round_trips_with_dtypes(pool, sales):
+    path, data_format = export_dataset("sales", 1, sales)
+    assert data_format == "arrow"
+
+    output = pool.run("print(df['date'].dtype.kind, int(df['revenue'].sum()), px.__name__)", path, data_format)
+
+    assert output.strip() == "M 525 plotly.express"
+
+
+def test_errors_are_reported_and_worker_survives(pool, sales):
+    path, data_format = export_dataset("sales", 1, sales)
+
+    output = pool.run("df['missing']", path, data_format)
+    assert output.startswith("ERROR: KeyError:")
+    assert "Traceback:" in output
+
+    assert pool.run("print('still alive')", path, data_format).strip() == "still alive"
+
+
+def test_namespace_is_fresh_per_call(pool, sales):
+    path, data_format = export_dataset("sales", 1, sales)
+
+    pool.run("leftover = 1", path, data_format)
+    output = pool.run("print('leftover' in globals())", path, data_format)
+
+    assert output.strip() == "False"
+
+
+def test_timeout_replaces_worker(pool, sales):
+    path, data_format = export_dataset("sales", 1, sales)
+
+    with pytest.raises(WorkerTimeout):
+        pool.run("import time\ntime.sleep(10)", path, data_format, timeout=0.5)
+
+    assert pool.run("print(len(df))", path, data_format).strip() == "3"
+
+
+def test_secrets_are_not_visible(pool, sales, monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "secret")
+    pool.shutdown()
+    pool = CodeWorkerPool(size=1)
+    path, data_format = export_dataset("sales", 1, sales)
+    try:
+        output = pool.run("import os\nprint(os.environ.get('GEMINI_API_KEY'))", path, data_format)
+    finally:
+        pool.shutdown()
+
+    assert output.strip() == "None"
+
+
+def test_export_is_reused_until_version_changes(sales):
+    first = export_dataset("sales", 1, sales)
+    assert export_dataset("sales", 1, sales) == first
+
+    second = export_dataset("sales", 2, sales)
+    assert second != first
+    assert not os.path.exists(first[0])
+
+
+def test_tool_runs_code_against_dataset(sales, monkeypatch):
+    pool = CodeWorkerPool(size=1)
+    monkeypatch.setattr(code_workers, "_pool", pool)
+    try:
+        output = execute_custom_analytics_code(".", "sales", "print(df['revenue'].max())")
+    finally:
+        pool.shutdown()
+
+    assert output.strip() == "250"
+
+
+def test_files_written_by_code_are_kept_in_working_directory(sales, monkeypatch, tmp_path):
+    pool = CodeWorkerPool(size=1)
+    monkeypatch.setattr(code_workers, "_pool", pool)
+    try:
+        output = execute_custom_analytics_code(str(tmp_path), "sales", "df.to_csv('summary.csv', index=False)\nimport os\nprint(os.getcwd())")
+    finally:
+        pool.shutdown()
+
+    # Stopping the worker must not remove files the code wrote
+    assert os.path.samefile(output.strip(), tmp_path)
+    assert (tmp_path / "summary.csv").read_text().splitlines()[0] == "date,revenue"
+
+
+def test_tool_reports_missing_dataset():
+    output = execute_custom_analytics_code(".", "nope", "print(1)")
+
+    assert output.startswith("EXECUTION ERROR:")
@@ -0,0 +1,113 @@
+"""Tests for the columnar on-disk dataset cache."""
+
+import os
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from staffer.functions.analytics.models import dataset_cache
+from staffer.functions.analytics.models.schemas import DatasetManager, loaded_datasets, dataset_schemas
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the dataset cache at a temporary directory."""
+    cache = tmp_path / "cache"
+    monkeypatch.setenv("DATASET_CACHE_DIR", str(cache))
+    yield cache
+    DatasetManager.clear_all_datasets()
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "orders.csv"
+    path.write_text("order_id,region,amount\n1,North,10.5\n2,South,20.0\n3,North,7.25\n")
+    return path
+
+
+def test_second_load_is_cache_hit(cache_dir, csv_file):
+    first = DatasetManager.load_dataset(str(csv_file), "orders")
+    second = DatasetManager.load_dataset(str(csv_file), "orders_again")
+
+    assert first["cache_hit"] is False
+    assert second["cache_hit"] is True
+    assert second["rows"] == 3
+    assert second["columns"] == ["order_id", "region", "amount"]
+    assert loaded_datasets["orders_again"].equals(loaded_datasets["orders"])
+
+
+def test_cached_schema_is_renamed(cache_dir, csv_file):
+    DatasetManager.load_dataset(str(csv_file), "orders")
+    DatasetManager.load_dataset(str(csv_file), "orders_again")
+
+    schema = dataset_schemas["orders_again"]
+    assert schema.name == "orders_again"
+    assert schema.columns["region"].suggested_role == dataset_schemas["orders"].columns["region"].suggested_role
+
+
+def test_modified_file_invalidates_cache(cache_dir, csv_file):
+    DatasetManager.load_dataset(str(csv_file), "orders")
+    csv_file.write_text("order_id,region,amount\n1,North,10.5\n2,South,20.0\n3,North,7.25\n4,East,1.0\n")
+
+    result = DatasetManager.load_dataset(str(csv_file), "orders")
+
+    assert result["cache_hit"] is False
+    assert result["rows"] == 4
+
+
+def test_touched_but_unchanged_file_still_hits(cache_dir, csv_file):
+    DatasetManager.load_dataset(str(csv_file), "orders")
+    stat = os.stat(csv_file)
+    os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000_000))
+
+    result = DatasetManager.load_dataset(str(csv_file), "orders")
+
+    assert result["cache_hit"] is True
+
+
+def test_use_cache_false_bypasses_cache(cache_dir, csv_file):
+    DatasetManager.load_dataset(str(csv_file), "orders", use_cache=False)
+
+    assert not cache_dir.exists() or not any(cache_dir.iterdir())
+    assert DatasetManager.load_dataset(str(csv_file), "orders")["cache_hit"] is False
+
+
+def test_clear_cache(cache_dir, csv_file):
+    DatasetManager.load_dataset(str(csv_file), "orders")
+
+    result = dataset_cache.clear_cache()
+
+    assert result["status"] == "success"
+    assert DatasetManager.load_dataset(str(csv_file), "orders")["cache_hit"] is False
+
+
+def test_least_recently_used_entries_are_evicted_over_budget(cache_dir, tmp_path, monkeypatch):
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.csv"
+        path.write_text("x,y\n" + "".join(f"{i},{i * 2}\n" for i in range(2000)))
+        paths.append(path)
+
+    DatasetManager.load_dataset(str(paths[0]), "a")
+    DatasetManager.load_dataset(str(paths[1]), "b")
+    entry_size = max(dataset_cache._entry_stats(entry)[1] for entry in cache_dir.iterdir())
+    # a was cached before b, then used again
+    for age, path in ((200, paths[0]), (100, paths[1])):
+        meta = dataset_cache._entry_dir(str(path)) / "meta.json"
+        os.utime(meta, (os.path.getmtime(meta) - age,) * 2)
+    assert DatasetManager.load_dataset(str(paths[0]), "a")["cache_hit"] is True
+
+    monkeypatch.setenv("DATASET_CACHE_MAX_MB", str(2.5 * entry_size / 1024**2))
+    DatasetManager.load_dataset(str(paths[2]), "c")
+
+    assert not dataset_cache._entry_dir(str(paths[1])).exists()
+    assert DatasetManager.load_dataset(str(paths[0]), "a")["cache_hit"] is True
+    assert DatasetManager.load_dataset(str(paths[2]), "c")["cache_hit"] is True
+
+
+def test_entry_larger_than_budget_is_not_kept(cache_dir, csv_file, monkeypatch):
+    monkeypatch.setenv("DATASET_CACHE_MAX_MB", "0")
+
+    assert DatasetManager.load_dataset(str(csv_file), "orders")["cache_hit"] is False
+    assert not any(cache_dir.iterdir())
+    assert DatasetManager.load_dataset(str(csv_file), "orders")["cache_hit"] is False
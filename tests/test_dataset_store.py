@@ -0,0 +1,184 @@
+"""Tests for the memory-budgeted LRU dataset store."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from staffer.functions.analytics.models.dataset_store import DatasetStore
+from staffer.functions.analytics.models.schemas import DatasetManager, DatasetSchema, loaded_datasets, dataset_schemas
+from staffer.functions.analytics.resources.get_memory_usage_resource import get_memory_usage
+
+
+def make_frame(rows=10_000):
+    return pd.DataFrame({"value": np.arange(rows, dtype=np.int64), "score": np.random.default_rng(0).random(rows)})
+
+
+@pytest.fixture
+def store(tmp_path):
+    frame_mb = make_frame().memory_usage(deep=True).sum() / 1024**2
+    store = DatasetStore(spill_dir=tmp_path / "spill")
+    # Room for two frames, not three
+    store.set_budget(frame_mb * 2.5)
+    return store
+
+
+def test_store_behaves_like_dict(store):
+    store["a"] = make_frame()
+
+    assert "a" in store
+    assert list(store) == ["a"]
+    assert len(store) == 1
+    del store["a"]
+    assert "a" not in store
+    with pytest.raises(KeyError):
+        store["a"]
+
+
+def test_least_recently_used_dataset_is_spilled(store):
+    store["a"] = make_frame()
+    store["b"] = make_frame()
+    store["a"]  # touch a so b becomes the coldest
+    store["c"] = make_frame()
+
+    assert store.is_resident("a")
+    assert not store.is_resident("b")
+    assert store.is_resident("c")
+    assert store.stats()["evictions"] == 1
+    assert list(store.spill_dir.iterdir())
+
+
+def test_spilled_dataset_reloads_transparently(store):
+    original = make_frame()
+    store["a"] = original
+    store["b"] = make_frame()
+    store["c"] = make_frame()
+
+    reloaded = store["a"]
+
+    assert reloaded.equals(original)
+    assert store.is_resident("a")
+    assert store.stats()["reloads"] == 1
+
+
+def test_describe_does_not_reload(store):
+    store["a"] = make_frame()
+    store["b"] = make_frame()
+    store["c"] = make_frame()
+
+    info = store.describe("a")
+
+    assert info["rows"] == 10_000
+    assert info["columns"] == ["value", "score"]
+    assert info["resident"] is False
+    assert not store.is_resident("a")
+
+
+def test_assignment_bumps_version(store):
+    store["a"] = make_frame()
+    first = store.version("a")
+    store["a"] = make_frame(10)
+
+    assert store.version("a") > first
+
+
+def test_delete_removes_spill_file(store):
+    store["a"] = make_frame()
+    store["b"] = make_frame()
+    store["c"] = make_frame()
+
+    del store["a"]
+
+    assert not any(store.spill_dir.iterdir())
+
+
+def test_default_spill_dir_is_removed_at_exit(tmp_path):
+    script = (
+        "import pandas as pd\n"
+        "from staffer.functions.analytics.models.dataset_store import DatasetStore\n"
+        "store = DatasetStore(budget_bytes=1)\n"
+        "store['a'] = pd.DataFrame({'x': range(100)})\n"
+        "store['b'] = pd.DataFrame({'x': range(100)})\n"
+        "assert list(store.spill_dir.iterdir())\n"
+        "print(store.spill_dir)\n"
+    )
+    env = {**os.environ, "TMPDIR": str(tmp_path)}
+    env.pop("DATASET_SPILL_DIR", None)
+
+    output = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True)
+
+    spill_dir = Path(output.stdout.strip())
+    assert spill_dir.parent.parent == tmp_path
+    assert not spill_dir.exists()
+
+
+def test_unbounded_store_never_spills(tmp_path):
+    store = DatasetStore(spill_dir=tmp_path / "spill")
+    for name in "abcde":
+        store[name] = make_frame()
+
+    assert store.stats()["spilled_datasets"] == []
+
+
+def test_manager_get_dataset_and_memory_usage_report_evictions(tmp_path, monkeypatch):
+    monkeypatch.setattr(loaded_datasets, "spill_dir", tmp_path / "spill")
+    frame_mb = make_frame().memory_usage(deep=True).sum() / 1024**2
+    try:
+        DatasetManager.set_memory_budget(frame_mb * 1.5)
+        for name in ("first", "second"):
+            loaded_datasets[name] = make_frame()
+            dataset_schemas[name] = DatasetSchema.from_dataframe(loaded_datasets[name], name)
+
+        usage = get_memory_usage("/tmp")
+        assert usage["memory_budget"]["spilled_datasets"] == ["first"]
+        assert {d["dataset"]: d["resident"] for d in usage["datasets"]} == {"first": False, "second": True}
+
+        assert len(DatasetManager.get_dataset("first")) == 10_000
+        assert loaded_datasets.stats()["spilled_datasets"] == ["second"]
+    finally:
+        DatasetManager.set_memory_budget(None)
+        DatasetManager.clear_all_datasets()
+
+
+def test_derived_values_are_cached_per_version(store):
+    store["a"] = make_frame()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return store["a"]["value"] * 2
+
+    first = store.derived("a", "doubled", compute)
+    assert store.derived("a", "doubled", compute) is first
+    assert len(calls) == 1
+
+    store["a"] = make_frame(10)
+    assert len(store.derived("a", "doubled", compute)) == 10
+    assert len(calls) == 2
+
+    del store["a"]
+    assert store.stats()["derived_values"] == 0
+
+
+def test_projection_and_cached_datetimes_leave_dataset_untouched():
+    loaded_datasets["events"] = pd.DataFrame({
+        "when": ["2024-01-03", "2024-01-01", "2024-01-02"],
+        "amount": [3.0, 1.0, 2.0],
+        "notes": ["c", "a", "b"],
+    })
+    try:
+        view = DatasetManager.get_columns("events", ["when", "amount", "when"])
+        assert list(view.columns) == ["when", "amount"]
+        view.loc[0, "amount"] = 99.0
+        assert loaded_datasets["events"].loc[0, "amount"] == 3.0
+
+        dates = DatasetManager.get_datetime_column("events", "when")
+        assert str(dates.dtype).startswith("datetime64")
+        assert DatasetManager.get_datetime_column("events", "when") is dates
+        assert loaded_datasets["events"]["when"].iloc[0] == "2024-01-03"
+    finally:
+        DatasetManager.clear_all_datasets()
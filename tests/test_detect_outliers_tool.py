@@ -0,0 +1,85 @@
+"""Tests for detect_outliers and the vectorized outlier scoring."""
+
+import numpy as np
+import pandas as pd
+
+from staffer.functions.analytics.models import outlier_scoring
+from staffer.functions.analytics.models.schemas import DatasetManager, loaded_datasets
+from staffer.functions.analytics.tools.detect_outliers_tool import detect_outliers
+
+
+def setup_function():
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame(rng.normal(0, 1, (3000, 6)), columns=[f"sensor_{i}" for i in range(6)])
+    frame["count"] = rng.integers(0, 20, 3000)
+    frame["flat"] = 5.0
+    frame.loc[[10, 20], "sensor_0"] = [40.0, -35.0]
+    frame.loc[::50, "sensor_1"] = np.nan
+    frame.loc[100, "flat"] = 9.0
+    frame.loc[:14, ["sensor_2", "sensor_3", "sensor_4"]] = 8.0
+    loaded_datasets["sensors"] = frame
+
+
+def teardown_function():
+    DatasetManager.clear_all_datasets()
+
+
+def _per_column_reference(series, method):
+    values = series.dropna()
+    if method == "iqr":
+        q1, q3 = values.quantile(0.25), values.quantile(0.75)
+        return values[(values < q1 - 1.5 * (q3 - q1)) | (values > q3 + 1.5 * (q3 - q1))]
+    return values[np.abs((values - values.mean()) / values.std()) > 3]
+
+
+def test_chunked_matrix_pass_matches_per_column_loop(monkeypatch):
+    monkeypatch.setattr(outlier_scoring, "OUTLIER_CHUNK_CELLS", 1000)
+    frame = loaded_datasets["sensors"]
+
+    for method in ("iqr", "zscore"):
+        result = detect_outliers(".", "sensors", method=method)
+        for col, info in result["outliers_by_column"].items():
+            expected = _per_column_reference(frame[col], method)
+            assert info["outlier_count"] == len(expected), (method, col)
+            assert info["outlier_values"] == expected.head(10).tolist(), (method, col)
+        assert result["total_outliers"] == sum(info["outlier_count"] for info in result["outliers_by_column"].values())
+
+
+def test_chunks_bound_the_rows_evaluated_at_once():
+    assert list(outlier_scoring.row_chunks(10, 3, chunk_cells=9)) == [(0, 3), (3, 6), (6, 9), (9, 10)]
+    assert list(outlier_scoring.row_chunks(2, 50, chunk_cells=9)) == [(0, 1), (1, 2)]
+
+
+def test_robust_z_uses_median_absolute_deviation():
+    result = detect_outliers(".", "sensors", ["sensor_0", "flat"], method="mad")
+
+    sensor = result["outliers_by_column"]["sensor_0"]
+    assert 40.0 in sensor["outlier_values"] and -35.0 in sensor["outlier_values"]
+    assert sensor["lower_bound"] < -3 and sensor["upper_bound"] > 3
+    # A constant column has a MAD of 0 and falls back to the mean absolute deviation
+    flat = result["outliers_by_column"]["flat"]
+    assert flat["outlier_values"] == [9.0]
+
+
+def test_isolation_scores_whole_rows():
+    result = detect_outliers(".", "sensors", ["sensor_2", "sensor_3", "sensor_4"], method="isolation")
+
+    isolation = result["isolation"]
+    assert result["method"] == "isolation"
+    assert "outliers_by_column" not in result
+    assert result["total_outliers"] == isolation["outlier_count"]
+    rows = {entry["row"] for entry in isolation["outlier_rows"]}
+    assert set(range(15)) <= rows
+    scores = [entry["outlier_score"] for entry in isolation["outlier_rows"]]
+    assert scores == sorted(scores, reverse=True)
+    assert scores[-1] >= outlier_scoring.ISOLATION_THRESHOLD
+
+    # Scoring is deterministic and does not depend on the chunk size
+    frame = loaded_datasets["sensors"][["sensor_1", "sensor_2"]]
+    whole = outlier_scoring.isolation_scores(frame, np.zeros(2), n_trees=20)
+    chunked = outlier_scoring.isolation_scores(frame, np.zeros(2), n_trees=20, chunk_cells=500)
+    np.testing.assert_array_equal(whole, chunked)
+
+
+def test_unknown_method_is_rejected():
+    assert "Unsupported method" in detect_outliers(".", "sensors", method="dbscan")["error"]
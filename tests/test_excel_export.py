@@ -0,0 +1,90 @@
+"""Tests for bulk export of loaded datasets to Excel."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from staffer.functions.analytics.models.schemas import DatasetManager, loaded_datasets
+from staffer.functions.analytics.tools.export_dataset_to_excel_tool import export_dataset_to_excel
+from staffer.functions.excel.data import write_dataframe
+from staffer.functions.excel.exceptions import DataError
+
+
+@pytest.fixture(autouse=True)
+def sales():
+    loaded_datasets["sales"] = pd.DataFrame({
+        "order_id": np.arange(1, 2501),
+        "region": ["north", "south", None, "east", "west"] * 500,
+        "amount": [1.5, np.nan, 3.0, 4.25, 5.0] * 500,
+        "ordered_at": pd.date_range("2024-01-01", periods=2500, freq="h", tz="UTC"),
+    })
+    yield loaded_datasets["sales"]
+    DatasetManager.clear_all_datasets()
+
+
+def test_new_workbook_is_streamed_with_styled_header_and_table(tmp_path, sales):
+    result = export_dataset_to_excel(str(tmp_path), "sales", "out/sales.xlsx", as_table=True)
+
+    assert result["status"] == "success"
+    assert result["mode"] == "write_only"
+    assert result["range"] == "A1:D2501"
+    assert result["table_name"] == "sales"
+
+    ws = load_workbook(tmp_path / "out" / "sales.xlsx")["Data"]
+    assert [cell.value for cell in ws[1]] == ["order_id", "region", "amount", "ordered_at"]
+    assert ws["A1"].font.b
+    assert ws.freeze_panes == "A2"
+    assert ws.tables["sales"].ref == "A1:D2501"
+    # Missing values are empty cells and timezones are dropped
+    assert [cell.value for cell in ws[3]][:3] == [2, "south", None]
+    assert ws["C4"].value == 3.0 and ws["B4"].value is None
+    assert ws["D2"].value == sales["ordered_at"].iloc[0].tz_localize(None).to_pydatetime()
+    assert ws.max_row == 2501
+
+
+def test_chunked_rows_match_unchunked(tmp_path, sales):
+    write_dataframe(tmp_path / "a.xlsx", sales, chunk_size=7)
+    write_dataframe(tmp_path / "b.xlsx", sales)
+
+    rows_a = list(load_workbook(tmp_path / "a.xlsx")["Data"].iter_rows(values_only=True))
+    rows_b = list(load_workbook(tmp_path / "b.xlsx")["Data"].iter_rows(values_only=True))
+    assert rows_a == rows_b
+
+
+def test_adds_sheet_to_existing_workbook(tmp_path):
+    wb = Workbook()
+    wb.active.title = "Notes"
+    wb.active["A1"] = "keep me"
+    wb.save(tmp_path / "book.xlsx")
+
+    result = export_dataset_to_excel(str(tmp_path), "sales", "book.xlsx", sheet_name="Sales",
+                                     columns=["region", "amount"], style_header=False)
+
+    assert result["mode"] == "append"
+    wb = load_workbook(tmp_path / "book.xlsx")
+    assert wb.sheetnames == ["Notes", "Sales"]
+    assert wb["Notes"]["A1"].value == "keep me"
+    assert [cell.value for cell in wb["Sales"][1]] == ["region", "amount"]
+
+    again = export_dataset_to_excel(str(tmp_path), "sales", "book.xlsx", sheet_name="Sales")
+    assert "already exists" in again["error"]
+    assert export_dataset_to_excel(str(tmp_path), "sales", "book.xlsx", sheet_name="Sales",
+                                   replace_sheet=True)["status"] == "success"
+
+
+def test_result_index_is_written_as_columns(tmp_path, sales):
+    summary = sales.groupby("region")["amount"].sum()
+
+    result = write_dataframe(tmp_path / "summary.xlsx", summary.to_frame())
+
+    assert result["columns"] == ["region", "amount"]
+
+
+def test_rejects_bad_requests(tmp_path):
+    assert "outside" in export_dataset_to_excel(str(tmp_path), "sales", "../escape.xlsx")["error"]
+    assert "not loaded" in export_dataset_to_excel(str(tmp_path), "nope", "x.xlsx")["error"]
+    assert ".xlsx" in export_dataset_to_excel(str(tmp_path), "sales", "x.csv")["error"]
+
+    with pytest.raises(DataError, match="No columns"):
+        write_dataframe(tmp_path / "empty.xlsx", pd.DataFrame())
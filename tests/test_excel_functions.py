@@ -1702,4 +1702,67 @@ class TestCreatePivotTable:
             response = result.parts[0].function_response.response["result"]
             
             # Should fail gracefully
-            assert "Error:" in response
\ No newline at end of file
+            assert "Error:" in response
+
+    def test_create_pivot_table_aggregates_by_rows_and_columns(self):
+        """Test pivot values with column fields against a direct computation."""
+        from openpyxl import Workbook, load_workbook
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            wb = Workbook()
+            ws = wb.active
+            ws.title = "Sales"
+            ws.append(["Region", "Product", "Quarter", "Revenue"])
+            for i in range(3000):
+                ws.append([["North", "South", "East"][i % 3], ["A", "B"][i % 2], f"Q{i % 4 + 1}", i])
+            wb.save(os.path.join(temp_dir, "sales.xlsx"))
+
+            fc = function_call("create_pivot_table", {
+                "filepath": "sales.xlsx",
+                "sheet_name": "Sales",
+                "data_range": "A1:D3001",
+                "pivot_sheet_name": "Pivot",
+                "row_fields": ["Region", "Product"],
+                "column_fields": ["Quarter"],
+                "value_fields": ["Revenue"]
+            })
+            response = call_function(fc.parts[0].function_call, temp_dir).parts[0].function_response.response["result"]
+
+            assert response.startswith("Pivot table created in sheet 'Pivot'")
+            pivot = list(load_workbook(os.path.join(temp_dir, "sales.xlsx"))["Pivot"].values)
+            assert pivot[0] == ("Region", "Product", "Revenue (sum) - Q1", "Revenue (sum) - Q2",
+                                "Revenue (sum) - Q3", "Revenue (sum) - Q4")
+            # Only combinations present in the data are written, sorted by label
+            assert [row[:2] for row in pivot[1:]] == [
+                ("East", "A"), ("East", "B"), ("North", "A"), ("North", "B"), ("South", "A"), ("South", "B")
+            ]
+            expected = sum(i for i in range(3000) if i % 3 == 0 and i % 2 == 0 and i % 4 == 0)
+            assert pivot[3][2] == expected
+            # North/A rows are i % 6 == 0, which never fall in Q2 or Q4
+            assert pivot[3][3] == 0
+
+    def test_create_pivot_table_average_ignores_text_values(self):
+        """Test that non-numeric cells are skipped by the aggregation."""
+        from openpyxl import Workbook, load_workbook
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            wb = Workbook()
+            ws = wb.active
+            for row in [["Team", "Score"], ["red", 10], ["red", "n/a"], ["red", 20], ["blue", "-"]]:
+                ws.append(row)
+            wb.save(os.path.join(temp_dir, "scores.xlsx"))
+
+            fc = function_call("create_pivot_table", {
+                "filepath": "scores.xlsx",
+                "sheet_name": "Sheet",
+                "data_range": "A1:B5",
+                "pivot_sheet_name": "Pivot",
+                "row_fields": ["Team"],
+                "column_fields": [],
+                "value_fields": ["Score"],
+                "agg_func": "average"
+            })
+            call_function(fc.parts[0].function_call, temp_dir)
+
+            pivot = list(load_workbook(os.path.join(temp_dir, "scores.xlsx"))["Pivot"].values)
+            assert pivot == [("Team", "Score (average)"), ("blue", 0), ("red", 15)]
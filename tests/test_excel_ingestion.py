@@ -0,0 +1,156 @@
+"""Tests for loading .xlsx sheets directly into datasets."""
+
+from datetime import datetime
+
+import pytest
+from openpyxl import Workbook
+
+from staffer.functions.analytics.models.excel_ingest import detect_header_row, read_excel_dataset
+from staffer.functions.analytics.models.schemas import DatasetManager, loaded_datasets, dataset_schemas
+from staffer.functions.analytics.tools.load_dataset_tool import load_dataset
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    cache = tmp_path / "cache"
+    monkeypatch.setenv("DATASET_CACHE_DIR", str(cache))
+    yield cache
+    DatasetManager.clear_all_datasets()
+
+
+@pytest.fixture
+def report(tmp_path):
+    """A report sheet with a title block above the table, plus a second sheet."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Report"
+    ws.append(["Quarterly sales report"])
+    ws.append([])
+    ws.append(["Generated 2024-05-01"])
+    ws.append(["region", "units", "price", "launched", "code", "active"])
+    for i in range(40):
+        ws.append([
+            ["north", "south"][i % 2],
+            i if i % 7 else "N/A",
+            f"{i}.5",
+            datetime(2024, 1, 1 + i % 20),
+            ["A1", 5][i % 2],
+            i % 2 == 0,
+        ])
+    other = wb.create_sheet("Targets")
+    other.append(["region", "target"])
+    other.append(["north", 100])
+    other.append(["south", 80])
+    path = tmp_path / "report.xlsx"
+    wb.save(path)
+    return path
+
+
+def test_header_is_found_below_title_rows():
+    rows = [["Sales report", None, None], [None, None, None], ["a", "b", "c"], [1, 2, 3]]
+
+    assert detect_header_row(rows) == 2
+    assert detect_header_row([[1, 2, 3], ["x", "y", "z"]]) is None
+
+
+def test_sheet_is_read_with_inferred_dtypes(report):
+    df, details = read_excel_dataset(str(report))
+
+    assert details["sheet_name"] == "Report"
+    assert details["has_header"] is True
+    assert list(df.columns) == ["region", "units", "price", "launched", "code", "active"]
+    assert len(df) == 40
+    # "N/A" markers become missing values of a numeric column
+    assert str(df["units"].dtype) == "float64"
+    assert df["units"].isna().sum() == 6
+    assert df["price"].sum() == pytest.approx(sum(i + 0.5 for i in range(40)))
+    assert str(df["launched"].dtype).startswith("datetime64")
+    assert str(df["active"].dtype) == "bool"
+    # Mixed text and numbers stay text
+    assert df["code"].tolist()[:2] == ["A1", "5"]
+
+
+def test_zero_padded_codes_stay_text(tmp_path):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["zip", "sku", "account", "amount"])
+    ws.append(["02139", "007", "4111111111111111", "12"])
+    ws.append(["94105", "120", "4000056655665556", "N/A"])
+    ws.append(["10001", "042", "5555555555554444", "7.5"])
+    path = tmp_path / "codes.xlsx"
+    wb.save(path)
+
+    df, _ = read_excel_dataset(str(path))
+
+    assert df["zip"].tolist() == ["02139", "94105", "10001"]
+    assert df["sku"].tolist() == ["007", "120", "042"]
+    assert df["account"].tolist()[0] == "4111111111111111"
+    # Plain numbers stored as text still become numeric
+    assert str(df["amount"].dtype) == "float64"
+
+
+def test_only_text_with_a_year_becomes_dates(tmp_path):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["month", "rank", "time", "day"])
+    ws.append(["Jan", "1st", "10:30", "2024-03-01"])
+    ws.append(["Feb", "2nd", "11:00", "Mar 5 2024"])
+    ws.append(["Mar", "3rd", "12:15", "03/06/24"])
+    path = tmp_path / "labels.xlsx"
+    wb.save(path)
+
+    df, _ = read_excel_dataset(str(path))
+
+    assert df["month"].tolist() == ["Jan", "Feb", "Mar"]
+    assert df["rank"].tolist() == ["1st", "2nd", "3rd"]
+    assert df["time"].tolist() == ["10:30", "11:00", "12:15"]
+    assert str(df["day"].dtype).startswith("datetime64")
+    assert df["day"].iloc[1] == datetime(2024, 3, 5)
+
+
+def test_range_and_explicit_header(report):
+    df, details = read_excel_dataset(str(report), cell_range="B5:C8", header_row=0)
+
+    assert details["has_header"] is False
+    assert list(df.columns) == ["column_1", "column_2"]
+    assert df["column_2"].tolist() == [0.5, 1.5, 2.5, 3.5]
+
+    df, _ = read_excel_dataset(str(report), cell_range="A1:C10", header_row=4)
+    assert list(df.columns) == ["region", "units", "price"]
+    assert len(df) == 6
+
+
+def test_load_dataset_picks_sheet_and_caches_each_part(report):
+    first = DatasetManager.load_dataset(str(report), "targets", sheet_name="Targets")
+
+    assert first["format"] == "excel"
+    assert first["cache_hit"] is False
+    assert first["excel"]["sheet_name"] == "Targets"
+    assert loaded_datasets["targets"]["target"].tolist() == [100, 80]
+    assert "region" in dataset_schemas["targets"].columns
+
+    sales = DatasetManager.load_dataset(str(report), "sales")
+    assert sales["cache_hit"] is False
+    assert sales["rows"] == 40
+
+    again = DatasetManager.load_dataset(str(report), "targets_again", sheet_name="Targets")
+    assert again["cache_hit"] is True
+    assert loaded_datasets["targets_again"].equals(loaded_datasets["targets"])
+
+
+def test_excel_options_rejected_for_csv(tmp_path):
+    path = tmp_path / "orders.csv"
+    path.write_text("a,b\n1,2\n")
+
+    with pytest.raises(ValueError, match="Excel files only"):
+        DatasetManager.load_dataset(str(path), "orders", sheet_name="Sheet1")
+
+
+def test_tool_loads_excel_file(report):
+    result = load_dataset(str(report.parent), str(report), "targets", sheet_name="Targets", use_cache=False)
+
+    assert result["status"] == "loaded"
+    assert result["columns"] == ["region", "target"]
+
+    missing = load_dataset(str(report.parent), str(report), "nope", sheet_name="Missing", use_cache=False)
+    assert missing["status"] == "error"
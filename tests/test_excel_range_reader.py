@@ -0,0 +1,137 @@
+"""Tests for the streaming Excel range reader in excel/data.py."""
+
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.datavalidation import DataValidation
+
+from staffer.functions.excel import cell_validation
+from staffer.functions.excel.cell_validation import ValidationIndex, get_data_validation_for_cell
+from staffer.functions.excel.data import (
+    iter_excel_range, read_excel_range, read_excel_range_as_dataframe, read_excel_range_with_metadata
+)
+from staffer.functions.excel.exceptions import DataError
+from staffer.functions.excel.worksheets.read_data_from_excel import read_data_from_excel
+
+
+@pytest.fixture
+def sheet(tmp_path):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Data"
+    ws.append(["id", "region", "amount", "when"])
+    for i in range(1, 251):
+        ws.append([i, ["north", "south"][i % 2], i * 1.5, datetime(2024, 1, 1 + i % 28)])
+    ws.append([None, None, None, None])
+    ws.append([251, "east", None, None])
+    path = tmp_path / "export.xlsx"
+    wb.save(path)
+    return path
+
+
+def test_read_range_returns_values_and_skips_empty_rows(sheet):
+    rows = read_excel_range(sheet, "Data")
+
+    assert rows[0] == ["id", "region", "amount", "when"]
+    assert rows[1] == [1, "south", 1.5, datetime(2024, 1, 2)]
+    assert rows[-1] == [251, "east", None, None]
+    assert len(rows) == 252
+
+
+def test_read_range_is_bounded(sheet):
+    assert read_excel_range(sheet, "Data", "B3", "C4") == [["north", 3.0], ["south", 4.5]]
+    assert read_excel_range(sheet, "Data", "A1:B2") == [["id", "region"], [1, "south"]]
+    assert len(read_excel_range(sheet, "Data", preview_only=True)) == 10
+
+
+def test_rows_stream_in_chunks(sheet):
+    chunks = list(iter_excel_range(sheet, "Data", chunk_size=100))
+
+    assert [len(chunk) for chunk in chunks] == [100, 100, 52]
+
+
+def test_range_straight_into_dataframe(sheet):
+    df = read_excel_range_as_dataframe(sheet, "Data", chunk_size=64)
+
+    assert list(df.columns) == ["id", "region", "amount", "when"]
+    assert len(df) == 251
+    assert df["amount"].sum() == pytest.approx(1.5 * sum(range(1, 251)))
+    assert df["when"].iloc[0] == datetime(2024, 1, 2)
+
+
+def test_read_data_tool_streams_rows_up_to_cap(sheet):
+    read = lambda **kwargs: json.loads(read_data_from_excel(str(sheet.parent), sheet.name, "Data", **kwargs))
+
+    first = read(max_rows=100)
+    assert first["rows"] == 100 and first["truncated"] is True
+    assert first["data"][1] == [1, "south", 1.5, "2024-01-02 00:00:00"]
+    assert first["next_start_cell"] == "A101"
+
+    rest = read(start_cell="A101", max_rows=500)
+    assert "truncated" not in rest
+    # Empty rows are kept so rows line up with the sheet
+    assert rest["data"][-2:] == [[None, None, None, None], [251, "east", None, None]]
+    assert first["rows"] + rest["rows"] == 253
+    # A null max_rows from the model means the default cap
+    assert read(max_rows=None)["rows"] == 253
+
+
+def test_missing_sheet_raises(sheet):
+    with pytest.raises(DataError, match="not found"):
+        read_excel_range(sheet, "Nope")
+
+
+@pytest.fixture
+def form(tmp_path):
+    """A form sheet with overlapping list and number validations."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Form"
+    for i in range(1, 4):
+        ws[f"H{i}"] = f"option {i}"
+    ws["F12"] = "last"
+    rules = [
+        DataValidation(type="list", formula1="$H$1:$H$3", prompt="Pick one"),
+        DataValidation(type="whole", operator="between", formula1="0", formula2="10"),
+        DataValidation(type="list", formula1='"yes,no"'),
+    ]
+    rules[0].add("A1:B10")
+    rules[0].add("D5:D6")
+    rules[1].add("B5:C12")
+    rules[2].add("A3:F4")
+    for rule in rules:
+        ws.add_data_validation(rule)
+    path = tmp_path / "form.xlsx"
+    wb.save(path)
+    return path, ws
+
+
+def test_validation_index_matches_linear_lookup(form):
+    _, ws = form
+    index = ValidationIndex(ws)
+
+    for row in range(1, 14):
+        for col in range(1, 9):
+            address = f"{get_column_letter(col)}{row}"
+            assert index.get_validation(row, col, address) == get_data_validation_for_cell(ws, address)
+
+
+def test_metadata_read_resolves_each_list_once(form):
+    path, _ = form
+
+    with patch.object(cell_validation, "_extract_list_values", wraps=cell_validation._extract_list_values) as resolve:
+        data = read_excel_range_with_metadata(path, "Form", "A1", "F12")
+
+    assert resolve.call_count == 2
+    cells = {cell["address"]: cell for cell in data["cells"]}
+    assert cells["A1"]["validation"]["allowed_values"] == ["option 1", "option 2", "option 3"]
+    assert cells["A1"]["validation"]["cell"] == "A1"
+    # The first rule covering a cell wins
+    assert cells["B5"]["validation"]["validation_type"] == "list"
+    assert cells["C5"]["validation"]["formula2"] == "10"
+    assert cells["E3"]["validation"]["allowed_values"] == ["yes", "no"]
+    assert cells["E1"]["validation"] == {"has_validation": False}
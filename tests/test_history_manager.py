@@ -0,0 +1,130 @@
+"""Tests for token-budgeted conversation history."""
+
+from pathlib import Path
+
+from google.genai import types
+
+from staffer.history import COMPACTED_NOTE, HistoryManager, digest, estimate_tokens
+from staffer.main import prune_stale_dir_msgs
+
+
+def user(text):
+    return types.Content(role="user", parts=[types.Part(text=text)])
+
+
+def model_call(name, **args):
+    return types.Content(role="model", parts=[types.Part(function_call=types.FunctionCall(name=name, args=args))])
+
+
+def tool(name, result):
+    return types.Content(role="tool", parts=[types.Part(function_response=types.FunctionResponse(
+        name=name, response={"result": result}
+    ))])
+
+
+def model_text(text):
+    return types.Content(role="model", parts=[types.Part(text=text)])
+
+
+def correlation_turn(i, columns=40):
+    matrix = {f"col_{a}": {f"col_{b}": 0.5 for b in range(columns)} for a in range(columns)}
+    return [
+        user(f"Question {i}"),
+        model_call("find_correlations", dataset_name="sales"),
+        tool("find_correlations", {"dataset": "sales", "strong_count": 3, "correlation_matrix": matrix}),
+        model_text(f"Answer {i}"),
+    ]
+
+
+def test_history_under_budget_is_unchanged():
+    manager = HistoryManager(token_budget=10_000)
+    messages = correlation_turn(0, columns=3)
+
+    fitted = manager.fit(messages)
+
+    assert all(a is b for a, b in zip(fitted, messages))
+    assert manager.last_stats["messages_compacted"] == 0
+
+
+def test_old_bulky_tool_results_are_digested():
+    manager = HistoryManager(token_budget=8_000, recent_turns=1)
+    messages = correlation_turn(0) + correlation_turn(1)
+
+    fitted = manager.fit(messages)
+
+    old_response = fitted[2].parts[0].function_response.response
+    assert old_response["compacted"] == COMPACTED_NOTE
+    assert old_response["result"]["strong_count"] == 3
+    assert old_response["result"]["correlation_matrix"] == "<40 keys elided>"
+    # The most recent turn is kept verbatim
+    assert fitted[4:] == messages[4:]
+    assert fitted[6] is messages[6]
+    assert manager.last_stats["tokens_after"] < manager.last_stats["tokens_before"]
+
+
+def test_oldest_turns_are_dropped_when_digests_are_not_enough():
+    manager = HistoryManager(token_budget=300, recent_turns=1)
+    messages = []
+    for i in range(5):
+        messages += [user(f"Question {i} " + "x" * 400), model_text(f"Answer {i}")]
+
+    fitted = manager.fit(messages)
+
+    assert fitted[0].role == "user"
+    assert fitted[-1].parts[0].text == "Answer 4"
+    assert manager.last_stats["messages_dropped"] > 0
+    assert sum(estimate_tokens(m) for m in fitted) <= 300
+
+
+def test_prompt_tokens_stay_flat_over_long_sessions():
+    manager = HistoryManager(token_budget=20_000, recent_turns=2)
+    history = []
+    sizes = []
+    for i in range(40):
+        history = manager.fit(history + correlation_turn(i))
+        sizes.append(manager.last_stats["tokens_after"])
+
+    # Forty full correlation turns would be ~240k tokens without compaction
+    assert max(sizes) <= 20_000
+
+
+def test_compaction_is_stable_across_fits():
+    manager = HistoryManager(token_budget=8_000, recent_turns=1)
+    fitted = manager.fit(correlation_turn(0) + correlation_turn(1))
+
+    refitted = manager.fit(fitted)
+
+    assert all(a is b for a, b in zip(refitted, fitted))
+    assert manager.last_stats["messages_compacted"] == 0
+
+
+def test_large_function_call_args_are_digested():
+    manager = HistoryManager(token_budget=500, recent_turns=1)
+    messages = [
+        user("write it"), model_call("write_file", file_path="a.py", content="print(1)\n" * 500),
+        tool("write_file", "ok"), user("thanks"), model_text("done"),
+    ]
+
+    fitted = manager.fit(messages)
+
+    args = fitted[1].parts[0].function_call.args
+    assert args["file_path"] == "a.py"
+    assert args["content"].endswith("more chars)")
+
+
+def test_digest_keeps_scalars_and_elides_bulk():
+    value = {"status": "ok", "rows": 10, "values": list(range(100)), "text": "a" * 500}
+
+    condensed = digest(value)
+
+    assert condensed["status"] == "ok"
+    assert condensed["rows"] == 10
+    assert condensed["values"] == [0, 1, 2, "... 97 more items"]
+    assert condensed["text"].startswith("a" * 200)
+    assert digest(condensed) == condensed
+
+
+def test_prune_no_longer_caps_message_count_by_default():
+    messages = [user(f"Message {i}") for i in range(150)]
+
+    assert len(prune_stale_dir_msgs(messages, Path("/test/dir"))) == 150
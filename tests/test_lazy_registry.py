@@ -0,0 +1,96 @@
+"""Tests for lazy function registration and the CLI cold-start budget."""
+
+import json
+import os
+import subprocess
+import sys
+
+from staffer.function_registries import all_functions, all_schemas
+from staffer.function_registries.file_ops_registry import file_ops_entries
+from staffer.function_registries.excel_registry import excel_entries
+from staffer.function_registries.analytics_registry import analytics_entries
+from staffer.function_registries.lazy import LazyFunctionMap, _catalog, build_catalog
+
+
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl", "plotly", "scipy")
+
+# Import cost of staffer.main on top of google-genai itself, in milliseconds
+IMPORT_BUDGET_MS = float(os.environ.get("AACLI_IMPORT_BUDGET_MS", "300"))
+
+
+def run_python(code):
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_startup_imports_no_heavy_modules():
+    loaded = run_python(
+        "import json, sys\n"
+        "import staffer.main\n"
+        "from staffer.available_functions import get_available_functions\n"
+        "get_available_functions('.')\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+
+    assert loaded == []
+
+
+def test_import_time_within_budget():
+    elapsed_ms = run_python(
+        "import json, time\n"
+        "import google.genai, google.genai.types\n"
+        "start = time.perf_counter()\n"
+        "import staffer.main\n"
+        "print(json.dumps((time.perf_counter() - start) * 1000))"
+    )
+
+    assert elapsed_ms < IMPORT_BUDGET_MS, f"staffer.main import took {elapsed_ms:.0f} ms"
+
+
+def test_file_ops_call_does_not_load_analytics():
+    loaded = run_python(
+        "import json, sys\n"
+        "from google.genai.types import FunctionCall\n"
+        "from staffer.available_functions import call_function\n"
+        "call_function(FunctionCall(name='get_working_directory', args={}), '.')\n"
+        "print(json.dumps([m for m in sys.modules if m.startswith('staffer.functions.analytics')]))"
+    )
+
+    assert loaded == []
+
+
+def test_catalog_matches_schema_objects():
+    entries = {**file_ops_entries, **excel_entries, **analytics_entries}
+
+    assert build_catalog(entries) == _catalog(), (
+        "declarations.json is stale; run python -m staffer.function_registries.build_declarations"
+    )
+
+
+def test_declarations_cover_every_function():
+    assert [schema.name for schema in all_schemas] == list(all_functions)
+
+
+def test_implementation_imported_on_first_access():
+    functions = LazyFunctionMap({
+        "get_working_directory": (
+            "..functions.file_ops.get_working_directory", "get_working_directory", "schema_get_working_directory"
+        ),
+    })
+    assert not functions.is_loaded("get_working_directory")
+
+    assert callable(functions["get_working_directory"])
+    assert functions.is_loaded("get_working_directory")
+
+
+def test_overrides_and_removal():
+    functions = LazyFunctionMap.combine(LazyFunctionMap({"a": ("x", "y", "z")}), LazyFunctionMap({}))
+    functions["b"] = len
+
+    assert set(functions) == {"a", "b"}
+    assert functions["b"] is len
+
+    del functions["a"]
+    assert "a" not in functions
+    assert len(functions) == 1
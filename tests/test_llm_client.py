@@ -0,0 +1,68 @@
+"""Tests for the process-wide LLM client cache."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from staffer import llm
+
+
+@pytest.fixture
+def counting_factory():
+    original_factory = llm._client_factory
+    created = []
+
+    def factory():
+        created.append(object())
+        return created[-1]
+
+    llm.set_client_factory(factory)
+    yield created
+    llm.set_client_factory(original_factory)
+
+
+def test_client_is_reused_across_calls(counting_factory):
+    assert llm.get_client() is llm.get_client()
+    assert len(counting_factory) == 1
+
+
+def test_concurrent_callers_share_one_client(counting_factory):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(lambda _: llm.get_client(), range(32)))
+
+    assert len(counting_factory) == 1
+    assert all(client is clients[0] for client in clients)
+
+
+def test_replacing_factory_replaces_client(counting_factory, monkeypatch):
+    first = llm.get_client()
+
+    monkeypatch.setattr(llm, "_client_factory", lambda: "fake")
+    assert llm.get_client() == "fake"
+
+    monkeypatch.undo()
+    assert llm.get_client() is not first
+    assert len(counting_factory) == 2
+
+
+def test_reset_client(counting_factory):
+    first = llm.get_client()
+    llm.reset_client()
+
+    assert llm.get_client() is not first
+
+
+def test_fake_llm_fixture_is_honoured(fake_llm):
+    assert llm.get_client() is fake_llm
+
+
+def test_default_client_uses_pool_limits(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setenv("LLM_MAX_CONNECTIONS", "4")
+    monkeypatch.setenv("LLM_KEEPALIVE_SECONDS", "30")
+
+    client = llm._default_client_factory()
+
+    pool = client._api_client._httpx_client._transport._pool
+    assert pool._max_connections == 4
+    assert pool._keepalive_expiry == 30.0
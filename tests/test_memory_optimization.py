@@ -0,0 +1,102 @@
+"""Tests for dtype optimization on load and apply_memory_optimizations."""
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from staffer.functions.analytics.models.memory_optimizer import optimize_dataframe, convert_series
+from staffer.functions.analytics.models.schemas import DatasetManager, loaded_datasets, dataset_schemas
+from staffer.functions.analytics.tools.apply_memory_optimizations_tool import apply_memory_optimizations
+from staffer.functions.analytics.tools.memory_optimization_report_tool import memory_optimization_report
+from staffer.functions.analytics.tools.load_dataset_tool import load_dataset
+
+
+@pytest.fixture
+def sales_df():
+    n = 2000
+    return pd.DataFrame({
+        "quantity": np.arange(n) % 100,
+        "delta": (np.arange(n) % 200) - 100,
+        "price": np.round(np.arange(n) * 0.5, 1),
+        "precise": np.arange(n) / 3.0,
+        "region": pd.Series(["North", "South", "East", "West"] * (n // 4), dtype=object),
+        "order_ref": pd.Series([f"ORD-{i:06d}" for i in range(n)], dtype=object),
+    })
+
+
+@pytest.fixture
+def clear_datasets():
+    yield
+    DatasetManager.clear_all_datasets()
+
+
+def test_integers_are_downcast(sales_df):
+    assert convert_series(sales_df["quantity"]).dtype == np.uint8
+    assert convert_series(sales_df["delta"]).dtype == np.int8
+
+
+def test_floats_only_downcast_when_lossless(sales_df):
+    assert convert_series(sales_df["price"]).dtype == np.float32
+    assert convert_series(sales_df["precise"]) is None
+
+
+def test_low_cardinality_strings_become_category(sales_df):
+    assert str(convert_series(sales_df["region"]).dtype) == "category"
+
+
+def test_optimize_reports_measured_savings(sales_df):
+    optimized, report = optimize_dataframe(sales_df)
+
+    before = sales_df.memory_usage(deep=True).sum()
+    after = optimized.memory_usage(deep=True).sum()
+    assert report["before_mb"] == round(before / 1024**2, 2)
+    assert report["after_mb"] == round(after / 1024**2, 2)
+    assert after < before
+    assert optimized["precise"].equals(sales_df["precise"])
+    assert (optimized["price"].astype(float) == sales_df["price"]).all()
+    # Original frame is left untouched
+    assert sales_df["quantity"].dtype == np.int64
+
+
+def test_apply_memory_optimizations_updates_store_and_schema(sales_df, clear_datasets):
+    loaded_datasets["sales"] = sales_df
+    from staffer.functions.analytics.models.schemas import DatasetSchema
+    dataset_schemas["sales"] = DatasetSchema.from_dataframe(sales_df, "sales")
+
+    result = apply_memory_optimizations("/tmp", "sales")
+
+    assert result["status"] == "success"
+    assert result["memory_usage"]["saved_mb"] >= 0
+    assert str(loaded_datasets["sales"]["region"].dtype) == "category"
+    assert dataset_schemas["sales"].columns["quantity"].dtype == "uint8"
+
+
+def test_apply_memory_optimizations_unknown_column(sales_df, clear_datasets):
+    loaded_datasets["sales"] = sales_df
+
+    result = apply_memory_optimizations("/tmp", "sales", columns=["missing"])
+
+    assert "error" in result
+
+
+def test_report_is_measured(sales_df, clear_datasets):
+    loaded_datasets["sales"] = sales_df
+
+    report = memory_optimization_report("/tmp", "sales")
+    _, applied = optimize_dataframe(sales_df)
+
+    assert report["measured"] is True
+    suggested = {s["column"] for s in report["optimization_suggestions"]}
+    assert suggested == {c["column"] for c in applied["conversions"]}
+
+
+def test_load_dataset_optimize(tmp_path, monkeypatch, sales_df, clear_datasets):
+    monkeypatch.setenv("DATASET_CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "sales.csv"
+    sales_df.to_csv(path, index=False)
+
+    result = load_dataset(str(tmp_path), str(path), "sales", optimize=True)
+
+    assert result["status"] == "loaded"
+    assert result["optimization"]["saved_mb"] >= 0
+    assert loaded_datasets["sales"]["quantity"].dtype == np.uint8
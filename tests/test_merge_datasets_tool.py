@@ -0,0 +1,52 @@
+"""Tests for merge_datasets tool."""
+
+import pandas as pd
+
+from staffer.functions.analytics.models.schemas import DatasetManager, loaded_datasets
+from staffer.functions.analytics.tools.merge_datasets_tool import merge_datasets
+
+
+def setup_function():
+    loaded_datasets["orders"] = pd.DataFrame({"customer_id": [1, 2, 3], "amount": [10.0, 20.0, 30.0], "note": ["a", "b", "c"]})
+    loaded_datasets["customers"] = pd.DataFrame({"customer_id": [1, 2], "name": ["Ann", "Bo"], "city": ["X", "Y"]})
+    loaded_datasets["more_orders"] = pd.DataFrame({"customer_id": [4], "amount": [40.0]})
+    loaded_datasets["late_orders"] = pd.DataFrame({"customer_id": [5], "amount": [50.0], "late": [True]})
+
+
+def teardown_function():
+    DatasetManager.clear_all_datasets()
+
+
+def test_join_with_projected_columns():
+    result = merge_datasets(".", [
+        {"dataset_name": "orders", "columns": ["amount"]},
+        {"dataset_name": "customers", "join_column": "customer_id", "columns": ["name"]},
+    ])
+
+    assert result["status"] == "success"
+    assert result["final_columns"] == ["customer_id", "amount", "name"]
+    assert result["final_shape"] == (2, 3)
+    # Sources are left untouched
+    assert list(loaded_datasets["orders"].columns) == ["customer_id", "amount", "note"]
+
+
+def test_consecutive_concatenations_report_each_step():
+    result = merge_datasets(".", [
+        {"dataset_name": "orders"},
+        {"dataset_name": "more_orders"},
+        {"dataset_name": "late_orders"},
+    ])
+
+    merged = loaded_datasets[result["merged_dataset_name"]]
+    assert merged["amount"].tolist() == [10.0, 20.0, 30.0, 40.0, 50.0]
+    assert [step["after_shape"] for step in result["merge_steps"]] == [(4, 3), (5, 4)]
+    assert result["final_shape"] == (5, 4)
+
+
+def test_unknown_projection_column_is_an_error():
+    result = merge_datasets(".", [
+        {"dataset_name": "orders", "columns": ["nope"]},
+        {"dataset_name": "customers", "join_column": "customer_id"},
+    ])
+
+    assert "not found" in result["error"]
@@ -0,0 +1,105 @@
+"""Tests for concurrent execution of function calls from one model turn."""
+
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+from google.genai import types
+from google.genai.types import FunctionCall
+
+from staffer.main import execute_function_calls, process_prompt
+
+
+class RecordingCaller:
+    """Fake call_function that records overlap between calls."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.events = []
+
+    def __call__(self, function_call, working_directory, verbose=False):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.events.append(("start", function_call.name))
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+            self.events.append(("end", function_call.name))
+        return types.Content(role="tool", parts=[
+            types.Part.from_function_response(name=function_call.name, response={"result": function_call.name})
+        ])
+
+
+def calls(*names):
+    return [FunctionCall(name=name, args={"dataset_name": "sales"}) for name in names]
+
+
+def test_read_only_calls_run_concurrently_in_order():
+    caller = RecordingCaller()
+    names = ["find_correlations", "detect_outliers", "segment_by_column", "get_dataset_summary"]
+
+    with patch("staffer.main.call_function", caller):
+        start = time.perf_counter()
+        results = execute_function_calls(calls(*names), "/tmp")
+        elapsed = time.perf_counter() - start
+
+    assert [r.parts[0].function_response.name for r in results] == names
+    assert caller.max_active == 4
+    assert elapsed < caller.delay * len(names)
+
+
+def test_mutating_calls_are_barriers():
+    caller = RecordingCaller()
+    names = ["find_correlations", "detect_outliers", "load_dataset", "segment_by_column", "get_dataset_summary"]
+
+    with patch("staffer.main.call_function", caller):
+        results = execute_function_calls(calls(*names), "/tmp")
+
+    assert [r.parts[0].function_response.name for r in results] == names
+    load_start = caller.events.index(("start", "load_dataset"))
+    load_end = caller.events.index(("end", "load_dataset"))
+    assert load_end == load_start + 1
+    assert {name for _, name in caller.events[:load_start]} == {"find_correlations", "detect_outliers"}
+
+
+def test_sequential_mode_never_overlaps():
+    caller = RecordingCaller(delay=0.01)
+
+    with patch("staffer.main.call_function", caller):
+        execute_function_calls(calls("find_correlations", "detect_outliers"), "/tmp", parallel=False)
+
+    assert caller.max_active == 1
+
+
+def test_process_prompt_sends_single_tool_message_in_call_order():
+    caller = RecordingCaller(delay=0.01)
+    names = ["detect_outliers", "find_correlations", "get_dataset_summary"]
+
+    function_candidate = MagicMock()
+    function_candidate.content = types.Content(
+        role="model", parts=[types.Part(function_call=call) for call in calls(*names)]
+    )
+    final_candidate = MagicMock()
+    final_candidate.content = types.Content(role="model", parts=[types.Part(text="Done.")])
+
+    responses = []
+    for candidate, text in ((function_candidate, ""), (final_candidate, "Done.")):
+        response = MagicMock()
+        response.candidates = [candidate]
+        response.text = text
+        response.usage_metadata.prompt_token_count = 10
+        response.usage_metadata.candidates_token_count = 5
+        responses.append(response)
+
+    with patch("staffer.main.get_client") as mock_get_client, patch("staffer.main.call_function", caller):
+        mock_get_client.return_value.models.generate_content.side_effect = responses
+        conversation = process_prompt("analyze sales")
+
+    tool_messages = [m for m in conversation if m.role == "tool"]
+    assert len(tool_messages) == 1
+    assert [p.function_response.name for p in tool_messages[0].parts] == names
@@ -0,0 +1,87 @@
+"""Tests for the column profiling engine used by schema discovery."""
+
+import numpy as np
+import pandas as pd
+
+from staffer.functions.analytics.models.profiling import estimate_cardinality, profile_dataframe, profile_series
+from staffer.functions.analytics.models.schemas import DatasetSchema
+
+
+def test_profile_matches_pandas_scans():
+    series = pd.Series([3.0, None, 1.0, 3.0, 7.5, None])
+
+    profile = profile_series(series)
+
+    assert profile["null_count"] == series.isnull().sum()
+    assert profile["unique_values"] == series.nunique()
+    assert profile["sample_values"] == series.dropna().head(3).tolist()
+    assert profile["min_value"] == 1.0
+    assert profile["max_value"] == 7.5
+
+
+def test_sample_values_found_beyond_probe_window():
+    series = pd.Series([None] * 5000 + ["a", "b", "c", "d"])
+
+    assert profile_series(series)["sample_values"] == ["a", "b", "c"]
+
+
+def test_unhashable_values_are_counted():
+    series = pd.Series([[1, 2], [1, 2], [3]])
+
+    assert profile_series(series)["unique_values"] == 2
+    assert profile_series(series, approximate_cardinality=True)["unique_values"] == 2
+    frame = pd.DataFrame({"tags": series, "meta": [{"a": 1}, {"a": 1}, {"b": 2}]})
+    schema = DatasetSchema.from_dataframe(frame, "nested", approximate_cardinality=True)
+    assert schema.columns["meta"].unique_values == 2
+
+
+def test_hyperloglog_estimate_is_close():
+    series = pd.Series(np.arange(200_000) % 50_000)
+
+    estimate = estimate_cardinality(series)
+
+    assert abs(estimate - 50_000) / 50_000 < 0.05
+
+
+def test_hyperloglog_small_cardinality_is_exact_enough():
+    assert estimate_cardinality(pd.Series(["a", "b", "c", "a", None])) == 3
+    assert estimate_cardinality(pd.Series([None, None])) == 0
+
+
+def test_wide_frames_are_profiled_in_parallel_with_same_results():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({f"col_{i}": rng.integers(0, 20, 500) for i in range(12)})
+
+    parallel = profile_dataframe(df, max_workers=4)
+
+    assert list(parallel) == list(df.columns)
+    for col in df.columns:
+        assert parallel[col] == profile_series(df[col])
+
+
+def test_schema_roles_unchanged():
+    df = pd.DataFrame({
+        "order_id": [f"O{i}" for i in range(10)],
+        "region": ["North", "South"] * 5,
+        "amount": np.arange(10) * 1.5,
+        "ordered_at": pd.date_range("2024-01-01", periods=10),
+    })
+
+    schema = DatasetSchema.from_dataframe(df, "orders")
+
+    assert schema.columns["order_id"].suggested_role == "identifier"
+    assert schema.columns["region"].suggested_role == "categorical"
+    assert schema.columns["amount"].suggested_role == "numerical"
+    assert schema.columns["ordered_at"].suggested_role == "temporal"
+    assert schema.columns["amount"].max_value == 13.5
+    assert set(schema.suggested_analyses) == {"segmentation_analysis", "time_series_analysis"}
+
+
+def test_approximate_schema_still_detects_identifiers():
+    df = pd.DataFrame({"event_id": np.arange(100_000).astype(str), "kind": ["a", "b"] * 50_000})
+
+    schema = DatasetSchema.from_dataframe(df, "events", approximate_cardinality=True)
+
+    assert schema.columns["event_id"].approximate_unique is True
+    assert schema.columns["event_id"].suggested_role == "identifier"
+    assert schema.columns["kind"].suggested_role == "categorical"
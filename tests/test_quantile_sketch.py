@@ -0,0 +1,106 @@
+"""Tests for KLL quantile sketches and the exact=False analysis paths."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from staffer.functions.analytics.models.quantile_sketch import QuantileSketch
+from staffer.functions.analytics.models.schemas import DatasetManager, DatasetSchema, dataset_schemas, loaded_datasets
+from staffer.functions.analytics.resources.get_dataset_summary_resource import get_dataset_summary
+from staffer.functions.analytics.tools.analyze_distributions_tool import analyze_distributions
+from staffer.functions.analytics.tools.detect_outliers_tool import detect_outliers
+from staffer.functions.analytics.tools.load_dataset_tool import load_dataset
+
+
+@pytest.fixture
+def values():
+    return np.random.default_rng(3).lognormal(size=400_000)
+
+
+def _rank_errors(sketch, values, qs):
+    ordered = np.sort(values)
+    estimates = np.array(sketch.quantiles(qs))
+    return np.abs(np.searchsorted(ordered, estimates) / len(values) - np.asarray(qs))
+
+
+def teardown_function():
+    DatasetManager.clear_all_datasets()
+
+
+def test_quantiles_are_within_rank_error(values):
+    sketch = QuantileSketch.from_values(values)
+    qs = np.linspace(0.01, 0.99, 99)
+
+    assert sketch.n == len(values)
+    assert sketch.retained < 1000
+    assert _rank_errors(sketch, values, qs).max() <= sketch.rank_error
+    assert sketch.quantiles([0, 1]) == [values.min(), values.max()]
+
+
+def test_merged_sketches_cover_both_parts(values):
+    left = QuantileSketch.from_values(values[:150_000], seed=1)
+    right = QuantileSketch.from_values(values[150_000:], seed=2)
+
+    merged = left.merge(right)
+
+    assert merged.n == len(values)
+    assert _rank_errors(merged, values, [0.1, 0.25, 0.5, 0.75, 0.9]).max() <= merged.rank_error
+
+
+def test_serialized_sketch_answers_the_same(values):
+    sketch = QuantileSketch.from_values(pd.Series(values).where(values < 5))
+    restored = QuantileSketch.from_dict(sketch.to_dict())
+
+    assert sketch.n == int((values < 5).sum())
+    assert restored.quantiles([0.25, 0.5, 0.75]) == sketch.quantiles([0.25, 0.5, 0.75])
+    histogram = restored.histogram(4)
+    assert len(histogram["edges"]) == 5
+    assert sum(histogram["counts"]) == pytest.approx(sketch.n, rel=0.01)
+
+
+def test_sketch_is_built_lazily_and_stored_with_schema():
+    frame = pd.DataFrame({"amount": np.arange(10_000, dtype=float), "label": ["a", "b"] * 5000})
+    loaded_datasets["orders"] = frame
+    dataset_schemas["orders"] = DatasetSchema.from_dataframe(frame, "orders")
+
+    result = analyze_distributions(".", "orders", "amount", exact=False)
+
+    assert result["exact"] is False
+    assert result["quartiles"]["q50"] == pytest.approx(5000, rel=0.02)
+    assert sum(result["histogram"]["counts"]) == pytest.approx(10_000, rel=0.01)
+    assert dataset_schemas["orders"].columns["amount"].quantile_sketch["n"] == 10_000
+    assert dataset_schemas["orders"].columns["label"].quantile_sketch is None
+    assert "quantile_sketch" not in DatasetManager.get_dataset_info("orders")["schema"]["columns"]["amount"]
+
+
+def test_exact_false_matches_exact_answers_closely():
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({"x": rng.normal(size=50_000), "n": rng.integers(0, 1000, 50_000)})
+    loaded_datasets["big"] = frame
+
+    exact = get_dataset_summary(".", "big")["numerical_summary"]
+    sketched = get_dataset_summary(".", "big", exact=False)
+    assert sketched["approximate_quantiles"] is True
+    for col in ("x", "n"):
+        assert sketched["numerical_summary"][col]["count"] == exact[col]["count"]
+        assert sketched["numerical_summary"][col]["max"] == exact[col]["max"]
+        for key in ("25%", "50%", "75%"):
+            rank = (frame[col] <= sketched["numerical_summary"][col][key]).mean()
+            assert abs(rank - float(key[:-1]) / 100) < 0.015
+
+    outliers = detect_outliers(".", "big", ["x"], exact=False)
+    assert outliers["exact"] is False
+    assert outliers["total_outliers"] == pytest.approx(detect_outliers(".", "big", ["x"])["total_outliers"], rel=0.1)
+
+
+def test_sketches_built_on_load_are_cached(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATASET_CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "readings.csv"
+    pd.DataFrame({"value": np.arange(5000) % 97, "site": ["a"] * 5000}).to_csv(path, index=False)
+
+    load_dataset(str(tmp_path), str(path), "readings", quantile_sketches=True)
+    assert dataset_schemas["readings"].columns["value"].quantile_sketch["n"] == 5000
+
+    again = DatasetManager.load_dataset(str(path), "again", quantile_sketches=True)
+    assert again["cache_hit"] is True
+    assert dataset_schemas["again"].columns["value"].quantile_sketch["n"] == 5000
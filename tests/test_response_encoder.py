@@ -0,0 +1,123 @@
+"""Tests for the size-bounded function response encoder."""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from google.genai.types import FunctionCall
+
+from staffer.available_functions import call_function
+from staffer.functions.analytics.models.schemas import DatasetManager, DatasetSchema, loaded_datasets, dataset_schemas
+from staffer import response_encoder
+from staffer.response_encoder import encode_response, json_size, min_json_size, to_jsonable
+
+
+def test_scalars_and_containers():
+    value = {
+        1: np.int64(3), "f": np.float32(1.5), "nan": float("nan"), "inf": np.float64("inf"),
+        "flag": np.bool_(True), "when": pd.Timestamp("2024-01-02"), "nat": pd.NaT, "na": pd.NA,
+        "path": Path("/tmp/x"), "dt": datetime(2024, 1, 2, 3, 4), "nested": [(1, 2), {"a": None}],
+    }
+
+    assert to_jsonable(value) == {
+        "1": 3, "f": 1.5, "nan": None, "inf": None, "flag": True, "when": "2024-01-02T00:00:00",
+        "nat": None, "na": None, "path": "/tmp/x", "dt": "2024-01-02T03:04:00", "nested": [[1, 2], {"a": None}],
+    }
+
+
+def test_series_and_frames_convert_in_bulk():
+    df = pd.DataFrame({
+        "a": [1, 2, None], "b": ["x", "y", "z"], "t": pd.to_datetime(["2024-01-01", None, "2024-01-03"]),
+    })
+
+    records = to_jsonable(df)
+
+    assert records[0]["a"] == 1.0 and records[2]["a"] is None
+    assert records[1]["t"] is None and records[0]["t"].startswith("2024-01-01")
+    assert to_jsonable(np.array([1.0, np.nan])) == [1.0, None]
+    assert to_jsonable(pd.Series([3, 4])) == [3, 4]
+
+
+def test_long_array_becomes_head_tail_sample_with_stats():
+    encoded = encode_response({"values": np.arange(10_000, dtype=float)})
+
+    values = encoded["values"]
+    assert values["truncated"] is True
+    assert values["total_items"] == 10_000
+    assert values["head"][:3] == [0.0, 1.0, 2.0]
+    assert values["tail"][-1] == 9_999.0
+    assert values["summary"] == {"nulls": 0, "min": 0.0, "max": 9_999.0, "mean": 4_999.5}
+
+
+def test_large_record_lists_are_sampled_as_tables():
+    df = pd.DataFrame({"id": range(10_000), "name": [f"customer {i}" for i in range(10_000)]})
+    result = {"dataset_name": "sales", "sample_data": df.to_dict("records")}
+
+    encoded = encode_response(result, max_bytes=20_000)
+
+    sample = encoded["sample_data"]
+    assert encoded["dataset_name"] == "sales"
+    assert sample["truncated"] is True
+    assert sample["total_rows"] == 10_000
+    assert sample["columns"] == ["id", "name"]
+    assert sample["tail"][-1] == {"id": 9_999, "name": "customer 9999"}
+    assert sample["summary"]["id"]["max"] == 9_999
+    assert json_size(encoded) <= 20_000
+
+
+def test_budget_tightens_strings_and_keys():
+    result = {f"key_{i}": "v" * 5_000 for i in range(100)}
+
+    encoded = encode_response(result, max_bytes=8_000)
+
+    assert json_size(encoded) <= 8_000
+    assert "truncated_keys" in encoded
+    assert "[truncated" in encoded["key_0"]
+
+
+def test_small_results_are_untouched():
+    result = {"status": "ok", "rows": [{"a": 1}, {"a": 2}]}
+
+    assert encode_response(result) == result
+
+
+def test_under_budget_long_lists_are_not_sampled():
+    result = {"columns": list(range(300)), "values": np.arange(300)}
+
+    encoded = encode_response(result)
+
+    assert encoded["columns"] == list(range(300))
+    assert encoded["values"] == list(range(300))
+
+
+def test_oversized_results_are_never_encoded_in_full(monkeypatch):
+    df = pd.DataFrame({"id": range(100_000), "value": 1.5})
+    encodes = []
+    original = response_encoder.to_jsonable
+    monkeypatch.setattr(response_encoder, "to_jsonable", lambda obj, *limits: encodes.append(limits) or original(obj, *limits))
+
+    encoded = encode_response({"rows": df, "ids": list(range(100_000))}, max_bytes=48_000)
+
+    assert (None, None, None) not in encodes
+    assert encoded["rows"]["truncated"] is True
+    assert min_json_size(df, 10**9) <= json_size(to_jsonable(df))
+    assert min_json_size(list(range(100_000)), 1_000) < 2_000
+
+
+def test_get_dataset_sample_response_is_bounded():
+    df = pd.DataFrame({"id": range(10_000), "value": np.random.default_rng(0).normal(size=10_000)})
+    loaded_datasets["big"] = df
+    dataset_schemas["big"] = DatasetSchema.from_dataframe(df, "big")
+    try:
+        content = call_function(
+            FunctionCall(name="get_dataset_sample", args={"dataset_name": "big", "n_rows": 10_000}), "."
+        )
+    finally:
+        DatasetManager.clear_all_datasets()
+
+    result = content.parts[0].function_response.response["result"]
+    assert result["sample_size"] == 10_000
+    assert result["sample_data"]["truncated"] is True
+    assert len(json.dumps(result)) <= 48_000
@@ -0,0 +1,100 @@
+"""Tests for memoization of read-only tool results in call_function."""
+
+import pytest
+import pandas as pd
+from google.genai.types import FunctionCall
+
+from staffer import available_functions
+from staffer.available_functions import call_function
+from staffer.result_cache import ResultCache, result_cache
+from staffer.functions.analytics.models.schemas import DatasetManager, DatasetSchema, loaded_datasets, dataset_schemas
+
+
+def register(name, df):
+    loaded_datasets[name] = df
+    dataset_schemas[name] = DatasetSchema.from_dataframe(df, name)
+
+
+@pytest.fixture
+def sales(monkeypatch):
+    calls = []
+    original = available_functions.function_dict["find_correlations"]
+
+    def spy(working_directory, **kwargs):
+        calls.append(kwargs)
+        return original(working_directory, **kwargs)
+
+    monkeypatch.setitem(available_functions.function_dict, "find_correlations", spy)
+    result_cache.clear()
+    register("sales", pd.DataFrame({"a": [1, 2, 3, 4], "b": [2, 4, 6, 9], "c": [4, 3, 2, 1]}))
+    yield calls
+    DatasetManager.clear_all_datasets()
+    result_cache.clear()
+
+
+def response_of(content):
+    return content.parts[0].function_response.response["result"]
+
+
+def test_repeated_call_is_served_from_cache(sales):
+    call = FunctionCall(name="find_correlations", args={"dataset_name": "sales"})
+
+    first = call_function(call, "/tmp")
+    second = call_function(call, "/tmp")
+
+    assert len(sales) == 1
+    assert response_of(first) == response_of(second)
+
+
+def test_argument_order_does_not_matter(sales):
+    call_function(FunctionCall(name="find_correlations", args={"dataset_name": "sales", "threshold": 0.5}), "/tmp")
+    call_function(FunctionCall(name="find_correlations", args={"threshold": 0.5, "dataset_name": "sales"}), "/tmp")
+
+    assert len(sales) == 1
+
+
+def test_reloading_dataset_invalidates_cache(sales):
+    call = FunctionCall(name="find_correlations", args={"dataset_name": "sales"})
+    call_function(call, "/tmp")
+
+    register("sales", pd.DataFrame({"a": [1, 2, 3], "b": [3, 2, 1]}))
+    result = call_function(call, "/tmp")
+
+    assert len(sales) == 2
+    assert response_of(result)["columns_analyzed"] == ["a", "b"]
+
+
+def test_errors_are_not_cached(sales):
+    call = FunctionCall(name="find_correlations", args={"dataset_name": "sales", "columns": ["a"]})
+
+    call_function(call, "/tmp")
+    call_function(call, "/tmp")
+
+    assert len(sales) == 2
+
+
+def test_non_cacheable_functions_always_run(monkeypatch, sales):
+    calls = []
+    monkeypatch.setitem(available_functions.function_dict, "list_loaded_datasets",
+                        lambda working_directory, **kwargs: calls.append(1) or {"total_datasets": 1})
+
+    call_function(FunctionCall(name="list_loaded_datasets", args={}), "/tmp")
+    call_function(FunctionCall(name="list_loaded_datasets", args={}), "/tmp")
+
+    assert len(calls) == 2
+
+
+def test_cache_is_size_bounded_and_reports_stats(sales):
+    cache = ResultCache(max_entries=2)
+    keys = [cache.make_key("find_correlations", {"dataset_name": "sales", "threshold": t}) for t in (0.1, 0.2, 0.3)]
+    for key in keys:
+        cache.put(key, {"ok": True})
+
+    cache.get(keys[0])
+    cache.get(keys[2])
+
+    assert cache.stats() == {"entries": 2, "max_entries": 2, "hits": 1, "misses": 1, "evictions": 1, "hit_rate": 0.5}
+
+
+def test_calls_without_loaded_dataset_are_not_keyed():
+    assert ResultCache().make_key("find_correlations", {"dataset_name": "missing"}) is None
@@ -0,0 +1,139 @@
+"""Tests for derived dataset handles returned by analysis tools."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from google.genai.types import FunctionCall
+
+from staffer import available_functions
+from staffer.available_functions import call_function
+from staffer.functions.analytics.models.schemas import (
+    DatasetManager, DatasetSchema, loaded_datasets, dataset_schemas, derived_datasets
+)
+from staffer.functions.analytics.tools.export_insights_tool import export_insights
+from staffer.functions.analytics.tools.find_correlations_tool import find_correlations
+from staffer.functions.analytics.tools.segment_by_column_tool import segment_by_column
+from staffer.result_cache import is_cacheable_result, result_cache
+
+
+def register(name, df):
+    loaded_datasets[name] = df
+    dataset_schemas[name] = DatasetSchema.from_dataframe(df, name)
+
+
+@pytest.fixture(autouse=True)
+def clean_datasets():
+    DatasetManager.clear_all_datasets()
+    yield
+    DatasetManager.clear_all_datasets()
+
+
+@pytest.fixture
+def wide():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(500, 20)), columns=[f"m{i}" for i in range(20)])
+    df["region"] = rng.choice(["north", "south", "east", "west"], size=500)
+    register("wide", df)
+    return df
+
+
+def test_small_results_stay_inline():
+    register("small", pd.DataFrame({"a": [1, 2, 3, 4], "b": [2, 4, 6, 9], "c": ["x", "y", "x", "y"]}))
+
+    result = find_correlations(".", "small")
+
+    assert "result_handle" not in result
+    assert set(result["correlation_matrix"]) == {"a", "b"}
+    assert DatasetManager.list_datasets() == ["small"]
+
+
+def test_large_correlation_matrix_becomes_handle(wide):
+    result = find_correlations(".", "wide")
+
+    handle = result["result_handle"]
+    name = handle["dataset_handle"]
+    assert name.startswith("wide__correlations_")
+    assert handle["rows"] == 20
+    assert handle["columns"][:2] == ["column", "m0"]
+    assert handle["derived_from"] == "wide"
+    # The inline matrix is only a preview
+    assert len(result["correlation_matrix"]["m0"]) == 5
+    assert len(json.dumps(result, default=str)) < 10_000
+
+    stored = DatasetManager.get_dataset(name)
+    assert stored.loc[stored["column"] == "m3", "m3"].iloc[0] == pytest.approx(1.0)
+    assert DatasetManager.get_dataset_info(name)["derived_from"]["source_dataset"] == "wide"
+
+
+def test_handles_work_as_dataset_names(wide, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    handle = segment_by_column(".", "wide", "region")["result_handle"]["dataset_handle"]
+
+    segments = DatasetManager.get_dataset(handle)
+    assert sorted(segments["region"]) == ["east", "north", "south", "west"]
+
+    exported = export_insights(".", handle, format="json")
+    assert exported["status"] == "success"
+    assert exported["derived_from"]["source_dataset"] == "wide"
+    report = json.loads((tmp_path / "outputs" / "reports" / f"insights_{handle}.json").read_text())
+    assert report["derived_from"]["kind"] == "segments_by_region"
+
+
+def test_handles_are_unique_per_result_and_clear_forgets_provenance(wide):
+    first = find_correlations(".", "wide")["result_handle"]["dataset_handle"]
+    narrower = find_correlations(".", "wide", columns=[f"m{i}" for i in range(16)])["result_handle"]["dataset_handle"]
+    again = find_correlations(".", "wide")["result_handle"]["dataset_handle"]
+
+    assert narrower != first and again == first
+    assert DatasetManager.get_dataset(first).shape == (20, 21)
+    assert DatasetManager.get_dataset(narrower).shape == (16, 17)
+    assert DatasetManager.list_datasets() == ["wide", first, narrower]
+
+    DatasetManager.clear_dataset(first)
+    assert first not in derived_datasets
+
+
+def test_handle_writers_run_concurrently_without_clobbering(wide):
+    from concurrent.futures import ThreadPoolExecutor
+    from staffer.function_registries import concurrent_safe_functions
+
+    assert {"find_correlations", "segment_by_column", "detect_outliers", "run_analysis_batch"} <= concurrent_safe_functions
+
+    column_sets = [[f"m{i}" for i in range(n)] for n in (15, 16, 17, 18, 19, 20)]
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        handles = list(executor.map(
+            lambda columns: find_correlations(".", "wide", columns=columns)["result_handle"]["dataset_handle"],
+            column_sets
+        ))
+
+    assert len(set(handles)) == len(column_sets)
+    for columns, handle in zip(column_sets, handles):
+        assert DatasetManager.get_dataset(handle).shape == (len(columns), len(columns) + 1)
+        assert DatasetManager.get_dataset_info(handle)["schema"]["row_count"] == len(columns)
+
+
+def test_results_with_handles_are_memoized_while_handles_exist(wide, monkeypatch):
+    calls = []
+    original = available_functions.function_dict["find_correlations"]
+
+    def spy(working_directory, **kwargs):
+        calls.append(kwargs)
+        return original(working_directory, **kwargs)
+
+    monkeypatch.setitem(available_functions.function_dict, "find_correlations", spy)
+    result_cache.clear()
+    call = lambda: call_function(FunctionCall(name="find_correlations", args={"dataset_name": "wide"}), ".")
+    handle_of = lambda content: content.parts[0].function_response.response["result"]["result_handle"]["dataset_handle"]
+
+    handle = handle_of(call())
+    assert handle_of(call()) == handle
+    assert len(calls) == 1
+
+    # A cleared handle turns the cached result into a miss that registers it again
+    DatasetManager.clear_dataset(handle)
+    assert handle_of(call()) == handle
+    assert len(calls) == 2
+    assert handle in loaded_datasets
+    assert is_cacheable_result({"status": "success", "result_handle": {"dataset_handle": "x"}})
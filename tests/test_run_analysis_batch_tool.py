@@ -0,0 +1,118 @@
+"""Tests for run_analysis_batch and the shared column statistics."""
+
+import numpy as np
+import pandas as pd
+
+from staffer.functions.analytics.models.schemas import DatasetManager, loaded_datasets
+from staffer.functions.analytics.tools.analyze_distributions_tool import analyze_distributions
+from staffer.functions.analytics.tools.detect_outliers_tool import detect_outliers
+from staffer.functions.analytics.tools.run_analysis_batch_tool import run_analysis_batch
+from staffer.functions.analytics.tools.segment_by_column_tool import segment_by_column
+
+
+def setup_function():
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        "units": rng.integers(0, 50, 600),
+        "revenue": rng.normal(100, 15, 600),
+        "region": rng.choice(["north", "south", "east"], 600),
+    })
+    frame.loc[::9, "revenue"] = np.nan
+    frame.loc[[3, 7], "revenue"] = [500.0, -200.0]
+    loaded_datasets["sales"] = frame
+
+
+def teardown_function():
+    DatasetManager.clear_all_datasets()
+
+
+ANALYSES = [
+    {"analysis": "analyze_distributions", "column_name": "revenue"},
+    {"analysis": "analyze_distributions", "column_name": "units"},
+    {"analysis": "analyze_distributions", "column_name": "region"},
+    {"analysis": "detect_outliers", "method": "iqr"},
+    {"analysis": "detect_outliers", "columns": ["revenue"], "method": "zscore"},
+    {"analysis": "segment_by_column", "column_name": "region", "top_n": 2},
+]
+
+
+def _standalone(spec):
+    args = {key: value for key, value in spec.items() if key != "analysis"}
+    tool = {
+        "analyze_distributions": analyze_distributions,
+        "detect_outliers": detect_outliers,
+        "segment_by_column": segment_by_column,
+    }[spec["analysis"]]
+    return tool(".", "sales", **args)
+
+
+def test_batch_results_match_individual_calls():
+    result = run_analysis_batch(".", "sales", ANALYSES, max_workers=4)
+
+    assert result["analyses_run"] == len(ANALYSES)
+    assert result["failed"] == 0
+    assert [entry["analysis"] for entry in result["results"]] == [spec["analysis"] for spec in ANALYSES]
+    assert result["shared_aggregates"]["group_by_columns"] == ["region"]
+    # Quartiles are planned once for both numeric columns
+    assert result["shared_aggregates"]["statistics"]["quartiles"] == 2
+
+    batch = [entry["result"] for entry in result["results"]]
+    DatasetManager.clear_all_datasets()
+    setup_function()
+    assert batch == [_standalone(spec) for spec in ANALYSES]
+    assert batch[3]["outliers_by_column"]["revenue"]["outlier_count"] >= 2
+
+
+def test_aggregates_are_shared_until_dataset_changes():
+    run_analysis_batch(".", "sales", ANALYSES)
+    stats = DatasetManager.get_column_stats("sales")
+    computed = stats.computed
+
+    again = run_analysis_batch(".", "sales", ANALYSES)
+    detect_outliers(".", "sales", ["units"], "iqr")
+
+    assert again["shared_aggregates"]["computed"] == 0
+    assert stats.computed == computed
+
+    loaded_datasets["sales"] = loaded_datasets["sales"].head(100)
+    assert DatasetManager.get_column_stats("sales") is not stats
+    assert analyze_distributions(".", "sales", "units")["total_values"] == 100
+
+
+def test_bad_specs_are_reported():
+    assert "analysis" in run_analysis_batch(".", "sales", [{"analysis": "drop_table"}])["error"]
+    assert "not loaded" in run_analysis_batch(".", "missing", ANALYSES)["error"]
+
+    result = run_analysis_batch(".", "sales", [
+        {"analysis": "analyze_distributions", "column_name": "nope"},
+        {"analysis": "segment_by_column", "colum_name": "region"},
+    ])
+    assert result["failed"] == 2
+    assert "not found" in result["results"][0]["result"]["error"]
+    assert "Invalid arguments" in result["results"][1]["result"]["error"]
+
+
+def test_failed_shared_aggregate_only_fails_its_analysis():
+    loaded_datasets["sales"] = loaded_datasets["sales"].assign(returned=lambda df: df["units"] > 40)
+
+    result = run_analysis_batch(".", "sales", ANALYSES + [
+        {"analysis": "analyze_distributions", "column_name": "returned"},
+    ])
+
+    assert result["analyses_run"] == len(ANALYSES) + 1
+    assert result["failed"] == 1
+    assert result["results"][-1]["result"] == analyze_distributions(".", "sales", "returned")
+    assert "error" in result["results"][-1]["result"]
+
+
+def test_inexact_analyses_plan_quantile_sketches():
+    result = run_analysis_batch(".", "sales", [
+        {"analysis": "analyze_distributions", "column_name": "revenue", "exact": False},
+        {"analysis": "detect_outliers", "columns": ["units"], "exact": False},
+    ])
+
+    shared = result["shared_aggregates"]
+    assert shared["quantile_sketches"] == ["revenue", "units"]
+    assert "quartiles" not in shared["statistics"]
+    assert result["results"][0]["result"]["exact"] is False
+    assert result["results"][1]["result"]["exact"] is False
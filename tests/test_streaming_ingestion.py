@@ -0,0 +1,109 @@
+"""Tests for chunked CSV ingestion in the load_dataset tool."""
+
+import pytest
+import pandas as pd
+
+from staffer.functions.analytics.tools.load_dataset_tool import load_dataset
+from staffer.functions.analytics.models.schemas import DatasetManager, loaded_datasets, dataset_schemas
+from staffer.functions.analytics.models.streaming import stream_csv, MemoryCeilingExceeded
+
+
+@pytest.fixture
+def events_csv(tmp_path):
+    path = tmp_path / "events.csv"
+    pd.DataFrame({
+        "event_id": range(1000),
+        "region": ["North", "South", "East", "West"] * 250,
+        "amount": [i % 50 for i in range(1000)],
+        "payload": ["x" * 20] * 1000,
+    }).to_csv(path, index=False)
+    yield path
+    DatasetManager.clear_all_datasets()
+
+
+def test_reservoir_sample_has_requested_size_and_unique_rows(events_csv):
+    df, stats = stream_csv(str(events_csv), sample_size=100, chunk_size=64)
+
+    assert len(df) == 100
+    assert df["event_id"].is_unique
+    assert df["event_id"].is_monotonic_increasing
+    assert stats["rows_scanned"] == 1000
+    assert stats["chunks_read"] == 16
+    assert stats["sampled"] is True
+
+
+def test_reservoir_sample_is_deterministic(events_csv):
+    first, _ = stream_csv(str(events_csv), sample_size=50, chunk_size=64)
+    second, _ = stream_csv(str(events_csv), sample_size=50, chunk_size=64)
+
+    assert first.equals(second)
+
+
+def test_projection_and_filter_applied_during_read(events_csv):
+    df, stats = stream_csv(str(events_csv), columns=["region", "amount"],
+                           row_filter="region == 'North' and amount > 40", chunk_size=128)
+
+    assert list(df.columns) == ["region", "amount"]
+    assert (df["region"] == "North").all()
+    assert (df["amount"] > 40).all()
+    assert stats["rows_matched"] == len(df)
+
+
+def test_memory_ceiling_is_enforced(events_csv):
+    with pytest.raises(MemoryCeilingExceeded):
+        stream_csv(str(events_csv), chunk_size=100, max_memory_mb=0.01)
+
+
+def test_sample_larger_than_matches_returns_all_matches(events_csv):
+    df, stats = stream_csv(str(events_csv), row_filter="amount == 0", sample_size=500)
+
+    assert len(df) == 20
+    assert stats["sampled"] is False
+
+
+def test_load_dataset_tool_streaming_registers_dataset(events_csv):
+    result = load_dataset("/tmp", str(events_csv), "events", sample_size=10, streaming=True)
+
+    assert result["status"] == "loaded"
+    assert result["rows"] == 10
+    assert result["streaming"]["rows_scanned"] == 1000
+    assert len(loaded_datasets["events"]) == 10
+    assert dataset_schemas["events"].row_count == 10
+
+
+def test_load_dataset_tool_reports_memory_ceiling_error(events_csv):
+    result = load_dataset("/tmp", str(events_csv), "events", max_memory_mb=0.01, chunk_size=100)
+
+    assert result["status"] == "error"
+    assert "memory ceiling" in result["message"]
+
+
+def test_streaming_rejects_json(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text('[{"a": 1}]')
+
+    result = load_dataset("/tmp", str(path), "data", streaming=True)
+
+    assert result["status"] == "error"
+    assert "CSV files only" in result["message"]
+
+
+def test_columns_and_filter_apply_to_json_and_excel(tmp_path, events_csv):
+    frame = pd.read_csv(events_csv)
+    json_path = tmp_path / "events.json"
+    frame.to_json(json_path, orient="records")
+    excel_path = tmp_path / "events.xlsx"
+    frame.to_excel(excel_path, index=False)
+
+    for path in (json_path, excel_path):
+        result = load_dataset("/tmp", str(path), "events", columns=["region", "amount"], row_filter="amount > 45")
+
+        assert result["status"] == "loaded"
+        assert result["columns"] == ["region", "amount"]
+        assert result["rows"] == 80
+        assert list(loaded_datasets["events"].columns) == ["region", "amount"]
+        assert dataset_schemas["events"].row_count == 80
+
+    assert load_dataset("/tmp", str(json_path), "events", columns=["missing"])["status"] == "error"
+    result = load_dataset("/tmp", str(json_path), "events", max_memory_mb=10)
+    assert "CSV files only" in result["message"]
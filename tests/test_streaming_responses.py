@@ -0,0 +1,147 @@
+"""Tests for streaming model responses in process_prompt."""
+
+import threading
+from unittest.mock import patch, MagicMock
+
+from google.genai import types
+from google.genai.types import FunctionCall
+
+from staffer.main import StreamingCallDispatcher, process_prompt
+
+
+def chunk(*parts, usage=None):
+    response = MagicMock()
+    response.candidates = [MagicMock(content=types.Content(role="model", parts=list(parts)))]
+    response.usage_metadata = usage
+    return response
+
+
+def text(value):
+    return types.Part(text=value)
+
+
+def function_call(name):
+    return types.Part(function_call=FunctionCall(name=name, args={"dataset_name": "sales"}))
+
+
+def tool_result(function_call, working_directory, verbose=False):
+    return types.Content(role="tool", parts=[
+        types.Part.from_function_response(name=function_call.name, response={"result": function_call.name})
+    ])
+
+
+class RecordingTerminal:
+    def __init__(self):
+        self.events = []
+
+    def display_function_call(self, name):
+        self.events.append(("call", name))
+
+    def stream_ai_response(self, chunk):
+        self.events.append(("chunk", chunk))
+
+    def finish_ai_response(self):
+        self.events.append(("finish",))
+
+
+def test_text_renders_incrementally_and_is_merged_in_history(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    terminal = RecordingTerminal()
+    client = MagicMock()
+    client.models.generate_content_stream.return_value = iter([
+        chunk(text("Revenue grew ")), chunk(text("12% year over year.")),
+    ])
+
+    with patch("staffer.main.get_client", return_value=client):
+        messages = process_prompt("summarise", terminal=terminal, stream=True)
+
+    assert terminal.events == [
+        ("chunk", "Revenue grew "), ("chunk", "12% year over year."), ("finish",),
+    ]
+    assert messages[-1].role == "model"
+    assert [part.text for part in messages[-1].parts] == ["Revenue grew 12% year over year."]
+    client.models.generate_content.assert_not_called()
+
+
+def test_function_calls_start_before_stream_ends(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    started = threading.Event()
+
+    def caller(function_call, working_directory, verbose=False):
+        started.set()
+        return tool_result(function_call, working_directory)
+
+    def first_turn(**kwargs):
+        yield chunk(function_call("find_correlations"))
+        # The call must already be running while the model is still streaming
+        assert started.wait(5)
+        yield chunk(text("Checking."), usage=MagicMock(prompt_token_count=10, candidates_token_count=3))
+
+    client = MagicMock()
+    client.models.generate_content_stream.side_effect = [first_turn(), iter([chunk(text("Done."))])]
+
+    with patch("staffer.main.get_client", return_value=client), patch("staffer.main.call_function", caller):
+        messages = process_prompt("correlate", stream=True)
+
+    roles = [message.role for message in messages]
+    assert roles == ["user", "model", "tool", "model"]
+    assert messages[2].parts[0].function_response.name == "find_correlations"
+    assert messages[3].parts[0].text == "Done."
+
+
+def test_dispatcher_keeps_barrier_order():
+    events = []
+    lock = threading.Lock()
+
+    def caller(function_call, working_directory, verbose=False):
+        with lock:
+            events.append(("start", function_call.name))
+        with lock:
+            events.append(("end", function_call.name))
+        return tool_result(function_call, working_directory)
+
+    with patch("staffer.main.call_function", caller):
+        dispatcher = StreamingCallDispatcher("/tmp")
+        for name in ["find_correlations", "load_dataset", "detect_outliers"]:
+            dispatcher.submit(function_call(name).function_call)
+        results = dispatcher.results()
+
+    assert [r.parts[0].function_response.name for r in results] == ["find_correlations", "load_dataset", "detect_outliers"]
+    assert events.index(("end", "find_correlations")) < events.index(("start", "load_dataset"))
+    assert events.index(("end", "load_dataset")) < events.index(("start", "detect_outliers"))
+
+
+def test_streaming_with_fake_client(fake_llm, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    messages = process_prompt("where am I?", stream=True)
+
+    assert fake_llm.call_count == 2
+    assert [message.role for message in messages] == ["user", "model", "tool", "model"]
+
+
+class RecordingConsole:
+    def __init__(self):
+        self.output = ""
+
+    def print(self, text="", end="\n", **kwargs):
+        self.output += str(text) + end
+
+
+def test_terminal_ui_holds_code_blocks_until_closed():
+    from staffer.ui.terminal import TerminalUI
+
+    terminal = TerminalUI.__new__(TerminalUI)
+    terminal.console = RecordingConsole()
+    highlighted = []
+    terminal.display_code = lambda code, language="python": highlighted.append((language, code))
+
+    terminal.stream_ai_response("Here is")
+    assert terminal.console.output == "Here is"
+
+    for piece in [" the query:\n```py", "thon\nprint(1)\n", "```\nAll done"]:
+        terminal.stream_ai_response(piece)
+    assert highlighted == [("python", "print(1)")]
+    terminal.finish_ai_response()
+
+    assert terminal.console.output == "Here is the query:\nAll done\n"
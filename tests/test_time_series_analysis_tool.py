@@ -0,0 +1,73 @@
+"""Tests for time_series_analysis tool."""
+
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from staffer.functions.analytics.models import temporal_index
+from staffer.functions.analytics.models.schemas import DatasetManager, loaded_datasets
+from staffer.functions.analytics.tools.time_series_analysis_tool import time_series_analysis
+
+
+def setup_function():
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2023-01-01", periods=800, freq="D").strftime("%Y-%m-%d")
+    frame = pd.DataFrame({
+        "day": dates,
+        "sales": np.arange(800, dtype=float),
+        "visits": rng.integers(0, 100, 800),
+    }).sample(frac=1, random_state=1)
+    frame.loc[frame["sales"] >= 798, "day"] = None
+    loaded_datasets["daily"] = frame
+
+
+def teardown_function():
+    DatasetManager.clear_all_datasets()
+
+
+def test_monthly_rollup_of_shuffled_rows():
+    result = time_series_analysis(".", "daily", "day", "sales")
+
+    assert result["frequency"] == temporal_index.resample_rule("M")
+    assert result["date_range"]["start"].startswith("2023-01-01")
+    assert result["date_range"]["days"] == 797
+    assert result["trend"]["direction"] == "increasing"
+    january = next(iter(result["sample_values"].values()))
+    assert january == 15.0
+
+
+def test_time_index_is_reused_until_dataset_changes():
+    with patch.object(temporal_index, "TemporalIndex", wraps=temporal_index.TemporalIndex) as build:
+        time_series_analysis(".", "daily", "day", "sales", "W")
+        time_series_analysis(".", "daily", "day", "visits", "D")
+        assert build.call_count == 1
+
+        setup_function()
+        time_series_analysis(".", "daily", "day", "sales", "W")
+        assert build.call_count == 2
+
+
+def test_value_columns_are_resampled_together():
+    single = time_series_analysis(".", "daily", "day", "visits", "W")
+    multi = time_series_analysis(".", "daily", "day", value_columns=["sales", "visits"], frequency="W")
+
+    assert multi["value_columns"] == ["sales", "visits"]
+    assert multi["columns"]["visits"]["statistics"] == single["statistics"]
+    assert multi["columns"]["sales"]["trend"]["direction"] == "increasing"
+    assert multi["data_points"] == single["data_points"]
+
+
+def test_column_without_observed_periods_has_no_trend():
+    loaded_datasets["daily"] = loaded_datasets["daily"].assign(empty=np.nan)
+
+    result = time_series_analysis(".", "daily", "day", value_columns=["sales", "empty"], frequency="W")
+
+    assert result["columns"]["sales"]["trend"]["direction"] == "increasing"
+    assert result["columns"]["empty"]["trend"] == {"slope": None, "direction": "insufficient data"}
+
+
+def test_invalid_requests():
+    assert "not found" in time_series_analysis(".", "daily", "day", "nope")["error"]
+    assert "value_column" in time_series_analysis(".", "daily", "day")["error"]
+    assert "failed" in time_series_analysis(".", "daily", "day", "sales", "bogus")["error"]
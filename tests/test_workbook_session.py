@@ -0,0 +1,161 @@
+"""Tests for the Excel workbook session cache and edit transactions."""
+
+import os
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from staffer.available_functions import call_function
+from staffer.functions.excel.workbook_session import workbook_session
+from staffer.main import flush_pending_workbooks
+from tests.factories import function_call
+
+
+def run(name, args, working_directory):
+    fc = function_call(name, args)
+    return call_function(fc.parts[0].function_call, str(working_directory)).parts[0].function_response.response["result"]
+
+
+def write(working_directory, cell, value):
+    return run("write_data_to_excel", {
+        "filepath": "book.xlsx", "sheet_name": "Sheet", "data": [[value]], "start_cell": cell
+    }, working_directory)
+
+
+def disk_value(working_directory, cell):
+    return load_workbook(working_directory / "book.xlsx")["Sheet"][cell].value
+
+
+@pytest.fixture(autouse=True)
+def session(monkeypatch):
+    workbook_session.clear()
+    monkeypatch.setattr(workbook_session, "idle_flush_seconds", 0)
+    yield workbook_session
+    workbook_session.clear()
+
+
+@pytest.fixture
+def book(tmp_path):
+    Workbook().save(tmp_path / "book.xlsx")
+    return tmp_path
+
+
+def test_repeated_edits_parse_the_workbook_once(book, session):
+    loads = session.loads
+
+    for i in range(5):
+        assert write(book, f"A{i + 1}", i).startswith("Successfully")
+    run("merge_cells", {"filepath": "book.xlsx", "sheet_name": "Sheet", "start_cell": "B1", "end_cell": "C1"}, book)
+
+    assert session.loads - loads == 1
+    # Outside a transaction every edit is on disk straight away
+    assert disk_value(book, "A5") == 4
+
+
+def test_external_changes_are_reloaded(book, session):
+    write(book, "A1", "ours")
+    wb = load_workbook(book / "book.xlsx")
+    wb["Sheet"]["B1"] = "theirs"
+    wb.save(book / "book.xlsx")
+    loads = session.loads
+
+    write(book, "A2", "ours again")
+
+    assert session.loads - loads == 1
+    assert disk_value(book, "B1") == "theirs"
+    assert disk_value(book, "A2") == "ours again"
+
+
+def test_failed_edit_does_not_leak_partial_changes(book, session):
+    write(book, "A1", "kept")
+    wb = session.open(str(book / "book.xlsx"))
+    wb["Sheet"]["Z9"] = "half-finished edit that was never saved"
+
+    write(book, "A2", "next")
+
+    assert disk_value(book, "Z9") is None
+    assert disk_value(book, "A2") == "next"
+
+
+def test_transaction_saves_once_on_commit(book, session):
+    assert "started" in run("excel_transaction", {"action": "begin"}, book)
+    mtime = os.stat(book / "book.xlsx").st_mtime_ns
+    saves = session.saves
+
+    for i in range(10):
+        write(book, f"A{i + 1}", i)
+    run("format_range", {"filepath": "book.xlsx", "sheet_name": "Sheet", "start_cell": "A1", "end_cell": "A10", "bold": True}, book)
+
+    assert os.stat(book / "book.xlsx").st_mtime_ns == mtime
+    assert "book.xlsx" in run("excel_transaction", {"action": "status"}, book)
+
+    result = run("excel_transaction", {"action": "commit"}, book)
+
+    assert "saved 1 workbook(s)" in result
+    assert session.saves - saves == 1
+    assert disk_value(book, "A10") == 9
+    assert load_workbook(book / "book.xlsx")["Sheet"]["A1"].font.bold
+
+
+def test_rollback_discards_pending_edits(book, session):
+    write(book, "A1", "committed")
+    run("excel_transaction", {"action": "begin"}, book)
+    write(book, "A1", "discarded")
+
+    assert "1 workbook(s)" in run("excel_transaction", {"action": "rollback"}, book)
+    write(book, "A2", "after")
+
+    assert disk_value(book, "A1") == "committed"
+    assert disk_value(book, "A2") == "after"
+
+
+def test_reads_and_end_of_turn_see_pending_edits(book, session):
+    run("excel_transaction", {"action": "begin"}, book)
+    write(book, "A1", "pending")
+
+    assert "pending" in run("read_data_from_excel", {"filepath": "book.xlsx", "sheet_name": "Sheet"}, book)
+
+    write(book, "A2", "end of turn")
+    assert flush_pending_workbooks() == [str(book / "book.xlsx")]
+    assert disk_value(book, "A2") == "end of turn"
+    assert session.in_transaction
+
+
+def test_reads_inside_transaction_do_not_write_pending_edits(book, session):
+    write(book, "A1", "committed")
+    run("excel_transaction", {"action": "begin"}, book)
+    write(book, "A1", "edited")
+
+    assert "edited" in run("read_data_from_excel", {"filepath": "book.xlsx", "sheet_name": "Sheet"}, book)
+    assert "is valid" in run("validate_excel_range", {"filepath": "book.xlsx", "sheet_name": "Sheet", "start_cell": "A1"}, book)
+    assert disk_value(book, "A1") == "committed"
+
+    run("excel_transaction", {"action": "rollback"}, book)
+    assert disk_value(book, "A1") == "committed"
+    assert "committed" in run("read_data_from_excel", {"filepath": "book.xlsx", "sheet_name": "Sheet"}, book)
+
+
+def test_dataset_loaded_inside_transaction_is_not_cached(book, session, monkeypatch):
+    from staffer.functions.analytics.models.schemas import DatasetManager, loaded_datasets
+
+    monkeypatch.setenv("DATASET_CACHE_DIR", str(book / "cache"))
+    write(book, "A1", "value")
+    write(book, "A2", 1)
+    run("excel_transaction", {"action": "begin"}, book)
+    write(book, "A2", 2)
+    try:
+        DatasetManager.load_dataset(str(book / "book.xlsx"), "book")
+        assert loaded_datasets["book"]["value"].tolist() == [2]
+
+        run("excel_transaction", {"action": "rollback"}, book)
+        DatasetManager.load_dataset(str(book / "book.xlsx"), "book")
+        assert loaded_datasets["book"]["value"].tolist() == [1]
+    finally:
+        DatasetManager.clear_all_datasets()
+
+
+def test_transaction_actions_are_validated(book):
+    assert run("excel_transaction", {"action": "commit"}, book).startswith("Error:")
+    run("excel_transaction", {"action": "begin"}, book)
+    assert run("excel_transaction", {"action": "begin"}, book).startswith("Error:")
+    assert run("excel_transaction", {"action": "undo"}, book).startswith("Error:")